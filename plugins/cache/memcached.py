@@ -11,6 +11,8 @@ name: memcached
 short_description: Use memcached DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in memcached.
+  - The names of the cached hosts are kept in an index split in several memcached entries. Each write updates a
+    single entry with a C(gets)/C(cas) round, so parallel forks do not overwrite each other's updates.
 requirements:
   - memcache (python lib)
 options:
@@ -44,14 +46,41 @@ options:
     ini:
       - key: fact_caching_timeout
         section: defaults
+  _sweep_interval:
+    description:
+      - Minimum number of seconds between two removals of expired hosts from the index.
+      - Expired hosts are never returned, so this only bounds the size of the index.
+    type: integer
+    default: 300
+    env:
+      - name: ANSIBLE_CACHE_MEMCACHED_SWEEP_INTERVAL
+    ini:
+      - key: fact_caching_memcached_sweep_interval
+        section: defaults
+    version_added: 13.4.0
+  _prefetch:
+    description:
+      - Load the records of all hosts with C(get_multi) the first time a record is missing from the in-memory cache,
+        instead of one C(get) per host.
+      - Useful when most of the cached hosts are used by the play.
+    type: bool
+    default: false
+    env:
+      - name: ANSIBLE_CACHE_MEMCACHED_PREFETCH
+    ini:
+      - key: fact_caching_memcached_prefetch
+        section: defaults
+    version_added: 13.4.0
 """
 
 import collections
+import functools
 import os
 import time
-from collections.abc import MutableSet
+from contextlib import contextmanager
 from itertools import chain
-from multiprocessing import Lock
+from threading import Lock
+from zlib import crc32
 
 from ansible.errors import AnsibleError
 from ansible.plugins.cache import BaseCacheModule
@@ -66,6 +95,9 @@ except ImportError:
 
 display = Display()
 
+# Relative expiration times larger than this are read by memcached as unix timestamps
+MAX_RELATIVE_EXPIRATION = 60 * 60 * 24 * 30
+
 
 class ProxyClientPool:
     """
@@ -121,6 +153,15 @@ class ProxyClientPool:
         for conn in chain(self._available_connections, self._locked_connections):
             conn.disconnect_all()
 
+    @contextmanager
+    def connection(self):
+        """Hold one connection for several commands, as needed by gets and cas."""
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            self.release_connection(conn)
+
     def __getattr__(self, name):
         def wrapped(*args, **kwargs):
             return self._proxy_client(name, *args, **kwargs)
@@ -136,41 +177,74 @@ class ProxyClientPool:
             self.release_connection(conn)
 
 
-class CacheModuleKeys(MutableSet):
+class CacheModuleKeys:
     """
-    A set subclass that keeps track of insertion time and persists
-    the set in memcached.
+    Index of the cached hosts with their insertion time, split in shards that
+    are stored in memcached.
+
+    A host always goes to the same shard, and shards are updated with gets/cas
+    so that concurrent writers never lose each other's updates.
     """
 
     PREFIX = "ansible_cache_keys"
+    SHARDS = 32
+    CAS_RETRIES = 20
+
+    def __init__(self, db, prefix=""):
+        self._db = db
+        self._shard_keys = [f"{self.PREFIX}:{prefix}:{shard}" for shard in range(self.SHARDS)]
+
+    def _shard_key(self, key):
+        return self._shard_keys[crc32(key.encode("utf-8")) % self.SHARDS]
+
+    def _update(self, shard_key, update):
+        with self._db.connection() as conn:
+            for dummy in range(self.CAS_RETRIES):
+                shard = conn.gets(shard_key)
+                if shard is None:
+                    if conn.add(shard_key, update({})):
+                        return
+                    continue
+                new_shard = update(dict(shard))
+                if new_shard == shard or conn.cas(shard_key, new_shard):
+                    return
+        display.warning(f"Could not update the memcached cache index {shard_key} after {self.CAS_RETRIES} attempts")
 
-    def __init__(self, cache, *args, **kwargs):
-        self._cache = cache
-        self._keyset = dict(*args, **kwargs)
+    def load(self):
+        """Return all hosts of the index with their insertion time."""
+        keyset = {}
+        for shard in self._db.get_multi(self._shard_keys).values():
+            keyset.update(shard)
+        return keyset
 
-    def __contains__(self, key):
-        return key in self._keyset
+    def add(self, value):
+        timestamp = time.time()
 
-    def __iter__(self):
-        return iter(self._keyset)
+        def update(shard):
+            shard[value] = timestamp
+            return shard
 
-    def __len__(self):
-        return len(self._keyset)
+        self._update(self._shard_key(value), update)
 
-    def add(self, value):
-        self._keyset[value] = time.time()
-        self._cache.set(self.PREFIX, self._keyset)
+    def discard(self, *values):
+        by_shard = collections.defaultdict(set)
+        for value in values:
+            by_shard[self._shard_key(value)].add(value)
+        for shard_key, shard_values in by_shard.items():
+            self._update(shard_key, functools.partial(_without, values=shard_values))
 
-    def discard(self, value):
-        del self._keyset[value]
-        self._cache.set(self.PREFIX, self._keyset)
+    def remove_by_timerange(self, s_min, s_max, keyset=None):
+        """Remove the hosts inserted between s_min and s_max, only writing the shards that contain some."""
+        if keyset is None:
+            keyset = self.load()
+        self.discard(*[k for k, t in keyset.items() if s_min < t < s_max])
 
-    def remove_by_timerange(self, s_min, s_max):
-        for k in list(self._keyset.keys()):
-            t = self._keyset[k]
-            if s_min < t < s_max:
-                del self._keyset[k]
-        self._cache.set(self.PREFIX, self._keyset)
+    def clear(self):
+        self._db.delete_multi(self._shard_keys)
+
+
+def _without(shard, values):
+    return {k: t for k, t in shard.items() if k not in values}
 
 
 class CacheModule(BaseCacheModule):
@@ -182,59 +256,97 @@ class CacheModule(BaseCacheModule):
             connection = self.get_option("_uri")
         self._timeout = self.get_option("_timeout")
         self._prefix = self.get_option("_prefix")
+        self._sweep_interval = self.get_option("_sweep_interval")
+        self._prefetch = self.get_option("_prefetch")
 
         if not HAS_MEMCACHE:
             raise AnsibleError("python-memcached is required for the memcached fact cache")
 
         self._cache = {}
-        self._db = ProxyClientPool(connection, debug=0)
-        self._keys = CacheModuleKeys(self._db, self._db.get(CacheModuleKeys.PREFIX) or [])
+        self._prefetched = False
+        self._last_sweep = 0
+        self._db = ProxyClientPool(connection, debug=0, cache_cas=True)
+        self._keys = CacheModuleKeys(self._db, self._prefix)
 
     def _make_key(self, key):
         return f"{self._prefix}{key}"
 
-    def _expire_keys(self):
-        if self._timeout > 0:
-            expiry_age = time.time() - self._timeout
-            self._keys.remove_by_timerange(0, expiry_age)
+    def _expiration(self):
+        if self._timeout > MAX_RELATIVE_EXPIRATION:
+            return int(time.time() + self._timeout)
+        return self._timeout
+
+    def _live_keys(self):
+        keyset = self._keys.load()
+        if self._timeout <= 0:
+            return list(keyset)
+        now = time.time()
+        expiry_age = now - self._timeout
+        # Expired hosts are filtered here, and only removed from the index once in a while
+        if now - self._last_sweep >= self._sweep_interval:
+            self._last_sweep = now
+            self._keys.remove_by_timerange(0, expiry_age, keyset)
+        return [k for k, t in keyset.items() if t >= expiry_age]
+
+    def _load(self, keys):
+        """Load the records of keys in the in-memory cache with one get_multi, dropping the keys without a record."""
+        values = self._db.get_multi([k for k in keys if k not in self._cache], key_prefix=self._prefix)
+        self._cache.update(values)
+        # guard against the key not being removed from the index;
+        # this could happen in cases where the timeout value is changed
+        # between invocations, or when memcached evicted the record
+        missing = [k for k in keys if k not in self._cache]
+        if missing:
+            self._keys.discard(*missing)
+
+    def prefetch(self, keys=None):
+        """Load the records of keys, or of all keys, in the in-memory cache."""
+        self._load(self.keys() if keys is None else keys)
 
     def get(self, key):
         if key not in self._cache:
-            value = self._db.get(self._make_key(key))
-            # guard against the key not being removed from the keyset;
-            # this could happen in cases where the timeout value is changed
-            # between invocations
-            if value is None:
-                self.delete(key)
-                raise KeyError
-            self._cache[key] = value
+            if self._prefetch and not self._prefetched:
+                self._prefetched = True
+                self.prefetch()
+            if key not in self._cache:
+                self._load([key])
+                if key not in self._cache:
+                    raise KeyError
 
         return self._cache.get(key)
 
     def set(self, key, value):
-        self._db.set(self._make_key(key), value, time=self._timeout, min_compress_len=1)
+        self._db.set(self._make_key(key), value, time=self._expiration(), min_compress_len=1)
         self._cache[key] = value
         self._keys.add(key)
 
     def keys(self):
-        self._expire_keys()
-        return list(iter(self._keys))
+        return self._live_keys()
 
     def contains(self, key):
-        self._expire_keys()
-        return key in self._keys
+        # memcached expires the records itself, so the record is the authority
+        if key not in self._cache:
+            value = self._db.get(self._make_key(key))
+            if value is None:
+                return False
+            self._cache[key] = value
+        return True
 
     def delete(self, key):
-        del self._cache[key]
+        self._cache.pop(key, None)
         self._db.delete(self._make_key(key))
         self._keys.discard(key)
 
     def flush(self):
-        for key in self.keys():
-            self.delete(key)
+        keys = list(self._keys.load())
+        self._cache = {}
+        self._db.delete_multi(keys, key_prefix=self._prefix)
+        self._keys.clear()
 
     def copy(self):
-        return self._keys.copy()
+        keys = self.keys()
+        self._load(keys)
+        return {k: self._cache[k] for k in keys if k in self._cache}
 
     def __getstate__(self):
         return dict()
@@ -10,8 +10,10 @@ name: redis
 short_description: Use Redis DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in Redis.
+  - Writes and multi-key reads are sent in pipelines, so that each of them needs a single round-trip.
 requirements:
   - redis>=2.4.5 (python lib)
+  - msgpack (python lib), if O(_serializer=msgpack)
 options:
   _uri:
     description:
@@ -64,13 +66,56 @@ options:
     ini:
       - key: fact_caching_timeout
         section: defaults
+  _serializer:
+    description:
+      - Format of the records.
+      - V(msgpack) records are smaller and faster to decode, but cannot be read by tools expecting JSON.
+      - Records written with another serializer are treated as missing.
+    type: string
+    choices: [json, msgpack]
+    default: json
+    env:
+      - name: ANSIBLE_CACHE_REDIS_SERIALIZER
+    ini:
+      - key: fact_caching_redis_serializer
+        section: defaults
+    version_added: 13.4.0
+  _compression:
+    description:
+      - Compress records with zlib before they are stored.
+      - Records are decompressed when read whatever the value of this option, so it can be changed at any time.
+    type: string
+    choices: [none, zlib]
+    default: none
+    env:
+      - name: ANSIBLE_CACHE_REDIS_COMPRESSION
+    ini:
+      - key: fact_caching_redis_compression
+        section: defaults
+    version_added: 13.4.0
+  _prefetch:
+    description:
+      - Load the records of all hosts with pipelined C(MGET) commands the first time a record is missing from the
+        in-memory cache, instead of one C(GET) per host.
+      - Useful when most of the cached hosts are used by the play.
+    type: bool
+    default: false
+    env:
+      - name: ANSIBLE_CACHE_REDIS_PREFETCH
+    ini:
+      - key: fact_caching_redis_prefetch
+        section: defaults
+    version_added: 13.4.0
 """
 
 import json
 import re
 import time
+import zlib
+from collections.abc import Mapping, Set
 
 from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_text
 from ansible.parsing.ajson import AnsibleJSONDecoder, AnsibleJSONEncoder
 from ansible.plugins.cache import BaseCacheModule
 from ansible.utils.display import Display
@@ -82,8 +127,34 @@ try:
 except ImportError:
     HAS_REDIS = False
 
+try:
+    import msgpack
+
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
 display = Display()
 
+# Minimum number of seconds between two removals of expired keys from the keyset
+EXPIRE_INTERVAL = 60
+
+# Number of records requested by one MGET
+MGET_CHUNK_SIZE = 1000
+
+# First byte of zlib streams with the default window size; JSON and msgpack maps never start with it
+ZLIB_HEADER = b"\x78"
+
+
+def _msgpack_default(obj):
+    # Subclasses of the native types are passed here because of strict_types, so that
+    # tagged strings (unsafe, vault) keep their JSON object representation
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (list, tuple, Set)):
+        return list(obj)
+    return AnsibleJSONEncoder().default(obj)
+
 
 class CacheModule(BaseCacheModule):
     """
@@ -109,13 +180,22 @@ class CacheModule(BaseCacheModule):
         self._prefix = self.get_option("_prefix")
         self._keys_set = self.get_option("_keyset_name")
         self._sentinel_service_name = self.get_option("_sentinel_service_name")
+        self._serializer = self.get_option("_serializer")
+        self._compression = self.get_option("_compression")
+        self._prefetch = self.get_option("_prefetch")
 
         if not HAS_REDIS:
             raise AnsibleError(
                 "The 'redis' python module (version 2.4.5 or newer) is required for the redis fact cache, 'pip install redis'"
             )
+        if self._serializer == "msgpack" and not HAS_MSGPACK:
+            raise AnsibleError(
+                "The 'msgpack' python module is required to use the msgpack serializer, 'pip install msgpack'"
+            )
 
         self._cache = {}
+        self._prefetched = False
+        self._last_expire = 0
         kw = {}
 
         # tls connection
@@ -177,59 +257,120 @@ class CacheModule(BaseCacheModule):
     def _make_key(self, key):
         return self._prefix + key
 
+    def _encode(self, value):
+        if self._serializer == "msgpack":
+            data = msgpack.packb(value, default=_msgpack_default, strict_types=True, use_bin_type=True)
+        else:
+            data = json.dumps(value, cls=AnsibleJSONEncoder, separators=(",", ":")).encode("utf-8")
+        if self._compression == "zlib":
+            data = zlib.compress(data)
+        return data
+
+    def _decode(self, data):
+        if data[:1] == ZLIB_HEADER:
+            data = zlib.decompress(data)
+        if self._serializer == "msgpack":
+            return msgpack.unpackb(data, object_hook=AnsibleJSONDecoder().object_hook, raw=False)
+        return json.loads(data, cls=AnsibleJSONDecoder)
+
+    def _load(self, key, data):
+        # guard against the key not being removed from the zset;
+        # this could happen in cases where the timeout value is changed
+        # between invocations
+        if data is None:
+            return False
+        try:
+            self._cache[key] = self._decode(data)
+        except (ValueError, TypeError, zlib.error) as e:
+            display.vvvv(f"Ignoring unreadable redis cache record for {key}: {e}")
+            return False
+        return True
+
+    def _mget(self, keys):
+        """Load the records of keys in the in-memory cache, returning the keys that have no readable record."""
+        missing = []
+        for start in range(0, len(keys), MGET_CHUNK_SIZE):
+            chunk = keys[start : start + MGET_CHUNK_SIZE]
+            for key, data in zip(chunk, self._db.mget([self._make_key(k) for k in chunk])):
+                if not self._load(key, data):
+                    missing.append(key)
+        return missing
+
+    def _delete_keys(self, keys):
+        if not keys:
+            return
+        for key in keys:
+            self._cache.pop(key, None)
+        pipe = self._db.pipeline(transaction=False)
+        pipe.delete(*[self._make_key(key) for key in keys])
+        pipe.zrem(self._keys_set, *keys)
+        pipe.execute()
+
+    def prefetch(self, keys=None):
+        """Load the records of keys, or of all keys, in the in-memory cache with pipelined MGET commands."""
+        if keys is None:
+            keys = self.keys()
+        self._delete_keys(self._mget([key for key in keys if key not in self._cache]))
+
     def get(self, key):
         if key not in self._cache:
-            value = self._db.get(self._make_key(key))
-            # guard against the key not being removed from the zset;
-            # this could happen in cases where the timeout value is changed
-            # between invocations
-            if value is None:
+            if self._prefetch and not self._prefetched:
+                self._prefetched = True
+                self.prefetch()
+            if key not in self._cache and not self._load(key, self._db.get(self._make_key(key))):
                 self.delete(key)
                 raise KeyError
-            self._cache[key] = json.loads(value, cls=AnsibleJSONDecoder)
 
         return self._cache.get(key)
 
     def set(self, key, value):
-        value2 = json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, indent=4)
+        pipe = self._db.pipeline(transaction=False)
         if self._timeout > 0:  # a timeout of 0 is handled as meaning 'never expire'
-            self._db.setex(self._make_key(key), int(self._timeout), value2)
+            pipe.setex(self._make_key(key), int(self._timeout), self._encode(value))
         else:
-            self._db.set(self._make_key(key), value2)
+            pipe.set(self._make_key(key), self._encode(value))
 
         if VERSION[0] == 2:
-            self._db.zadd(self._keys_set, time.time(), key)
+            pipe.zadd(self._keys_set, time.time(), key)
         else:
-            self._db.zadd(self._keys_set, {key: time.time()})
+            pipe.zadd(self._keys_set, {key: time.time()})
+        pipe.execute()
         self._cache[key] = value
 
-    def _expire_keys(self):
-        if self._timeout > 0:
-            expiry_age = time.time() - self._timeout
-            self._db.zremrangebyscore(self._keys_set, 0, expiry_age)
+    def _expiry_age(self):
+        return time.time() - self._timeout
+
+    def _expire_keys(self, pipe):
+        # Reads compare the scores with the expiry age themselves, so removing the
+        # expired keys from the zset is only housekeeping and done once in a while
+        now = time.time()
+        if self._timeout > 0 and now - self._last_expire >= EXPIRE_INTERVAL:
+            self._last_expire = now
+            pipe.zremrangebyscore(self._keys_set, 0, self._expiry_age())
 
     def keys(self):
-        self._expire_keys()
-        return self._db.zrange(self._keys_set, 0, -1)
+        pipe = self._db.pipeline(transaction=False)
+        self._expire_keys(pipe)
+        if self._timeout > 0:
+            pipe.zrangebyscore(self._keys_set, self._expiry_age(), "+inf")
+        else:
+            pipe.zrange(self._keys_set, 0, -1)
+        return [to_text(key) for key in pipe.execute()[-1]]
 
     def contains(self, key):
-        self._expire_keys()
-        return self._db.zrank(self._keys_set, key) is not None
+        score = self._db.zscore(self._keys_set, key)
+        return score is not None and (self._timeout <= 0 or score >= self._expiry_age())
 
     def delete(self, key):
-        if key in self._cache:
-            del self._cache[key]
-        self._db.delete(self._make_key(key))
-        self._db.zrem(self._keys_set, key)
+        self._delete_keys([key])
 
     def flush(self):
-        for key in list(self.keys()):
-            self.delete(key)
+        self._delete_keys(self.keys())
 
     def copy(self):
-        # TODO: there is probably a better way to do this in redis
-        ret = {k: self.get(k) for k in self.keys()}
-        return ret
+        keys = self.keys()
+        self.prefetch(keys)
+        return {k: self._cache[k] for k in keys if k in self._cache}
 
     def __getstate__(self):
         return dict()
@@ -0,0 +1,235 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+DOCUMENTATION = r"""
+name: sqlite
+short_description: Use a SQLite database for cache
+version_added: 13.4.0
+description:
+  - This cache uses JSON formatted, per host records saved in a single SQLite database.
+  - The database uses write-ahead logging, so that several processes can read it while one of them writes.
+  - Writes are buffered and committed together in one transaction, see O(_batch_size).
+  - Expired records are removed with a single query on an indexed column.
+author: Unknown (!UNKNOWN)
+options:
+  _uri:
+    required: true
+    description:
+      - Path of the SQLite database file. It is created if it does not exist.
+      - If the path is an existing directory, the database file C(ansible_cache.sqlite) is used in that directory.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_CONNECTION
+    ini:
+      - key: fact_caching_connection
+        section: defaults
+    type: path
+  _prefix:
+    description: User defined prefix to use when creating the records.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_PREFIX
+    ini:
+      - key: fact_caching_prefix
+        section: defaults
+    type: string
+    default: ''
+  _timeout:
+    default: 86400
+    description: Expiration timeout in seconds for the cache plugin data. Set to 0 to never expire.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_TIMEOUT
+    ini:
+      - key: fact_caching_timeout
+        section: defaults
+    type: float
+  _batch_size:
+    description:
+      - Number of records to buffer before they are written to the database in one transaction.
+      - Buffered records are also written before the database is read, and when Ansible exits.
+      - Set to V(1) to write every record immediately.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_SQLITE_BATCH_SIZE
+    ini:
+      - key: fact_caching_sqlite_batch_size
+        section: defaults
+    type: integer
+    default: 100
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import time
+import weakref
+
+from ansible.errors import AnsibleError
+from ansible.parsing.ajson import AnsibleJSONDecoder, AnsibleJSONEncoder
+from ansible.plugins.cache import BaseCacheModule
+
+# Largest code point, used as upper bound of the range of keys starting with the prefix
+_MAX_CHAR = "\U0010ffff"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS cache_updated ON cache (updated)",
+)
+
+
+def _flush_at_exit(ref):
+    cache = ref()
+    if cache is not None:
+        cache.commit()
+
+
+class CacheModule(BaseCacheModule):
+    """
+    A caching module backed by a SQLite database.
+
+    Each host is one row of the cache table, with the time it was written in
+    the indexed 'updated' column. Expired rows are never returned, and they are
+    removed with one DELETE when the keys are listed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._path = self.get_option("_uri")
+        if not self._path:
+            raise AnsibleError("The sqlite cache plugin requires the 'fact_caching_connection' option to be set")
+        if os.path.isdir(self._path):
+            self._path = os.path.join(self._path, "ansible_cache.sqlite")
+        self._prefix = self.get_option("_prefix") or ""
+        self._timeout = float(self.get_option("_timeout"))
+        self._batch_size = max(1, self.get_option("_batch_size"))
+
+        self._cache = {}
+        self._pending = {}
+        self._db = None
+        self._pid = None
+        self._connect()
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    def _connect(self):
+        # A connection must not be shared with a forked process
+        if self._db is None or self._pid != os.getpid():
+            try:
+                db = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                for statement in _SCHEMA:
+                    db.execute(statement)
+            except sqlite3.Error as e:
+                raise AnsibleError(f"Unable to open the sqlite cache database {self._path}: {e}") from e
+            self._db = db
+            self._pid = os.getpid()
+        return self._db
+
+    def _make_key(self, key):
+        return self._prefix + key
+
+    def _expiry(self):
+        if self._timeout > 0:
+            return time.time() - self._timeout
+        return float("-inf")
+
+    def commit(self):
+        """Write the buffered records in one transaction."""
+        if not self._pending:
+            return
+        rows = list(self._pending.values())
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany("INSERT OR REPLACE INTO cache (key, value, updated) VALUES (?, ?, ?)", rows)
+        self._pending.clear()
+
+    def get(self, key):
+        if key not in self._cache:
+            db_key = self._make_key(key)
+            if db_key in self._pending:
+                value = self._pending[db_key][1]
+            else:
+                row = (
+                    self._connect()
+                    .execute("SELECT value FROM cache WHERE key = ? AND updated >= ?", (db_key, self._expiry()))
+                    .fetchone()
+                )
+                if row is None:
+                    raise KeyError
+                value = row[0]
+            self._cache[key] = json.loads(value, cls=AnsibleJSONDecoder)
+
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        db_key = self._make_key(key)
+        self._pending[db_key] = (db_key, json.dumps(value, cls=AnsibleJSONEncoder, separators=(",", ":")), time.time())
+        self._cache[key] = value
+        if len(self._pending) >= self._batch_size:
+            self.commit()
+
+    def keys(self):
+        self.commit()
+        db = self._connect()
+        upper = self._prefix + _MAX_CHAR
+        with db:
+            if self._timeout > 0:
+                db.execute(
+                    "DELETE FROM cache WHERE key >= ? AND key < ? AND updated < ?",
+                    (self._prefix, upper, self._expiry()),
+                )
+            rows = db.execute("SELECT key FROM cache WHERE key >= ? AND key < ?", (self._prefix, upper)).fetchall()
+        return [row[0][len(self._prefix) :] for row in rows]
+
+    def contains(self, key):
+        db_key = self._make_key(key)
+        if db_key in self._pending:
+            return True
+        row = (
+            self._connect()
+            .execute("SELECT 1 FROM cache WHERE key = ? AND updated >= ?", (db_key, self._expiry()))
+            .fetchone()
+        )
+        return row is not None
+
+    def delete(self, key):
+        db_key = self._make_key(key)
+        self._cache.pop(key, None)
+        self._pending.pop(db_key, None)
+        db = self._connect()
+        with db:
+            db.execute("DELETE FROM cache WHERE key = ?", (db_key,))
+
+    def flush(self):
+        self._cache = {}
+        self._pending.clear()
+        db = self._connect()
+        with db:
+            db.execute("DELETE FROM cache WHERE key >= ? AND key < ?", (self._prefix, self._prefix + _MAX_CHAR))
+
+    def copy(self):
+        self.commit()
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT key, value FROM cache WHERE key >= ? AND key < ? AND updated >= ?",
+                (self._prefix, self._prefix + _MAX_CHAR, self._expiry()),
+            )
+            .fetchall()
+        )
+        ret = {}
+        for db_key, value in rows:
+            key = db_key[len(self._prefix) :]
+            if key not in self._cache:
+                self._cache[key] = json.loads(value, cls=AnsibleJSONDecoder)
+            ret[key] = self._cache[key]
+        return ret
+
+    def __getstate__(self):
+        self.commit()
+        return dict()
+
+    def __setstate__(self, data):
+        self.__init__()
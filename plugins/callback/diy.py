@@ -783,6 +783,8 @@ from ansible.module_utils.common.text.converters import to_text
 from ansible.plugins.callback.default import CallbackModule as Default
 from ansible.template import Templar
 from ansible.vars.manager import VariableManager
+from jinja2 import Environment, nodes
+from jinja2.exceptions import TemplateError
 
 try:
     from ansible.template import trust_as_template  # noqa: F401, pylint: disable=unused-import
@@ -803,6 +805,56 @@ class DummyStdout:
         pass
 
 
+ALL_SECTIONS = None
+
+# Attributes that can change while a play runs, and are not taken from the snapshot
+VOLATILE_ATTRIBUTES = ("finalized", "removed_hosts", "squashed", "validated")
+
+
+# Names that templates can use without referencing a variable
+TEMPLATE_NAMES = frozenset(Environment().globals) | {"loop", "caller", "varargs", "kwargs"}
+
+
+def referenced_sections(template, namespace="ansible_callback_diy"):
+    """
+    Return the set of keys of the namespace dictionary that a template references,
+    or ALL_SECTIONS if they cannot be determined statically.
+
+    The sections are only narrowed down when every reference is a direct attribute
+    or literal key access on the namespace. Any other variable, including vars and
+    hostvars, can hold a template or a reference that uses the namespace itself.
+    """
+    if not isinstance(template, str):
+        return ALL_SECTIONS if template is not None else set()
+    if "{" not in template:
+        return set()
+    try:
+        ast = Environment().parse(template)
+    except TemplateError:
+        return ALL_SECTIONS
+
+    # Lookups, and variables which are not defined in the template, are resolved at runtime
+    names = {node.name for node in ast.find_all(nodes.Name) if node.ctx == "load"}
+    declared = {node.name for node in ast.find_all(nodes.Name) if node.ctx in ("store", "param")}
+    if names - declared - TEMPLATE_NAMES - {namespace}:
+        return ALL_SECTIONS
+
+    sections = set()
+    keyed = 0
+    for node in ast.find_all((nodes.Getattr, nodes.Getitem)):
+        if isinstance(node.node, nodes.Name) and node.node.name == namespace:
+            key = node.attr if isinstance(node, nodes.Getattr) else getattr(node.arg, "value", None)
+            if not isinstance(key, str):
+                return ALL_SECTIONS
+            sections.add(key)
+            keyed += 1
+    uses = sum(1 for node in ast.find_all(nodes.Name) if node.name == namespace and node.ctx == "load")
+    if uses > keyed:
+        # The namespace is used as a whole, for example iterated over
+        return ALL_SECTIONS
+    return sections
+
+
 class CallbackModule(Default):
     """
     Callback plugin that allows you to supply your own custom callback templates to be output.
@@ -814,6 +866,12 @@ class CallbackModule(Default):
 
     DIY_NS = "ansible_callback_diy"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._diy_referenced_sections = {}
+        self._diy_option_sections = None
+        self._diy_snapshots = {}
+
     @contextmanager
     def _suppress_stdout(self, enabled):
         saved_stdout = sys.stdout
@@ -850,6 +908,56 @@ class CallbackModule(Default):
         _templar = Templar(loader=loader, variables=variables)
         return _templar.template(template, preserve_trailing_newlines=True, convert_data=False, escape_backslashes=True)
 
+    def _referenced_sections(self, template):
+        """Analyze every template only once"""
+        if template not in self._diy_referenced_sections:
+            self._diy_referenced_sections[template] = referenced_sections(template, namespace=self.DIY_NS)
+        return self._diy_referenced_sections[template]
+
+    def _needed_sections(self, variables):
+        """
+        Return the keys of the ansible_callback_diy dictionary used by any of the configured templates,
+        or ALL_SECTIONS. The templates of all callbacks are considered, since some callbacks reuse the
+        variables of the previous one.
+        """
+        if self._diy_option_sections is None:
+            self._diy_option_sections = set()
+            for option in getattr(self, "_plugin_options", {}):
+                if option.endswith(("_msg", "_msg_color")):
+                    sections = self._referenced_sections(self.get_option(option))
+                    if sections is ALL_SECTIONS:
+                        self._diy_option_sections = ALL_SECTIONS
+                        break
+                    self._diy_option_sections |= sections
+
+        needed = self._diy_option_sections
+        if needed is ALL_SECTIONS:
+            return ALL_SECTIONS
+        prefix = f"{self.DIY_NS}_"
+        for name, template in variables.items():
+            if name.startswith(prefix) and name.endswith(("_msg", "_msg_color")):
+                sections = self._referenced_sections(template)
+                if sections is ALL_SECTIONS:
+                    return ALL_SECTIONS
+                needed = needed | sections
+        return needed
+
+    def _snapshot(self, name, obj, attributes):
+        """Return the attributes of the playbook or the play, which do not change while it runs"""
+        cached = self._diy_snapshots.get(name)
+        if cached is None or cached[0] is not obj:
+            cached = (obj, {attr: self._get_attr_value(obj, attr) for attr in attributes})
+            self._diy_snapshots[name] = cached
+        snapshot = dict(cached[1])
+        for attr in VOLATILE_ATTRIBUTES:
+            if attr in snapshot:
+                snapshot[attr] = self._get_attr_value(obj, attr)
+        return snapshot
+
+    @staticmethod
+    def _get_attr_value(obj, attr):
+        return getattr(obj, attr, getattr(obj, f"_{attr}", None))
+
     def _output(self, spec, stderr=False):
         _msg = to_text(spec["msg"])
         if len(_msg) > 0:
@@ -891,25 +999,32 @@ class CallbackModule(Default):
 
         _ret = {}
 
-        _variable_manager = VariableManager(loader=playbook.get_loader())
-
-        _all = _variable_manager.get_vars()
         if play:
             _all = play.get_variable_manager().get_vars(
                 play=play, host=(host if host else getattr(result, "_host", None)), task=(handler if handler else task)
             )
+        else:
+            _variable_manager = VariableManager(loader=playbook.get_loader())
+            _all = _variable_manager.get_vars()
         _ret.update(_all)
 
         _ret.update(_ret.get(self.DIY_NS, {self.DIY_NS: {} if SUPPORTS_DATA_TAGGING else CallbackDIYDict()}))
 
-        _ret[self.DIY_NS].update({"playbook": {}})
-        _playbook_attributes = ["entries", "file_name", "basedir"]
+        # Only gather the event data that the templates use
+        _needed = self._needed_sections(_ret)
+        if _needed is not ALL_SECTIONS:
+            play = play if "play" in _needed else None
+            host = host if "host" in _needed or "handler" in _needed else None
+            task = task if "task" in _needed else None
+            included_file = included_file if "included_file" in _needed else None
+            handler = handler if "handler" in _needed else None
+            stats = stats if "stats" in _needed else None
 
-        for attr in _playbook_attributes:
-            _ret[self.DIY_NS]["playbook"].update({attr: _get_value(obj=playbook, attr=attr)})
+        if _needed is ALL_SECTIONS or "playbook" in _needed:
+            _playbook_attributes = ["entries", "file_name", "basedir"]
+            _ret[self.DIY_NS].update({"playbook": self._snapshot("playbook", playbook, _playbook_attributes)})
 
         if play:
-            _ret[self.DIY_NS].update({"play": {}})
             _play_attributes = [
                 "any_errors_fatal",
                 "become",
@@ -959,8 +1074,7 @@ class CallbackModule(Default):
                 "vars_prompt",
             ]
 
-            for attr in _play_attributes:
-                _ret[self.DIY_NS]["play"].update({attr: _get_value(obj=play, attr=attr)})
+            _ret[self.DIY_NS].update({"play": self._snapshot("play", play, _play_attributes)})
 
         if host:
             _ret[self.DIY_NS].update({"host": {}})
@@ -1094,7 +1208,7 @@ class CallbackModule(Default):
 
             _ret[self.DIY_NS]["handler"].update({"is_host_notified": handler.is_host_notified(host)})
 
-        if result:
+        if result and (_needed is ALL_SECTIONS or "result" in _needed):
             _ret[self.DIY_NS].update({"result": {}})
             _result_attributes = ["host", "task", "task_name"]
 
@@ -1108,6 +1222,7 @@ class CallbackModule(Default):
 
             _ret[self.DIY_NS]["result"].update({"output": getattr(result, "_result", None)})
 
+        if result:
             _ret.update(result._result)
 
         if stats:
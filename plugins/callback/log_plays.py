@@ -25,12 +25,84 @@ options:
     ini:
       - section: callback_log_plays
         key: log_folder
+  log_format:
+    description:
+      - V(text) writes the results to one file per host in O(log_folder).
+      - V(jsonl) writes the results of all hosts to the single file O(log_file) in O(log_folder), in the JSON Lines format.
+        Every line is a JSON object with the keys C(time), C(playbook), C(host), C(task), C(action), C(category),
+        C(invocation), and C(result).
+    type: str
+    default: text
+    choices: [text, jsonl]
+    env:
+      - name: ANSIBLE_LOG_PLAYS_FORMAT
+    ini:
+      - section: callback_log_plays
+        key: log_format
+    version_added: 13.4.0
+  log_file:
+    description:
+      - The name of the file in O(log_folder) to write to when O(log_format=jsonl).
+    type: str
+    default: ansible.jsonl
+    env:
+      - name: ANSIBLE_LOG_PLAYS_FILE
+    ini:
+      - section: callback_log_plays
+        key: log_file
+    version_added: 13.4.0
+  max_open_files:
+    description:
+      - The maximum number of log files to keep open between results. When more files are needed, the least recently
+        used one is closed.
+      - Keeping the files open avoids opening and closing the log file for every result, which is slow on network file
+        systems with many hosts.
+      - V(0) opens and closes the log file for every result.
+    type: int
+    default: 0
+    env:
+      - name: ANSIBLE_LOG_PLAYS_MAX_OPEN_FILES
+    ini:
+      - section: callback_log_plays
+        key: max_open_files
+    version_added: 13.4.0
+  flush_interval:
+    description:
+      - When log files are kept open with O(max_open_files), the number of seconds during which results can stay in the
+        write buffers before they are written to the log files.
+      - V(0) writes every result immediately.
+      - All log files are flushed and synced to disk at the end of the playbook.
+    type: float
+    default: 0
+    env:
+      - name: ANSIBLE_LOG_PLAYS_FLUSH_INTERVAL
+    ini:
+      - section: callback_log_plays
+        key: flush_interval
+    version_added: 13.4.0
+  rotate_size:
+    description:
+      - When O(log_format=jsonl), rotate O(log_file) once it is larger than this number of bytes. The rotated file is
+        compressed with gzip and named after O(log_file) with the rotation time and C(.gz) appended.
+      - V(0) disables rotation.
+    type: int
+    default: 0
+    env:
+      - name: ANSIBLE_LOG_PLAYS_ROTATE_SIZE
+    ini:
+      - section: callback_log_plays
+        key: rotate_size
+    version_added: 13.4.0
 """
 
+import gzip
 import json
 import os
+import shutil
 import time
+from collections import OrderedDict
 from collections.abc import MutableMapping
+from datetime import datetime
 
 from ansible.module_utils.common.text.converters import to_bytes
 from ansible.parsing.ajson import AnsibleJSONEncoder
@@ -44,6 +116,54 @@ from ansible.utils.path import makedirs_safe
 # that want it.
 
 
+class LogFilePool:
+    """
+    Append to log files, keeping up to max_open of them open.
+    The least recently used file is closed when another one needs to be opened.
+    """
+
+    def __init__(self, max_open=0, flush_interval=0):
+        self.max_open = max_open
+        self.flush_interval = flush_interval
+        self._files = OrderedDict()
+        self._last_flush = time.monotonic()
+
+    def write(self, path, data):
+        """Append data to path, and return the size of the file afterwards."""
+        if self.max_open <= 0:
+            with open(path, "ab") as fd:
+                fd.write(data)
+                return fd.tell()
+
+        fd = self._files.pop(path, None)
+        if fd is None:
+            while len(self._files) >= self.max_open:
+                self._files.popitem(last=False)[1].close()
+            fd = open(path, "ab")
+        self._files[path] = fd
+        fd.write(data)
+        now = time.monotonic()
+        if self.flush_interval <= 0 or now - self._last_flush >= self.flush_interval:
+            self.flush()
+            self._last_flush = now
+        return fd.tell()
+
+    def flush(self, sync=False):
+        for fd in self._files.values():
+            fd.flush()
+            if sync:
+                os.fsync(fd.fileno())
+
+    def close(self, path=None):
+        if path is not None:
+            fd = self._files.pop(path, None)
+            if fd is not None:
+                fd.close()
+            return
+        while self._files:
+            self._files.popitem()[1].close()
+
+
 class CallbackModule(CallbackBase):
     """
     logs playbook results, per host, in /var/log/ansible/hosts
@@ -62,16 +182,27 @@ class CallbackModule(CallbackBase):
 
     def __init__(self):
         super().__init__()
+        self.files = LogFilePool()
 
     def set_options(self, task_keys=None, var_options=None, direct=None):
         super().set_options(task_keys=task_keys, var_options=var_options, direct=direct)
 
         self.log_folder = self.get_option("log_folder")
+        self.log_format = self.get_option("log_format")
+        self.log_file = self.get_option("log_file")
+        self.rotate_size = self.get_option("rotate_size")
+        self.files = LogFilePool(
+            max_open=self.get_option("max_open_files"), flush_interval=self.get_option("flush_interval")
+        )
 
         if not os.path.exists(self.log_folder):
             makedirs_safe(self.log_folder)
 
     def log(self, result, category):
+        if self.log_format == "jsonl":
+            self._log_jsonl(result, category)
+            return
+
         data = result._result
         if isinstance(data, MutableMapping):
             if "_ansible_verbose_override" in data:
@@ -88,8 +219,47 @@ class CallbackModule(CallbackBase):
         now = time.strftime(self.TIME_FORMAT, time.localtime())
 
         msg = to_bytes(self._make_msg(now, self.playbook, result._task.name, result._task.action, category, data))
-        with open(path, "ab") as fd:
-            fd.write(msg)
+        self.files.write(path, msg)
+
+    def _log_jsonl(self, result, category):
+        data = result._result
+        invocation = None
+        if isinstance(data, MutableMapping):
+            if "_ansible_verbose_override" in data:
+                # avoid logging extraneous data
+                data = "omitted"
+            else:
+                data = data.copy()
+                invocation = data.pop("invocation", None)
+
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime()),
+            "playbook": self.playbook,
+            "host": result._host.get_name(),
+            "task": result._task.name,
+            "action": result._task.action,
+            "category": category,
+            "invocation": invocation,
+            "result": data,
+        }
+        path = os.path.join(self.log_folder, self.log_file)
+        size = self.files.write(
+            path, to_bytes(json.dumps(record, cls=AnsibleJSONEncoder, separators=(",", ":")) + "\n")
+        )
+        if self.rotate_size > 0 and size >= self.rotate_size:
+            self._rotate(path)
+
+    def _rotate(self, path):
+        self.files.close(path)
+        rotated = f"{path}.{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        if os.path.exists(f"{rotated}.gz"):
+            # rotated twice within a microsecond, do not overwrite the previous file
+            time.sleep(0.001)
+            rotated = f"{path}.{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        os.rename(path, rotated)
+        with open(rotated, "rb") as src, gzip.open(f"{rotated}.gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(rotated)
 
     def v2_runner_on_failed(self, result, ignore_errors=False):
         self.log(result, "FAILED")
@@ -109,6 +279,10 @@ class CallbackModule(CallbackBase):
     def v2_playbook_on_start(self, playbook):
         self.playbook = playbook._file_name
 
+    def v2_playbook_on_stats(self, stats):
+        self.files.flush(sync=True)
+        self.files.close()
+
     def v2_playbook_on_import_for_host(self, result, imported_file):
         self.log(result, "IMPORTED", imported_file)
 
@@ -67,6 +67,87 @@ options:
         key: batch
     type: str
     version_added: 3.3.0
+  send_async:
+    description:
+      - Send events from a background thread instead of sending every event synchronously while the play runs.
+      - Events are collected into batches for the HTTP Event Collector, which are sent when one of O(flush_events),
+        O(flush_bytes), or O(flush_interval) is reached, and at the end of the playbook.
+      - The number of sent, retried, and dropped events is shown at the end of the playbook.
+    env:
+      - name: SPLUNK_SEND_ASYNC
+    ini:
+      - section: callback_splunk
+        key: send_async
+    type: bool
+    default: false
+    version_added: 13.4.0
+  queue_size:
+    description:
+      - Maximum number of events waiting to be sent when O(send_async=true).
+      - Events are dropped when the queue is full.
+    env:
+      - name: SPLUNK_QUEUE_SIZE
+    ini:
+      - section: callback_splunk
+        key: queue_size
+    type: int
+    default: 10000
+    version_added: 13.4.0
+  flush_events:
+    description:
+      - Maximum number of events sent in one batch when O(send_async=true).
+    env:
+      - name: SPLUNK_FLUSH_EVENTS
+    ini:
+      - section: callback_splunk
+        key: flush_events
+    type: int
+    default: 100
+    version_added: 13.4.0
+  flush_bytes:
+    description:
+      - Size in bytes of the uncompressed batch after which it is sent when O(send_async=true).
+    env:
+      - name: SPLUNK_FLUSH_BYTES
+    ini:
+      - section: callback_splunk
+        key: flush_bytes
+    type: int
+    default: 1048576
+    version_added: 13.4.0
+  flush_interval:
+    description:
+      - Maximum number of seconds an event waits in a batch before the batch is sent when O(send_async=true).
+    env:
+      - name: SPLUNK_FLUSH_INTERVAL
+    ini:
+      - section: callback_splunk
+        key: flush_interval
+    type: float
+    default: 5
+    version_added: 13.4.0
+  compress:
+    description:
+      - Whether to compress batches with gzip when O(send_async=true).
+    env:
+      - name: SPLUNK_COMPRESS
+    ini:
+      - section: callback_splunk
+        key: compress
+    type: bool
+    default: true
+    version_added: 13.4.0
+  retries:
+    description:
+      - Number of times sending a batch is retried before its events are dropped when O(send_async=true).
+    env:
+      - name: SPLUNK_RETRIES
+    ini:
+      - section: callback_splunk
+        key: retries
+    type: int
+    default: 3
+    version_added: 13.4.0
 """
 
 EXAMPLES = r"""
@@ -81,11 +162,18 @@ examples: >-
     [callback_splunk]
     url = http://mysplunkinstance.datapaas.io:8088/services/collector/event
     authtoken = f23blad6-5965-4537-bf69-5b5a545blabla88
+  Send events in batches from a background thread
+    [callback_splunk]
+    send_async = true
 """
 
 import getpass
+import gzip
 import json
+import queue
 import socket
+import threading
+import time
 import uuid
 from os.path import basename
 
@@ -99,6 +187,89 @@ from ansible_collections.community.general.plugins.module_utils._datetime import
 )
 
 
+class SplunkHTTPCollectorSender(threading.Thread):
+    """Python thread sending batches of events to the HTTP Event Collector"""
+
+    _STOP = object()
+
+    def __init__(
+        self, url, authtoken, validate_certs, queue_size, flush_events, flush_bytes, flush_interval, compress, retries
+    ):
+        threading.Thread.__init__(self, name="splunk-hec-sender", daemon=True)
+        self.url = url
+        self.authtoken = authtoken
+        self.validate_certs = validate_certs
+        self.flush_events = flush_events
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.compress = compress
+        self.retries = retries
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.sent = 0
+        self.retried = 0
+        self.dropped = 0
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+
+    def close(self):
+        """Send all queued events and stop the thread"""
+        self.queue.put(self._STOP)
+        self.join()
+
+    def run(self):
+        events = []
+        size = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                event = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                event = None
+            if event is self._STOP:
+                break
+            if event is not None:
+                if not events:
+                    deadline = time.monotonic() + self.flush_interval
+                events.append(event)
+                size += len(event) + 1
+            if len(events) >= self.flush_events or size >= self.flush_bytes or time.monotonic() >= deadline:
+                self._send(events)
+                events = []
+                size = 0
+                deadline = None
+        if events:
+            self._send(events)
+
+    def _send(self, events):
+        # HEC accepts several events in one request, simply concatenated
+        body = "\n".join(events).encode("utf-8")
+        headers = {"Content-type": "application/json", "Authorization": f"Splunk {self.authtoken}"}
+        if self.compress:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        for attempt in range(self.retries + 1):
+            try:
+                open_url(self.url, body, headers=headers, method="POST", validate_certs=self.validate_certs)
+            except Exception:
+                if attempt < self.retries:
+                    with self.lock:
+                        self.retried += len(events)
+                    time.sleep(min(2**attempt, 10))
+            else:
+                with self.lock:
+                    self.sent += len(events)
+                return
+        with self.lock:
+            self.dropped += len(events)
+
+
 class SplunkHTTPCollectorSource:
     def __init__(self):
         self.ansible_check_mode = False
@@ -107,6 +278,7 @@ class SplunkHTTPCollectorSource:
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.sender = None
 
     def send_event(self, url, authtoken, validate_certs, include_milliseconds, batch, state, result, runtime):
         if result._task_fields["args"].get("_ansible_check_mode") is True:
@@ -148,6 +320,10 @@ class SplunkHTTPCollectorSource:
         # This wraps the json payload in and outer json event needed by Splunk
         jsondata = json.dumps({"event": data}, cls=AnsibleJSONEncoder, sort_keys=True)
 
+        if self.sender is not None:
+            self.sender.put(jsondata)
+            return
+
         open_url(
             url,
             jsondata,
@@ -209,6 +385,20 @@ class CallbackModule(CallbackBase):
 
         self.batch = self.get_option("batch")
 
+        if self.get_option("send_async") and not self.disabled:
+            self.splunk.sender = SplunkHTTPCollectorSender(
+                self.url,
+                self.authtoken,
+                self.validate_certs,
+                self.get_option("queue_size"),
+                self.get_option("flush_events"),
+                self.get_option("flush_bytes"),
+                self.get_option("flush_interval"),
+                self.get_option("compress"),
+                self.get_option("retries"),
+            )
+            self.splunk.sender.start()
+
     def v2_playbook_on_start(self, playbook):
         self.splunk.ansible_playbook = basename(playbook._file_name)
 
@@ -277,3 +467,18 @@ class CallbackModule(CallbackBase):
             result,
             self._runtime(result),
         )
+
+    def v2_playbook_on_stats(self, stats):
+        sender = self.splunk.sender
+        if sender is None:
+            return
+        sender.close()
+        self.splunk.sender = None
+        msg = (
+            f"Splunk HTTP collector: {sender.sent} events sent, {sender.retried} events retried, "
+            f"{sender.dropped} events dropped"
+        )
+        if sender.dropped:
+            self._display.warning(msg)
+        else:
+            self._display.vv(msg)
@@ -60,6 +60,27 @@ options:
     default: false
     type: bool
     version_added: 7.3.0
+  transfer_method:
+    description:
+      - How files are transferred to and from the chroot.
+      - V(dd) runs C(dd) inside the chroot for every transfer.
+      - V(copy) copies the files directly from the controller with C(copy_file_range) or C(sendfile), without starting
+        a process. Paths are resolved inside the chroot directory like the chroot would, so symbolic links cannot point
+        outside of it. Files are created with the owner and mode C(dd) would give them, and existing files keep theirs.
+        When the direct copy fails, the transfer is retried with V(dd).
+      - Use V(dd) if O(chroot_exe) mounts file systems that are not visible from the controller, for example a
+        private C(/tmp).
+    type: string
+    choices: [dd, copy]
+    default: dd
+    ini:
+      - section: chroot_connection
+        key: transfer_method
+    env:
+      - name: ANSIBLE_CHROOT_TRANSFER_METHOD
+    vars:
+      - name: ansible_chroot_transfer_method
+    version_added: 13.4.0
 """
 
 EXAMPLES = r"""
@@ -70,8 +91,10 @@ EXAMPLES = r"""
         msg: "This is coming from chroot environment"
 """
 
+import errno
 import os
 import os.path
+import stat
 import subprocess
 import traceback
 from shlex import quote as shlex_quote
@@ -85,6 +108,91 @@ from ansible.utils.display import Display
 
 display = Display()
 
+# Same limit as the kernel for the number of symbolic links followed when resolving one path
+MAX_SYMLINKS = 40
+
+_DIR_FLAGS = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW | os.O_CLOEXEC
+
+
+def _open_in_root(root, path, flags, mode=0o666):
+    """Open path as seen from inside the root directory.
+
+    Every component is opened relative to its parent with O_NOFOLLOW, and
+    symbolic links are resolved by hand with absolute targets and '..'
+    relative to root, so that no link can lead outside of root.
+    """
+    symlinks = 0
+    stack = [os.open(root, _DIR_FLAGS)]
+    try:
+        parts = [part for part in path.split("/") if part not in ("", ".")]
+        while parts:
+            name = parts.pop(0)
+            if name == "..":
+                if len(stack) > 1:
+                    os.close(stack.pop())
+                continue
+            try:
+                if parts:
+                    fd = os.open(name, _DIR_FLAGS, dir_fd=stack[-1])
+                else:
+                    fd = os.open(name, flags | os.O_NOFOLLOW | os.O_CLOEXEC, mode, dir_fd=stack[-1])
+            except OSError as e:
+                # ENOTDIR and ELOOP are what O_NOFOLLOW gives for a symbolic link
+                if e.errno not in (errno.ELOOP, errno.ENOTDIR, errno.EMLINK):
+                    raise
+                try:
+                    target = os.readlink(name, dir_fd=stack[-1])
+                except OSError:
+                    raise e from None
+                symlinks += 1
+                if symlinks > MAX_SYMLINKS:
+                    raise OSError(errno.ELOOP, os.strerror(errno.ELOOP), path) from None
+                if target.startswith("/"):
+                    while len(stack) > 1:
+                        os.close(stack.pop())
+                parts[:0] = [part for part in target.split("/") if part not in ("", ".")]
+                continue
+            if parts:
+                stack.append(fd)
+            else:
+                return fd
+        raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), path)
+    finally:
+        for fd in stack:
+            os.close(fd)
+
+
+def _copy_file_range(in_fd, out_fd, offset, count):
+    return os.copy_file_range(in_fd, out_fd, count, offset)
+
+
+def _sendfile(in_fd, out_fd, offset, count):
+    return os.sendfile(out_fd, in_fd, offset, count)
+
+
+def _copy_fd(in_fd, out_fd):
+    """Copy the content of in_fd to out_fd inside the kernel when possible."""
+    size = os.fstat(in_fd).st_size
+    offset = 0
+    methods = [(_copy_file_range, "copy_file_range"), (_sendfile, "sendfile")]
+    for copy in [copy for copy, name in methods if hasattr(os, name)]:
+        try:
+            while True:
+                copied = copy(in_fd, out_fd, offset, max(size - offset, BUFSIZE))
+                if not copied:
+                    return
+                offset += copied
+        except OSError as e:
+            # Not supported for these files, try the next method from where this one stopped
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF):
+                raise
+    while True:
+        chunk = os.pread(in_fd, BUFSIZE, offset)
+        if not chunk:
+            return
+        os.write(out_fd, chunk)
+        offset += len(chunk)
+
 
 class Connection(ConnectionBase):
     """Local chroot based connections"""
@@ -177,12 +285,45 @@ class Connection(ConnectionBase):
             remote_path = os.path.join(os.path.sep, remote_path)
         return os.path.normpath(remote_path)
 
+    def _copy_in_root(self, in_path, out_path, put):
+        """Copy a file from or to the chroot directory from the controller; return whether it succeeded."""
+        try:
+            if put:
+                in_fd = os.open(to_bytes(in_path, errors="surrogate_or_strict"), os.O_RDONLY | os.O_CLOEXEC)
+            else:
+                in_fd = _open_in_root(self.chroot, in_path, os.O_RDONLY)
+            try:
+                if not stat.S_ISREG(os.fstat(in_fd).st_mode):
+                    return False
+                if put:
+                    out_fd = _open_in_root(self.chroot, out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+                else:
+                    out_fd = os.open(
+                        to_bytes(out_path, errors="surrogate_or_strict"),
+                        os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC,
+                        0o666,
+                    )
+                try:
+                    _copy_fd(in_fd, out_fd)
+                finally:
+                    os.close(out_fd)
+            finally:
+                os.close(in_fd)
+        except OSError as e:
+            display.vvv(f"Direct copy of {in_path} to {out_path} failed, falling back to dd: {e}", host=self.chroot)
+            return False
+        return True
+
     def put_file(self, in_path, out_path):
         """transfer a file from local to chroot"""
         super().put_file(in_path, out_path)
         display.vvv(f"PUT {in_path} TO {out_path}", host=self.chroot)
 
-        out_path = shlex_quote(self._prefix_login_path(out_path))
+        out_path = self._prefix_login_path(out_path)
+        if self.get_option("transfer_method") == "copy" and self._copy_in_root(in_path, out_path, put=True):
+            return
+
+        out_path = shlex_quote(out_path)
         try:
             with open(to_bytes(in_path, errors="surrogate_or_strict"), "rb") as in_file:
                 if not os.fstat(in_file.fileno()).st_size:
@@ -208,7 +349,11 @@ class Connection(ConnectionBase):
         super().fetch_file(in_path, out_path)
         display.vvv(f"FETCH {in_path} TO {out_path}", host=self.chroot)
 
-        in_path = shlex_quote(self._prefix_login_path(in_path))
+        in_path = self._prefix_login_path(in_path)
+        if self.get_option("transfer_method") == "copy" and self._copy_in_root(in_path, out_path, put=False):
+            return
+
+        in_path = shlex_quote(in_path)
         try:
             p = self._buffered_exec_command(f"dd if={in_path} bs={BUFSIZE}")
         except OSError as e:
@@ -75,11 +75,23 @@ options:
     default: default
     vars:
       - name: ansible_incus_project
+  api_url:
+    description:
+      - URL of the unix socket of the local Incus server, for example V(unix:/var/lib/incus/unix.socket).
+      - When set, commands are run and files are transferred with the Incus REST API over this socket, instead of
+        starting the C(incus) CLI for every operation. O(remote) is ignored in that case.
+      - The input data of a command is stored in a temporary file in the instance, which requires C(/bin/sh) in the
+        instance. Windows instances are not supported in this mode.
+    type: string
+    vars:
+      - name: ansible_incus_api_url
+    version_added: 13.4.0
 """
 
 import os
 import re
 import shlex
+import stat
 from subprocess import PIPE, Popen
 
 from ansible.errors import AnsibleConnectionFailure, AnsibleError, AnsibleFileNotFound
@@ -87,6 +99,12 @@ from ansible.module_utils.common.process import get_bin_path
 from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.plugins.connection import ConnectionBase
 
+from ansible_collections.community.general.plugins.module_utils._lxd import (
+    LXDClient,
+    LXDClientException,
+    LXDInstance,
+)
+
 
 class Connection(ConnectionBase):
     """Incus based connections"""
@@ -102,6 +120,10 @@ class Connection(ConnectionBase):
         if not self._incus_cmd:
             raise AnsibleError("incus command not found in PATH")
 
+        # remote user name -> (uid, gid)
+        self._remote_ids = {}
+        self._api_instance = None
+
         if getattr(self._shell, "_IS_WINDOWS", False):
             # Initializing regular expression patterns to match on a PowerShell or cmd command line.
             self.powershell_regex_pattern = re.compile(
@@ -129,6 +151,37 @@ class Connection(ConnectionBase):
             )
             self._connected = True
 
+    def _api(self) -> LXDInstance:
+        """return the REST API client of the instance, creating it on first use"""
+        if getattr(self._shell, "_IS_WINDOWS", False):
+            raise AnsibleError("Windows instances are not supported with api_url, unset it to use the incus CLI")
+        key = (self.get_option("api_url"), self._instance(), self.get_option("project"))
+        if self._api_instance is None or self._api_instance[0] != key:
+            self._close_api()
+            try:
+                client = LXDClient(self.get_option("api_url"))
+            except LXDClientException as e:
+                raise AnsibleError(f"Invalid Incus API URL {self.get_option('api_url')}: {e.msg}") from e
+            instance = LXDInstance(client, self._instance(), self.get_option("project"), header_prefix="X-Incus")
+            self._api_instance = (key, instance)
+        return self._api_instance[1]
+
+    def _close_api(self):
+        if self._api_instance is not None:
+            self._api_instance[1].client.close()
+            self._api_instance = None
+
+    def _api_error(self, e: LXDClientException, action: str):
+        """translate an API error like the corresponding CLI error"""
+        where = f"{self._instance()} (project={self.get_option('project')})"
+        if e.msg.endswith("Instance is not running"):
+            return AnsibleConnectionFailure(f"instance not running: {where}")
+        if e.msg.endswith("Instance not found"):
+            return AnsibleConnectionFailure(f"instance not found: {where}")
+        if "User does not have permission " in e.msg or "User does not have entitlement " in e.msg:
+            return AnsibleConnectionFailure(f"instance access denied: {where}")
+        return AnsibleError(f"failed to {action} instance {self._instance()}: {e.msg}")
+
     def _build_command(self, cmd) -> list[str]:
         """build the command to execute on the incus host"""
 
@@ -147,6 +200,14 @@ class Connection(ConnectionBase):
             f"{self.get_option('remote')}:{self._instance()}",
             "--",
         ]
+        exec_cmd.extend(self._build_exec_args(cmd))
+
+        return exec_cmd
+
+    def _build_exec_args(self, cmd) -> list[str]:
+        """build the command line run in the instance"""
+
+        exec_cmd: list[str] = []
 
         if getattr(self._shell, "_IS_WINDOWS", False):
             if regex_match := self.powershell_regex_pattern.match(cmd):
@@ -219,6 +280,16 @@ class Connection(ConnectionBase):
 
         self._display.vvv(f"EXEC {cmd}", host=self._instance())
 
+        if self.get_option("api_url"):
+            exec_args = self._build_exec_args(cmd)
+            self._display.vvvvv(f"EXEC API {exec_args}", host=self._instance())
+            try:
+                return self._api().exec(
+                    exec_args, to_bytes(in_data, errors="surrogate_or_strict", nonstring="passthru")
+                )
+            except LXDClientException as e:
+                raise self._api_error(e, "execute command in") from e
+
         local_cmd = self._build_command(cmd)
         self._display.vvvvv(f"EXEC {local_cmd}", host=self._instance())
 
@@ -251,19 +322,17 @@ class Connection(ConnectionBase):
         return process.returncode, stdout, stderr
 
     def _get_remote_uid_gid(self) -> tuple[int, int]:
-        """Get the user and group ID of 'remote_user' from the instance."""
+        """Get the user and group ID of 'remote_user' from the instance, once per connection."""
 
-        rc, uid_out, err = self.exec_command("/bin/id -u")
-        if rc != 0:
-            raise AnsibleError(f"Failed to get remote uid for user {self.get_option('remote_user')}: {err}")
-        uid = uid_out.strip()
+        remote_user = self.get_option("remote_user")
+        if remote_user not in self._remote_ids:
+            rc, out, err = self.exec_command("/bin/id -u && /bin/id -g")
+            if rc != 0:
+                raise AnsibleError(f"Failed to get remote uid and gid for user {remote_user}: {err}")
+            uid, gid = out.split()
+            self._remote_ids[remote_user] = int(uid), int(gid)
 
-        rc, gid_out, err = self.exec_command("/bin/id -g")
-        if rc != 0:
-            raise AnsibleError(f"Failed to get remote gid for user {self.get_option('remote_user')}: {err}")
-        gid = gid_out.strip()
-
-        return int(uid), int(gid)
+        return self._remote_ids[remote_user]
 
     def put_file(self, in_path, out_path):
         """put a file from local to Incus"""
@@ -274,6 +343,18 @@ class Connection(ConnectionBase):
         if not os.path.isfile(to_bytes(in_path, errors="surrogate_or_strict")):
             raise AnsibleFileNotFound(f"input path is not a file: {in_path}")
 
+        if self.get_option("api_url"):
+            uid = gid = None
+            if self.get_option("remote_user") != "root":
+                uid, gid = self._get_remote_uid_gid()
+            with open(to_bytes(in_path, errors="surrogate_or_strict"), "rb") as in_file:
+                mode = stat.S_IMODE(os.fstat(in_file.fileno()).st_mode)
+                try:
+                    self._api().push(in_file, out_path, uid=uid, gid=gid, mode=mode)
+                except LXDClientException as e:
+                    raise self._api_error(e, "transfer file to") from e
+            return
+
         if not getattr(self._shell, "_IS_WINDOWS", False) and self.get_option("remote_user") != "root":
             uid, gid = self._get_remote_uid_gid()
             local_cmd = [
@@ -318,6 +399,14 @@ class Connection(ConnectionBase):
 
         self._display.vvv(f"FETCH {in_path} TO {out_path}", host=self._instance())
 
+        if self.get_option("api_url"):
+            with open(to_bytes(out_path, errors="surrogate_or_strict"), "wb") as out_file:
+                try:
+                    self._api().pull(in_path, out_file)
+                except LXDClientException as e:
+                    raise self._api_error(e, "transfer file from") from e
+            return
+
         local_cmd = [
             self._incus_cmd,
             "--project",
@@ -338,7 +427,8 @@ class Connection(ConnectionBase):
             raise AnsibleError(f"failed to transfer file from instance {self._instance()}: {to_text(stderr).strip()}")
 
     def close(self):
-        """close the connection (nothing to do here)"""
+        """close the connection"""
         super().close()
+        self._close_api()
 
         self._connected = False
@@ -71,9 +71,22 @@ options:
     vars:
       - name: ansible_lxd_project
     version_added: 2.0.0
+  api_url:
+    description:
+      - URL of the unix socket of the local LXD server, for example V(unix:/var/snap/lxd/common/lxd/unix.socket).
+      - When set, commands are run and files are transferred with the LXD REST API over this socket, instead of
+        starting the C(lxc) CLI for every operation. O(remote) is ignored in that case, and the C(lxc) CLI does not need
+        to be installed.
+      - The input data of a command is stored in a temporary file in the instance, which requires C(/bin/sh) in the
+        instance.
+    type: string
+    vars:
+      - name: ansible_lxd_api_url
+    version_added: 13.4.0
 """
 
 import os
+import stat
 from subprocess import PIPE, Popen
 
 from ansible.errors import AnsibleConnectionFailure, AnsibleError, AnsibleFileNotFound
@@ -81,6 +94,12 @@ from ansible.module_utils.common.process import get_bin_path
 from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.plugins.connection import ConnectionBase
 
+from ansible_collections.community.general.plugins.module_utils._lxd import (
+    LXDClient,
+    LXDClientException,
+    LXDInstance,
+)
+
 
 class Connection(ConnectionBase):
     """lxd based connections"""
@@ -91,10 +110,12 @@ class Connection(ConnectionBase):
     def __init__(self, play_context, new_stdin, *args, **kwargs):
         super().__init__(play_context, new_stdin, *args, **kwargs)
 
-        try:
-            self._lxc_cmd = get_bin_path("lxc")
-        except ValueError as e:
-            raise AnsibleError("lxc command not found in PATH") from e
+        # Resolved on connect, the CLI is not used with api_url
+        self._lxc_cmd = None
+
+        # remote user name -> (uid, gid)
+        self._remote_ids = {}
+        self._api_instance = None
 
     def _host(self):
         """translate remote_addr to lxd (short) hostname"""
@@ -104,10 +125,41 @@ class Connection(ConnectionBase):
         """connect to lxd (nothing to do here)"""
         super()._connect()
 
+        if self._lxc_cmd is None and not self.get_option("api_url"):
+            try:
+                self._lxc_cmd = get_bin_path("lxc")
+            except ValueError as e:
+                raise AnsibleError("lxc command not found in PATH") from e
+
         if not self._connected:
             self._display.vvv(f"ESTABLISH LXD CONNECTION FOR USER: {self.get_option('remote_user')}", host=self._host())
             self._connected = True
 
+    def _api(self) -> LXDInstance:
+        """return the REST API client of the instance, creating it on first use"""
+        key = (self.get_option("api_url"), self._host(), self.get_option("project"))
+        if self._api_instance is None or self._api_instance[0] != key:
+            self._close_api()
+            try:
+                client = LXDClient(self.get_option("api_url"))
+            except LXDClientException as e:
+                raise AnsibleError(f"Invalid LXD API URL {self.get_option('api_url')}: {e.msg}") from e
+            self._api_instance = (key, LXDInstance(client, self._host(), self.get_option("project")))
+        return self._api_instance[1]
+
+    def _close_api(self):
+        if self._api_instance is not None:
+            self._api_instance[1].client.close()
+            self._api_instance = None
+
+    def _api_error(self, e: LXDClientException, action: str):
+        """translate an API error like the corresponding CLI error"""
+        if "is not running" in e.msg:
+            return AnsibleConnectionFailure(f"instance not running: {self._host()}")
+        if e.msg in ("Instance not found", "not found"):
+            return AnsibleConnectionFailure(f"instance not found: {self._host()}")
+        return AnsibleError(f"failed to {action} instance {self._host()}: {e.msg}")
+
     def _build_command(self, cmd) -> list[str]:
         """build the command to execute on the lxd host"""
 
@@ -117,6 +169,14 @@ class Connection(ConnectionBase):
             exec_cmd.extend(["--project", self.get_option("project")])
 
         exec_cmd.extend(["exec", f"{self.get_option('remote')}:{self._host()}", "--"])
+        exec_cmd.extend(self._build_exec_args(cmd))
+
+        return exec_cmd
+
+    def _build_exec_args(self, cmd) -> list[str]:
+        """build the command line run in the instance"""
+
+        exec_cmd: list[str] = []
 
         if self.get_option("remote_user") != "root":
             self._display.vvv(
@@ -136,6 +196,17 @@ class Connection(ConnectionBase):
 
         self._display.vvv(f"EXEC {cmd}", host=self._host())
 
+        if self.get_option("api_url"):
+            exec_args = self._build_exec_args(cmd)
+            self._display.vvvvv(f"EXEC API {exec_args}", host=self._host())
+            try:
+                rc, stdout, stderr = self._api().exec(
+                    exec_args, to_bytes(in_data, errors="surrogate_or_strict", nonstring="passthru")
+                )
+            except LXDClientException as e:
+                raise self._api_error(e, "execute command in") from e
+            return rc, to_text(stdout), to_text(stderr)
+
         local_cmd = self._build_command(cmd)
         self._display.vvvvv(f"EXEC {local_cmd}", host=self._host())
 
@@ -159,19 +230,17 @@ class Connection(ConnectionBase):
         return process.returncode, stdout, stderr
 
     def _get_remote_uid_gid(self) -> tuple[int, int]:
-        """Get the user and group ID of 'remote_user' from the instance."""
+        """Get the user and group ID of 'remote_user' from the instance, once per connection."""
 
-        rc, uid_out, err = self.exec_command("/bin/id -u")
-        if rc != 0:
-            raise AnsibleError(f"Failed to get remote uid for user {self.get_option('remote_user')}: {err}")
-        uid = uid_out.strip()
+        remote_user = self.get_option("remote_user")
+        if remote_user not in self._remote_ids:
+            rc, out, err = self.exec_command("/bin/id -u && /bin/id -g")
+            if rc != 0:
+                raise AnsibleError(f"Failed to get remote uid and gid for user {remote_user}: {err}")
+            uid, gid = out.split()
+            self._remote_ids[remote_user] = int(uid), int(gid)
 
-        rc, gid_out, err = self.exec_command("/bin/id -g")
-        if rc != 0:
-            raise AnsibleError(f"Failed to get remote gid for user {self.get_option('remote_user')}: {err}")
-        gid = gid_out.strip()
-
-        return int(uid), int(gid)
+        return self._remote_ids[remote_user]
 
     def put_file(self, in_path, out_path):
         """put a file from local to lxd"""
@@ -182,6 +251,18 @@ class Connection(ConnectionBase):
         if not os.path.isfile(to_bytes(in_path, errors="surrogate_or_strict")):
             raise AnsibleFileNotFound(f"input path is not a file: {in_path}")
 
+        if self.get_option("api_url"):
+            uid = gid = None
+            if self.get_option("remote_user") != "root":
+                uid, gid = self._get_remote_uid_gid()
+            with open(to_bytes(in_path, errors="surrogate_or_strict"), "rb") as in_file:
+                mode = stat.S_IMODE(os.fstat(in_file.fileno()).st_mode)
+                try:
+                    self._api().push(in_file, out_path, uid=uid, gid=gid, mode=mode)
+                except LXDClientException as e:
+                    raise self._api_error(e, "transfer file to") from e
+            return
+
         local_cmd = [self._lxc_cmd]
         if self.get_option("project"):
             local_cmd.extend(["--project", self.get_option("project")])
@@ -226,6 +307,14 @@ class Connection(ConnectionBase):
 
         self._display.vvv(f"FETCH {in_path} TO {out_path}", host=self._host())
 
+        if self.get_option("api_url"):
+            with open(to_bytes(out_path, errors="surrogate_or_strict"), "wb") as out_file:
+                try:
+                    self._api().pull(in_path, out_file)
+                except LXDClientException as e:
+                    raise self._api_error(e, "transfer file from") from e
+            return
+
         local_cmd = [self._lxc_cmd]
         if self.get_option("project"):
             local_cmd.extend(["--project", self.get_option("project")])
@@ -240,7 +329,8 @@ class Connection(ConnectionBase):
             raise AnsibleError(f"failed to transfer file from instance {self._host()}: {to_text(stderr).strip()}")
 
     def close(self):
-        """close the connection (nothing to do here)"""
+        """close the connection"""
         super().close()
+        self._close_api()
 
         self._connected = False
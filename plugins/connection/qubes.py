@@ -35,18 +35,108 @@ options:
       - name: ansible_user
 #        keyword:
 #            - name: hosts
+  persistent_shell:
+    description:
+      - Run the commands of a host through a single C(qubes.VMShell) session, instead of starting C(qvm-run) for every
+        command.
+      - The output of each command is delimited by random marker lines. The input data of a command is sent base64
+        encoded, so C(base64) must be available in the VM.
+      - If the session ends unexpectedly, the command fails and a new session is started for the next command.
+    type: bool
+    default: false
+    vars:
+      - name: ansible_qubes_persistent_shell
+    version_added: 13.4.0
 """
 
+import base64
+import os
+import selectors
+import shutil
 import subprocess
+import uuid
+from shlex import quote as shlex_quote
 
 from ansible.errors import AnsibleConnectionFailure
 from ansible.module_utils.common.text.converters import to_bytes
-from ansible.plugins.connection import ConnectionBase, ensure_connect
+from ansible.plugins.connection import BUFSIZE, ConnectionBase, ensure_connect
 from ansible.utils.display import Display
 
 display = Display()
 
 
+class VMShell:
+    """A qubes.VMShell session running several commands one after the other.
+
+    Every command is followed by a marker line on stdout carrying its return
+    code, and by the same marker on stderr, so that the output of each command
+    can be told apart without closing the session.
+    """
+
+    def __init__(self, local_cmd):
+        self._process = subprocess.Popen(
+            local_cmd, shell=False, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def alive(self):
+        return self._process.poll() is None
+
+    def run(self, cmd, in_data=None):
+        marker = f"__ANSIBLE_QUBES_{uuid.uuid4().hex}__"
+        command = f"/bin/sh -c {shlex_quote(cmd)}"
+        if in_data:
+            script = f"base64 -d <<'{marker}' | {command}\n{base64.encodebytes(to_bytes(in_data)).decode()}{marker}\n"
+        else:
+            script = f"{command} </dev/null\n"
+        script += f"printf '\\n%s %d\\n' {marker} $?\nprintf '\\n%s\\n' {marker} >&2\n"
+        try:
+            self._process.stdin.write(to_bytes(script, errors="surrogate_or_strict"))
+            self._process.stdin.flush()
+        except OSError as e:
+            raise AnsibleConnectionFailure(f"The qubes.VMShell session ended: {e}") from e
+
+        stdout, stderr = self._read_until(to_bytes(f"\n{marker}"))
+        stdout, dummy, rc = stdout.rpartition(to_bytes(f"\n{marker} "))
+        return int(rc.strip()), stdout, stderr.rpartition(to_bytes(f"\n{marker}"))[0]
+
+    def _read_until(self, marker):
+        """Read stdout and stderr until both contain the marker line."""
+        buffers = {self._process.stdout.fileno(): bytearray(), self._process.stderr.fileno(): bytearray()}
+        found = {}
+        with selectors.DefaultSelector() as selector:
+            for fd in buffers:
+                selector.register(fd, selectors.EVENT_READ)
+            while selector.get_map():
+                for key, dummy in selector.select():
+                    buffer = buffers[key.fd]
+                    chunk = os.read(key.fd, BUFSIZE)
+                    if not chunk:
+                        stderr = bytes(buffers[self._process.stderr.fileno()])
+                        self.close()
+                        raise AnsibleConnectionFailure(f"The qubes.VMShell session ended unexpectedly: {stderr!r}")
+                    start = max(0, len(buffer) - len(marker))
+                    buffer += chunk
+                    if key.fd not in found:
+                        position = buffer.find(marker, start)
+                        if position != -1:
+                            found[key.fd] = position + len(marker)
+                    # the marker line is complete once a newline follows it
+                    if key.fd in found and buffer.find(b"\n", found[key.fd]) != -1:
+                        selector.unregister(key.fd)
+        return bytes(buffers[self._process.stdout.fileno()]), bytes(buffers[self._process.stderr.fileno()])
+
+    def close(self):
+        if self.alive():
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._process.kill()
+                self._process.wait()
+        self._process.stdout.close()
+        self._process.stderr.close()
+
+
 # this _has to be_ named Connection
 class Connection(ConnectionBase):
     """This is a connection plugin for qubes: it uses qubes-run-vm binary to interact with the containers."""
@@ -60,21 +150,13 @@ class Connection(ConnectionBase):
 
         self._remote_vmname = self._play_context.remote_addr
         self._connected = False
+        self._shell = None
         # Default username in Qubes
         self.user = "user"
         if self._play_context.remote_user:
             self.user = self._play_context.remote_user
 
-    def _qubes(self, cmd=None, in_data=None, shell="qubes.VMShell"):
-        """run qvm-run executable
-
-        :param cmd: cmd string for remote system
-        :param in_data: data passed to qvm-run-vm's stdin
-        :return: return code, stdout, stderr
-        """
-        display.vvvv("CMD: ", cmd)
-        if not cmd.endswith("\n"):
-            cmd = f"{cmd}\n"
+    def _local_cmd(self, shell):
         local_cmd = []
 
         # For dom0
@@ -90,6 +172,20 @@ class Connection(ConnectionBase):
         local_cmd = [to_bytes(i, errors="surrogate_or_strict") for i in local_cmd]
 
         display.vvvv("Local cmd: ", local_cmd)
+        return local_cmd
+
+    def _qubes(self, cmd=None, in_data=None, shell="qubes.VMShell", in_file=None):
+        """run qvm-run executable
+
+        :param cmd: cmd string for remote system
+        :param in_data: data passed to qvm-run-vm's stdin
+        :param in_file: file object streamed to qvm-run-vm's stdin after the command
+        :return: return code, stdout, stderr
+        """
+        display.vvvv("CMD: ", cmd)
+        if not cmd.endswith("\n"):
+            cmd = f"{cmd}\n"
+        local_cmd = self._local_cmd(shell)
 
         display.vvv(f"RUN {local_cmd}", host=self._remote_vmname)
         p = subprocess.Popen(
@@ -98,9 +194,22 @@ class Connection(ConnectionBase):
 
         # Here we are writing the actual command to the remote bash
         p.stdin.write(to_bytes(cmd, errors="surrogate_or_strict"))
+        if in_file is not None:
+            try:
+                shutil.copyfileobj(in_file, p.stdin, BUFSIZE)
+            except BrokenPipeError:
+                # the remote command stopped reading, its return code tells why
+                pass
         stdout, stderr = p.communicate(input=in_data)
         return p.returncode, stdout, stderr
 
+    def _shell_session(self):
+        if self._shell is None or not self._shell.alive():
+            local_cmd = self._local_cmd("qubes.VMShell")
+            display.vvv(f"OPEN SHELL {local_cmd}", host=self._remote_vmname)
+            self._shell = VMShell(local_cmd)
+        return self._shell
+
     def _connect(self):
         """No persistent connection is being maintained."""
         super()._connect()
@@ -113,7 +222,10 @@ class Connection(ConnectionBase):
 
         display.vvvv(f"CMD IS: {cmd}")
 
-        rc, stdout, stderr = self._qubes(cmd)
+        if self.get_option("persistent_shell"):
+            rc, stdout, stderr = self._shell_session().run(cmd, in_data)
+        else:
+            rc, stdout, stderr = self._qubes(cmd, in_data)
 
         display.vvvvv(f"STDOUT {stdout!r} STDERR {stderr!r}")
         return rc, stdout, stderr
@@ -124,13 +236,12 @@ class Connection(ConnectionBase):
         display.vvv(f"PUT {in_path} TO {out_path}", host=self._remote_vmname)
 
         with open(in_path, "rb") as fobj:
-            source_data = fobj.read()
-
-        retcode, dummy, dummy = self._qubes(f'cat > "{out_path}"\n', source_data, "qubes.VMRootShell")
-        # if qubes.VMRootShell service not supported, fallback to qubes.VMShell and
-        # hope it will have appropriate permissions
-        if retcode == 127:
-            retcode, dummy, dummy = self._qubes(f'cat > "{out_path}"\n', source_data)
+            retcode, dummy, dummy = self._qubes(f'cat > "{out_path}"\n', shell="qubes.VMRootShell", in_file=fobj)
+            # if qubes.VMRootShell service not supported, fallback to qubes.VMShell and
+            # hope it will have appropriate permissions
+            if retcode == 127:
+                fobj.seek(0)
+                retcode, dummy, dummy = self._qubes(f'cat > "{out_path}"\n', in_file=fobj)
 
         if retcode != 0:
             raise AnsibleConnectionFailure(f"Failed to put_file to {out_path}")
@@ -151,4 +262,7 @@ class Connection(ConnectionBase):
     def close(self):
         """Closing the connection"""
         super().close()
+        if self._shell is not None:
+            self._shell.close()
+            self._shell = None
         self._connected = False
@@ -81,6 +81,21 @@ options:
     type: str
     default: Ansible
     version_added: 5.4.0
+
+  token_cache_dir:
+    description:
+      - Directory in which the access tokens obtained with the credentials are cached, on the host that runs the module.
+      - One cache file is kept for each combination of O(auth_keycloak_url), O(auth_realm), O(auth_client_id), O(auth_username),
+        and the credentials O(auth_password) and O(auth_client_secret). The credentials are only part of a salted hash, so tasks
+        with other or changed credentials never reuse a cached token.
+      - The cached access token is reused until it is about to expire, and then renewed with its refresh token. The
+        credentials are only used again when the refresh token has expired too.
+      - The cache file is locked while a token is requested, so parallel tasks wait for the first one to authenticate.
+      - The directory is created with mode C(0700) if it does not exist. The cache files contain the tokens and must
+        not be readable by other users.
+      - The cache is not used when O(token) is provided.
+    type: path
+    version_added: 13.4.0
 """
 
     ACTIONGROUP_KEYCLOAK = r"""
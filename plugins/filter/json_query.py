@@ -105,6 +105,8 @@ _value:
   type: any
 """
 
+from functools import lru_cache
+
 from ansible.errors import AnsibleError, AnsibleFilterError
 
 try:
@@ -115,6 +117,31 @@ except ImportError:
     HAS_LIB = False
 
 
+def _extend_reverse_types_map():
+    # Hack to handle Ansible Unsafe text, AnsibleMapping and AnsibleSequence
+    # See issues https://github.com/ansible-collections/community.general/issues/320
+    # and https://github.com/ansible/ansible/issues/85600.
+    extra_types = {
+        "string": ("AnsibleUnicode", "AnsibleUnsafeText", "_AnsibleTaggedStr"),
+        "array": ("AnsibleSequence", "_AnsibleLazyTemplateList"),
+        "object": ("AnsibleMapping", "_AnsibleLazyTemplateDict"),
+    }
+    reverse_types_map = jmespath.functions.REVERSE_TYPES_MAP
+    for jmespath_type, type_names in extra_types.items():
+        reverse_types_map[jmespath_type] = reverse_types_map[jmespath_type] + tuple(
+            type_name for type_name in type_names if type_name not in reverse_types_map[jmespath_type]
+        )
+
+
+if HAS_LIB:
+    _extend_reverse_types_map()
+
+
+@lru_cache(maxsize=256)
+def _compile(expr):
+    return jmespath.compile(expr)
+
+
 def json_query(data, expr):
     """Query data using jmespath query language ( http://jmespath.org ). Example:
     - ansible.builtin.debug: msg="{{ instance | json_query(tagged_instances[*].block_device_mapping.*.volume_id') }}"
@@ -122,24 +149,8 @@ def json_query(data, expr):
     if not HAS_LIB:
         raise AnsibleError('You need to install "jmespath" prior to running json_query filter')
 
-    # Hack to handle Ansible Unsafe text, AnsibleMapping and AnsibleSequence
-    # See issues https://github.com/ansible-collections/community.general/issues/320
-    # and https://github.com/ansible/ansible/issues/85600.
-    jmespath.functions.REVERSE_TYPES_MAP["string"] = jmespath.functions.REVERSE_TYPES_MAP["string"] + (
-        "AnsibleUnicode",
-        "AnsibleUnsafeText",
-        "_AnsibleTaggedStr",
-    )
-    jmespath.functions.REVERSE_TYPES_MAP["array"] = jmespath.functions.REVERSE_TYPES_MAP["array"] + (
-        "AnsibleSequence",
-        "_AnsibleLazyTemplateList",
-    )
-    jmespath.functions.REVERSE_TYPES_MAP["object"] = jmespath.functions.REVERSE_TYPES_MAP["object"] + (
-        "AnsibleMapping",
-        "_AnsibleLazyTemplateDict",
-    )
     try:
-        return jmespath.search(expr, data)
+        return _compile(expr).search(data)
     except jmespath.exceptions.JMESPathError as e:
         raise AnsibleFilterError(f"JMESPathError in json_query filter plugin:\n{e}") from e
     except Exception as e:
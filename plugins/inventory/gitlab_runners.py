@@ -14,6 +14,7 @@ requirements:
   - python-gitlab > 1.8.0
 extends_documentation_fragment:
   - ansible.builtin.constructed
+  - ansible.builtin.inventory_cache
 description:
   - Reads inventories from the GitLab API.
   - Uses a YAML configuration file gitlab_runners.[yml|yaml].
@@ -49,9 +50,19 @@ options:
     type: str
     choices: ['active', 'paused', 'online', 'specific', 'shared']
   verbose_output:
-    description: Toggle to (not) include all available nodes metadata.
+    description:
+      - Toggle to (not) include all available nodes metadata.
+      - If V(false), and the O(compose), O(groups), and O(keyed_groups) templates only use the attributes returned when
+        listing runners (for example C(id), C(description), C(ip_address), C(active), C(paused), C(is_shared), C(runner_type),
+        C(online), and C(status)), the details of each runner are not fetched.
     type: bool
     default: true
+  max_concurrent_requests:
+    description:
+      - The maximum number of runner details to fetch from the GitLab API at the same time.
+    type: int
+    default: 1
+    version_added: 13.4.0
 """
 
 EXAMPLES = r"""
@@ -77,10 +88,24 @@ keyed_groups:
   # hint: labels containing special characters will be converted to safe names
   - key: 'tag_list'
     prefix: tag
+
+---
+# Example caching the runners, and fetching their details four at a time
+plugin: community.general.gitlab_runners
+host: https://gitlab.com
+max_concurrent_requests: 4
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/gitlab_runners_cache
+cache_timeout: 3600
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 from ansible.errors import AnsibleError, AnsibleParserError
-from ansible.plugins.inventory import BaseInventoryPlugin, Constructable
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+from jinja2 import Environment, meta
+from jinja2.exceptions import TemplateError
 
 from ansible_collections.community.general.plugins.plugin_utils._unsafe import make_unsafe
 
@@ -92,40 +117,70 @@ except ImportError:
     HAS_GITLAB = False
 
 
-class InventoryModule(BaseInventoryPlugin, Constructable):
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     """Host inventory parser for ansible using GitLab API as source."""
 
     NAME = "community.general.gitlab_runners"
 
-    def _populate(self):
-        with gitlab.Gitlab(self.get_option("server_url"), private_token=self.get_option("api_token")) as gl:
+    def _needs_runner_details(self, runners):
+        """Whether attributes that are only returned by the runner details are used."""
+        if self.get_option("verbose_output"):
+            return True
+        expressions = list((self.get_option("compose") or {}).values())
+        expressions += list((self.get_option("groups") or {}).values())
+        expressions += [keyed_group.get("key") for keyed_group in self.get_option("keyed_groups") or []]
+        if not expressions or not runners:
+            return False
+
+        available = set().union(*(runner.keys() for runner in runners))
+        environment = Environment()
+        for expression in expressions:
+            if not isinstance(expression, str):
+                return True
             try:
-                if self.get_option("filter"):
-                    runners = gl.runners.all(scope=self.get_option("filter"))
-                else:
-                    runners = gl.runners.all()
-                self.inventory.add_group("gitlab_runners")
-                for runner in runners:
-                    host = make_unsafe(str(runner["id"]))
-                    ip_address = runner["ip_address"]
-                    host_attrs = make_unsafe(vars(gl.runners.get(runner["id"]))["_attrs"])
-                    self.inventory.add_host(host, group="gitlab_runners")
-                    self.inventory.set_variable(host, "ansible_host", make_unsafe(ip_address))
-                    if self.get_option("verbose_output", True):
-                        self.inventory.set_variable(host, "gitlab_runner_attributes", host_attrs)
-
-                    # Use constructed if applicable
-                    strict = self.get_option("strict")
-                    # Composed variables
-                    self._set_composite_vars(self.get_option("compose"), host_attrs, host, strict=strict)
-                    # Complex groups based on jinja2 conditionals, hosts that meet the conditional are added to group
-                    self._add_host_to_composed_groups(self.get_option("groups"), host_attrs, host, strict=strict)
-                    # Create groups based on variable values and add the corresponding hosts to it
-                    self._add_host_to_keyed_groups(self.get_option("keyed_groups"), host_attrs, host, strict=strict)
-            except Exception as e:
-                raise AnsibleParserError(
-                    f"Unable to fetch hosts from GitLab API, this was the original exception: {e}"
-                ) from e
+                names = meta.find_undeclared_variables(environment.parse(f"{{{{ {expression} }}}}"))
+            except TemplateError:
+                return True
+            if not names <= available:
+                return True
+        return False
+
+    def _fetch_runners(self):
+        with gitlab.Gitlab(self.get_option("server_url"), private_token=self.get_option("api_token")) as gl:
+            if self.get_option("filter"):
+                runners = gl.runners.all(scope=self.get_option("filter"))
+            else:
+                runners = gl.runners.all()
+            runners = [runner.asdict() if hasattr(runner, "asdict") else dict(runner) for runner in runners]
+
+            if not self._needs_runner_details(runners):
+                return runners
+
+            def get_details(runner):
+                return vars(gl.runners.get(runner["id"]))["_attrs"]
+
+            with ThreadPoolExecutor(max_workers=max(1, self.get_option("max_concurrent_requests"))) as executor:
+                return list(executor.map(get_details, runners))
+
+    def _populate(self, runners):
+        self.inventory.add_group("gitlab_runners")
+        for runner in runners:
+            host = make_unsafe(str(runner["id"]))
+            ip_address = runner["ip_address"]
+            host_attrs = make_unsafe(runner)
+            self.inventory.add_host(host, group="gitlab_runners")
+            self.inventory.set_variable(host, "ansible_host", make_unsafe(ip_address))
+            if self.get_option("verbose_output", True):
+                self.inventory.set_variable(host, "gitlab_runner_attributes", host_attrs)
+
+            # Use constructed if applicable
+            strict = self.get_option("strict")
+            # Composed variables
+            self._set_composite_vars(self.get_option("compose"), host_attrs, host, strict=strict)
+            # Complex groups based on jinja2 conditionals, hosts that meet the conditional are added to group
+            self._add_host_to_composed_groups(self.get_option("groups"), host_attrs, host, strict=strict)
+            # Create groups based on variable values and add the corresponding hosts to it
+            self._add_host_to_keyed_groups(self.get_option("keyed_groups"), host_attrs, host, strict=strict)
 
     def verify_file(self, path):
         """Return the possibly of a file being consumable by this plugin."""
@@ -138,4 +193,29 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
             )
         super().parse(inventory, loader, path, cache)
         self._read_config_data(path)
-        self._populate()
+
+        cache_key = self.get_cache_key(path)
+        # cache may be True or False at this point to indicate if the inventory is being refreshed
+        # get the user's cache option too to see if we should save the cache if it is changing
+        user_cache_setting = self.get_option("cache")
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        runners = None
+        if attempt_to_read_cache:
+            try:
+                runners = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+
+        try:
+            if runners is None:
+                runners = self._fetch_runners()
+            self._populate(runners)
+        except Exception as e:
+            raise AnsibleParserError(
+                f"Unable to fetch hosts from GitLab API, this was the original exception: {e}"
+            ) from e
+
+        if cache_needs_update:
+            self._cache[cache_key] = runners
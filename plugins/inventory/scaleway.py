@@ -13,6 +13,8 @@ description:
   - Get inventory hosts from Scaleway.
 requirements:
   - PyYAML
+extends_documentation_fragment:
+  - ansible.builtin.inventory_cache
 options:
   plugin:
     description: Token that ensures this is a source file for the 'scaleway' plugin.
@@ -75,6 +77,13 @@ options:
     description: 'Set individual variables: keys are variable names and values are templates. Any value returned by the L(Scaleway
       API, https://developer.scaleway.com/#servers-server-get) can be used.'
     type: dict
+  per_page:
+    description:
+      - The number of servers to request per page from the Scaleway API.
+      - The zones in O(regions) are queried at the same time, the pages of a zone are requested one after the other.
+    type: int
+    default: 100
+    version_added: 13.4.0
 """
 
 EXAMPLES = r"""
@@ -115,10 +124,19 @@ variables:
   ansible_host: public_ip.address
   ansible_connection: "'ssh'"
   ansible_user: "'admin'"
+
+---
+# Keep the servers lists in the inventory cache for an hour
+plugin: community.general.scaleway
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/scaleway_inventory_cache
+cache_timeout: 3600
 """
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 YAML_IMPORT_ERROR: ImportError | None
 try:
@@ -133,7 +151,7 @@ import urllib.parse as urllib_parse
 from ansible.errors import AnsibleError
 from ansible.module_utils.common.text.converters import to_text
 from ansible.module_utils.urls import open_url
-from ansible.plugins.inventory import BaseInventoryPlugin, Constructable
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
 
 from ansible_collections.community.general.plugins.module_utils._scaleway import (
     SCALEWAY_LOCATION,
@@ -169,7 +187,9 @@ def _fetch_information(token, url):
         paginated_url = urllib_parse.urljoin(paginated_url, relations["next"])
 
 
-def _build_server_url(api_endpoint):
+def _build_server_url(api_endpoint, per_page=None):
+    if per_page:
+        return f"{api_endpoint}/servers?{urllib_parse.urlencode({'per_page': per_page})}"
     return f"{api_endpoint}/servers"
 
 
@@ -231,7 +251,7 @@ extractors = {
 }
 
 
-class InventoryModule(BaseInventoryPlugin, Constructable):
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     NAME = "community.general.scaleway"
 
     def _fill_host_variables(self, host, server_info):
@@ -285,12 +305,25 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
 
         return None
 
-    def do_zone_inventory(self, zone, token, tags, hostname_preferences):
+    def _fetch_zones(self, zones, token):
+        """Fetch the servers of all zones at the same time, keyed by zone."""
+        if not zones:
+            return {}
+        per_page = self.get_option("per_page")
+
+        def fetch(zone):
+            url = _build_server_url(SCALEWAY_LOCATION[zone]["api_endpoint"], per_page=per_page)
+            return _fetch_information(url=url, token=token)
+
+        with ThreadPoolExecutor(max_workers=len(zones)) as executor:
+            return dict(zip(zones, executor.map(fetch, zones)))
+
+    def do_zone_inventory(self, zone, token, tags, hostname_preferences, servers=None):
         self.inventory.add_group(zone)
-        zone_info = SCALEWAY_LOCATION[zone]
 
-        url = _build_server_url(zone_info["api_endpoint"])
-        raw_zone_hosts_infos = make_unsafe(_fetch_information(url=url, token=token))
+        if servers is None:
+            servers = self._fetch_zones([zone], token)[zone]
+        raw_zone_hosts_infos = make_unsafe(servers)
 
         for host_infos in raw_zone_hosts_infos:
             hostname = self._filter_host(host_infos=host_infos, hostname_preferences=hostname_preferences)
@@ -339,7 +372,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
     def parse(self, inventory, loader, path, cache=True):
         if YAML_IMPORT_ERROR:
             raise AnsibleError("PyYAML is probably missing") from YAML_IMPORT_ERROR
-        super().parse(inventory, loader, path)
+        super().parse(inventory, loader, path, cache)
         self._read_config_data(path=path)
 
         config_zones = self.get_option("regions")
@@ -350,8 +383,36 @@ class InventoryModule(BaseInventoryPlugin, Constructable):
                 "'oauth_token' value is null, you must configure it either in inventory, envvars or scaleway-cli config."
             )
         hostname_preference = self.get_option("hostnames")
-
-        for zone in self._get_zones(config_zones):
+        zones = sorted(self._get_zones(config_zones))
+
+        cache_key = self.get_cache_key(path)
+        # cache may be True or False at this point to indicate if the inventory is being refreshed
+        # get the user's cache option too to see if we should save the cache if it is changing
+        user_cache_setting = self.get_option("cache")
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        servers = {}
+        if attempt_to_read_cache:
+            try:
+                servers = dict(self._cache[cache_key])
+            except KeyError:
+                cache_needs_update = True
+
+        # Only the zones missing from the cache are queried
+        missing_zones = [zone for zone in zones if zone not in servers]
+        if missing_zones:
+            servers.update(self._fetch_zones(missing_zones, token))
+            cache_needs_update = user_cache_setting
+
+        for zone in zones:
             self.do_zone_inventory(
-                zone=make_unsafe(zone), token=token, tags=tags, hostname_preferences=hostname_preference
+                zone=make_unsafe(zone),
+                token=token,
+                tags=tags,
+                hostname_preferences=hostname_preference,
+                servers=servers[zone],
             )
+
+        if cache_needs_update:
+            self._cache[cache_key] = servers
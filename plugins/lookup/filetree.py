@@ -134,6 +134,7 @@ import os
 import pwd
 import re
 import stat
+from functools import cache
 
 HAVE_SELINUX = False
 try:
@@ -153,10 +154,31 @@ from ansible_collections.community.general.plugins.plugin_utils._lookup import c
 display = Display()
 
 
+@cache
+def selinux_enabled():
+    return HAVE_SELINUX and selinux.is_selinux_enabled() == 1
+
+
+@cache
+def owner_name(uid):
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return uid
+
+
+@cache
+def group_name(gid):
+    try:
+        return to_text(grp.getgrgid(gid).gr_name)
+    except KeyError:
+        return gid
+
+
 # If selinux fails to find a default, return an array of None
 def selinux_context(path):
     context = [None, None, None, None]
-    if HAVE_SELINUX and selinux.is_selinux_enabled():
+    if selinux_enabled():
         try:
             # note: the selinux module uses byte strings on python2 and text
             # strings on python3
@@ -196,20 +218,14 @@ def file_props(root, path):
 
     ret["uid"] = st.st_uid
     ret["gid"] = st.st_gid
-    try:
-        ret["owner"] = pwd.getpwuid(st.st_uid).pw_name
-    except KeyError:
-        ret["owner"] = st.st_uid
-    try:
-        ret["group"] = to_text(grp.getgrgid(st.st_gid).gr_name)
-    except KeyError:
-        ret["group"] = st.st_gid
+    ret["owner"] = owner_name(st.st_uid)
+    ret["group"] = group_name(st.st_gid)
     ret["mode"] = f"0{stat.S_IMODE(st.st_mode):03o}"
     ret["size"] = st.st_size
     ret["mtime"] = st.st_mtime
     ret["ctime"] = st.st_ctime
 
-    if HAVE_SELINUX and selinux.is_selinux_enabled() == 1:
+    if selinux_enabled():
         context = selinux_context(abspath)
         ret["seuser"] = context[0]
         ret["serole"] = context[1]
@@ -237,6 +253,7 @@ class LookupModule(LookupBase):
             exclude_pattern = None
 
         ret = []
+        seen = set()
         for term in terms:
             term_file = os.path.basename(term)
             dwimmed_path = self._loader.path_dwim_relative(basedir, "files", os.path.dirname(term))
@@ -252,9 +269,10 @@ class LookupModule(LookupBase):
                     relpath = os.path.relpath(os.path.join(root, entry), path)
 
                     # Skip if relpath was already processed (from another root)
-                    if relpath not in [entry["path"] for entry in ret]:
+                    if relpath not in seen:
                         props = file_props(path, relpath)
                         if props is not None:
+                            seen.add(relpath)
                             display.debug(f"  found '{os.path.join(path, relpath)}'")
                             ret.append(props)
 
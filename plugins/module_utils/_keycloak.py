@@ -8,7 +8,11 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
+import os
+import tempfile
+import time
 import traceback
 import typing as t
 from http import HTTPStatus
@@ -18,6 +22,8 @@ from urllib.parse import quote, urlencode
 from ansible.module_utils.common.text.converters import to_native, to_text
 from ansible.module_utils.urls import open_url
 
+from ansible_collections.community.general.plugins.module_utils._filelock import FileLock, LockTimeout
+
 if t.TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -59,6 +65,7 @@ URL_CLIENTTEMPLATES = "{url}/admin/realms/{realm}/client-templates"
 URL_GROUPS = "{url}/admin/realms/{realm}/groups"
 URL_GROUP = "{url}/admin/realms/{realm}/groups/{groupid}"
 URL_GROUP_CHILDREN = "{url}/admin/realms/{realm}/groups/{groupid}/children"
+URL_GROUP_BY_PATH = "{url}/admin/realms/{realm}/group-by-path/{path}"
 
 URL_CLIENTSCOPES = "{url}/admin/realms/{realm}/client-scopes"
 URL_CLIENTSCOPE = "{url}/admin/realms/{realm}/client-scopes/{id}"
@@ -157,6 +164,12 @@ URL_AUTHZ_RESOURCES = "{url}/admin/realms/{realm}/clients/{client_id}/authz/reso
 URL_AUTHZ_CUSTOM_POLICY = "{url}/admin/realms/{realm}/clients/{client_id}/authz/resource-server/policy/{policy_type}"
 URL_AUTHZ_CUSTOM_POLICIES = "{url}/admin/realms/{realm}/clients/{client_id}/authz/resource-server/policy"
 
+# Cached tokens are refreshed when they expire in less than this number of seconds
+TOKEN_CACHE_EXPIRY_MARGIN = 30
+
+# Number of representations requested at once by KeycloakAPI.iter_pages()
+DEFAULT_PAGE_SIZE = 100
+
 
 def keycloak_argument_spec() -> dict[str, t.Any]:
     """
@@ -176,6 +189,7 @@ def keycloak_argument_spec() -> dict[str, t.Any]:
         token=dict(type="str", no_log=True),
         refresh_token=dict(type="str", no_log=True),
         http_agent=dict(type="str", default="Ansible"),
+        token_cache_dir=dict(type="path"),
     )
 
 
@@ -207,6 +221,15 @@ def _token_request(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -
            'refresh_token' for type 'refresh_token'.
     :return: access token
     """
+    return _token_response(module_params, payload)["access_token"]
+
+
+def _token_response(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -> dict[str, t.Any]:
+    """Sends an authentication request, see _token_request
+    :param module_params: parameters of the module
+    :param payload: authentication request payload
+    :return: token endpoint response, including at least 'access_token'
+    """
     base_url = module_params["auth_keycloak_url"]
     if not base_url.lower().startswith(("http", "https")):
         raise KeycloakError(f"auth_url '{base_url}' should either start with 'http' or 'https'.")
@@ -228,7 +251,9 @@ def _token_request(module_params: dict[str, t.Any], payload: dict[str, t.Any]) -
             ).read()
         )
 
-        return r["access_token"]
+        if "access_token" not in r:
+            raise KeyError("access_token")
+        return r
     except ValueError as e:
         raise KeycloakError(f"API returned invalid JSON when trying to obtain access token from {auth_url}: {e}") from e
     except KeyError as e:
@@ -243,6 +268,10 @@ def _request_token_using_credentials(module_params: dict[str, t.Any]) -> str:
     :param module_params: parameters of the module. Must include 'auth_username' and 'auth_password'.
     :return: connection header
     """
+    return _token_request(module_params, _credentials_payload(module_params))
+
+
+def _credentials_payload(module_params: dict[str, t.Any]) -> dict[str, t.Any]:
     client_id = module_params.get("auth_client_id")
     auth_username = module_params.get("auth_username")
     auth_password = module_params.get("auth_password")
@@ -256,9 +285,7 @@ def _request_token_using_credentials(module_params: dict[str, t.Any]) -> str:
         "password": auth_password,
     }
     # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
-
-    return _token_request(module_params, payload)
+    return {k: v for k, v in temp_payload.items() if v is not None}
 
 
 def _request_token_using_refresh_token(module_params: dict[str, t.Any]) -> str:
@@ -267,8 +294,11 @@ def _request_token_using_refresh_token(module_params: dict[str, t.Any]) -> str:
     :param module_params: parameters of the module. Must include 'refresh_token'.
     :return: connection header
     """
+    return _token_request(module_params, _refresh_token_payload(module_params, module_params.get("refresh_token")))
+
+
+def _refresh_token_payload(module_params: dict[str, t.Any], refresh_token: str | None) -> dict[str, t.Any]:
     client_id = module_params.get("auth_client_id")
-    refresh_token = module_params.get("refresh_token")
     client_secret = module_params.get("auth_client_secret")
 
     temp_payload = {
@@ -278,9 +308,7 @@ def _request_token_using_refresh_token(module_params: dict[str, t.Any]) -> str:
         "refresh_token": refresh_token,
     }
     # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
-
-    return _token_request(module_params, payload)
+    return {k: v for k, v in temp_payload.items() if v is not None}
 
 
 def _request_token_using_client_credentials(module_params: dict[str, t.Any]) -> str:
@@ -292,6 +320,10 @@ def _request_token_using_client_credentials(module_params: dict[str, t.Any]) ->
     and 'auth_client_secret'..
     :return: connection header
     """
+    return _token_request(module_params, _client_credentials_payload(module_params))
+
+
+def _client_credentials_payload(module_params: dict[str, t.Any]) -> dict[str, t.Any]:
     client_id = module_params.get("auth_client_id")
     client_secret = module_params.get("auth_client_secret")
 
@@ -301,9 +333,142 @@ def _request_token_using_client_credentials(module_params: dict[str, t.Any]) ->
         "client_secret": client_secret,
     }
     # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
+    return {k: v for k, v in temp_payload.items() if v is not None}
+
+
+def _uses_client_credentials(module_params: dict[str, t.Any]) -> bool:
+    return (
+        module_params.get("auth_client_id") is not None
+        and module_params.get("auth_client_secret") is not None
+        and module_params.get("auth_username") is None
+    )
+
+
+def _token_cache_salt(cache_dir: str) -> bytes:
+    """Random salt of the token cache directory, created when it is first used"""
+    path = os.path.join(cache_dir, "keycloak-token-salt")
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        raise KeycloakError(f"Could not create the token cache salt {path}: {e}") from e
+    else:
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(32))
+    try:
+        with open(path, "rb") as f:
+            salt = f.read()
+    except OSError as e:
+        raise KeycloakError(f"Could not read the token cache salt {path}: {e}") from e
+    if not salt:
+        # Another task has just created the file and not written it yet
+        time.sleep(0.1)
+        return _token_cache_salt(cache_dir)
+    return salt
+
+
+def _token_cache_path(module_params: dict[str, t.Any]) -> str:
+    """Path of the token cache file for the URL, realm, client, user and credentials of the module parameters.
+    The credentials are hashed with the salt of the cache directory, so that tasks with other credentials
+    never share a cache file, and the file names cannot be used to guess the credentials.
+    """
+    cache_dir = module_params["token_cache_dir"]
+    secrets = json.dumps([module_params.get("auth_password"), module_params.get("auth_client_secret")])
+    key = json.dumps(
+        [
+            module_params.get("auth_keycloak_url"),
+            module_params.get("auth_realm"),
+            module_params.get("auth_client_id"),
+            module_params.get("auth_username"),
+            hashlib.sha256(_token_cache_salt(cache_dir) + secrets.encode("utf-8")).hexdigest(),
+        ]
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"keycloak-token-{digest}.json")
 
-    return _token_request(module_params, payload)
+
+def _read_token_cache(path: str) -> dict[str, t.Any] | None:
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or not entry.get("access_token"):
+        return None
+    return entry
+
+
+def _write_token_cache(path: str, response: dict[str, t.Any], now: float) -> None:
+    """Stores a token endpoint response with absolute expiry times. Errors are ignored, the cache is an optimization."""
+    refresh_expires_in = response.get("refresh_expires_in")
+    entry = {
+        "access_token": response["access_token"],
+        "expires_at": now + response.get("expires_in", 0),
+        "refresh_token": response.get("refresh_token"),
+        # Offline tokens do not expire, Keycloak returns 0 for them
+        "refresh_expires_at": now + refresh_expires_in if refresh_expires_in else None,
+    }
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".keycloak-token-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def _cached_token(module_params: dict[str, t.Any], rejected_token: str | None = None) -> str:
+    """Obtains an access token through the token cache in the token_cache_dir directory.
+    The cached access token is reused until it is about to expire, then it is refreshed
+    with its refresh_token, and only if that fails a new token is requested using the
+    credentials. The cache file is locked while it is updated, so that parallel tasks
+    do not all authenticate at the same time.
+    :param module_params: parameters of the module. Must include 'token_cache_dir'.
+    :param rejected_token: access token that was refused by Keycloak and must not be reused
+    :return: access token
+    """
+    cache_dir = module_params["token_cache_dir"]
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    except OSError as e:
+        raise KeycloakError(f"Could not create the token cache directory {cache_dir}: {e}") from e
+    path = _token_cache_path(module_params)
+
+    # The lock holder does at most two token requests
+    lock_timeout = 2 * (module_params.get("connection_timeout") or 10) + TOKEN_CACHE_EXPIRY_MARGIN
+    try:
+        with FileLock().lock_file(path, cache_dir, lock_timeout=lock_timeout):
+            now = time.time()
+            entry = _read_token_cache(path)
+            if entry is not None and entry["access_token"] != rejected_token:
+                if entry.get("expires_at", 0) - TOKEN_CACHE_EXPIRY_MARGIN > now:
+                    return entry["access_token"]
+            if entry is not None and entry.get("refresh_token"):
+                refresh_expires_at = entry.get("refresh_expires_at")
+                if refresh_expires_at is None or refresh_expires_at - TOKEN_CACHE_EXPIRY_MARGIN > now:
+                    try:
+                        response = _token_response(
+                            module_params, _refresh_token_payload(module_params, entry["refresh_token"])
+                        )
+                    except KeycloakError:
+                        # The session has ended, authenticate again
+                        pass
+                    else:
+                        _write_token_cache(path, response, now)
+                        return response["access_token"]
+
+            if _uses_client_credentials(module_params):
+                payload = _client_credentials_payload(module_params)
+            else:
+                payload = _credentials_payload(module_params)
+            response = _token_response(module_params, payload)
+            _write_token_cache(path, response, now)
+            return response["access_token"]
+    except LockTimeout:
+        if _uses_client_credentials(module_params):
+            return _request_token_using_client_credentials(module_params)
+        return _request_token_using_credentials(module_params)
 
 
 def get_token(module_params: dict[str, t.Any]) -> dict[str, str]:
@@ -315,10 +480,9 @@ def get_token(module_params: dict[str, t.Any]) -> dict[str, str]:
     token = module_params.get("token")
 
     if token is None:
-        auth_client_id = module_params.get("auth_client_id")
-        auth_client_secret = module_params.get("auth_client_secret")
-        auth_username = module_params.get("auth_username")
-        if auth_client_id is not None and auth_client_secret is not None and auth_username is None:
+        if module_params.get("token_cache_dir"):
+            token = _cached_token(module_params)
+        elif _uses_client_credentials(module_params):
             token = _request_token_using_client_credentials(module_params)
         else:
             token = _request_token_using_credentials(module_params)
@@ -388,6 +552,64 @@ def is_struct_included(
         return to_text(struct1, "utf-8") == to_text(struct2, "utf-8")
 
 
+def resolve_roles(roles: list[dict[str, t.Any]], *known_roles: list[dict[str, t.Any]] | None) -> list[dict[str, t.Any]]:
+    """Completes the missing 'id' or 'name' of the requested roles from role representations that
+    have already been fetched, for instance the available and the effective role mappings of a principal,
+    which together contain all the roles of a client or realm.
+
+    :param roles: requested roles, dicts with 'id' and/or 'name'; they are updated in place
+    :param known_roles: lists of role representations
+    :return: the requested roles that could not be found
+    """
+    by_id = {}
+    by_name = {}
+    for role_list in known_roles:
+        for role in role_list or []:
+            by_id[role["id"]] = role
+            by_name[role["name"]] = role
+
+    missing = []
+    for role in roles:
+        if role.get("id") is not None:
+            known = by_id.get(role["id"])
+        else:
+            known = by_name.get(role.get("name"))
+        if known is None:
+            missing.append(role)
+            continue
+        role["id"] = known["id"]
+        role["name"] = known["name"]
+    return missing
+
+
+def plan_rolemapping(
+    roles: list[dict[str, t.Any]],
+    state: str,
+    available_roles: list[dict[str, t.Any]] | None,
+    assigned_roles: list[dict[str, t.Any]] | None,
+) -> list[dict[str, str]]:
+    """Computes the role mappings to add or remove in a single request.
+
+    :param roles: requested roles, with 'id' and 'name' resolved
+    :param state: 'present' to add the roles that are available, 'absent' to remove the roles that are assigned
+    :param available_roles: role representations that can still be mapped to the principal
+    :param assigned_roles: effective role representations of the principal
+    :return: list of dicts with 'id' and 'name' of the roles to add or remove, without duplicates
+    """
+    if state == "present":
+        candidates = {role["name"] for role in available_roles or []}
+    else:
+        candidates = {role["name"] for role in assigned_roles or []}
+
+    changes = []
+    seen = set()
+    for role in roles:
+        if role["name"] in candidates and role["name"] not in seen:
+            seen.add(role["name"])
+            changes.append({"id": role["id"], "name": role["name"]})
+    return changes
+
+
 class KeycloakAPI:
     """Keycloak API access; Keycloak uses OAuth 2.0 to protect its API, an access token for which
     is obtained through OpenID connect
@@ -441,6 +663,22 @@ class KeycloakAPI:
 
         r = make_request_catching_401(headers)
 
+        if (
+            isinstance(r, Exception)
+            and self.module.params.get("token_cache_dir")
+            and self.module.params.get("token") is None
+        ):
+            # The cached token may have been revoked, get another one through the cache
+            rejected_token = self.restheaders["Authorization"][len("Bearer ") :]
+            try:
+                token = _cached_token(self.module.params, rejected_token=rejected_token)
+            except KeycloakError:
+                pass
+            else:
+                if token != rejected_token:
+                    self.restheaders["Authorization"] = f"Bearer {token}"
+                    r = make_request_catching_401(headers)
+
         if isinstance(r, Exception):
             # Try to refresh token and retry, if available
             refresh_token = self.module.params.get("refresh_token")
@@ -496,6 +734,33 @@ class KeycloakAPI:
         """
         return json.loads(self._request(url, method, data).read())
 
+    def iter_pages(
+        self, url: str, query: dict[str, t.Any] | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> t.Iterator[list[dict[str, t.Any]]]:
+        """Iterates over the pages of a collection endpoint supporting the 'first' and 'max' query parameters.
+        A page is only requested once the previous one has been consumed.
+
+        :param url: collection URL, without query string
+        :param query: (optional) additional query parameters, for instance 'search' or 'briefRepresentation'
+        :param page_size: number of representations requested per page
+        :return: generator of lists of representations
+        """
+        params = {}
+        for key, value in (query or {}).items():
+            if value is None:
+                continue
+            params[key] = str(value).lower() if isinstance(value, bool) else value
+
+        first = 0
+        while True:
+            params.update(first=first, max=page_size)
+            page = self._request_and_deserialize(f"{url}?{urlencode(params)}", method="GET")
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            first += len(page)
+
     def get_realm_info_by_id(self, realm: str = "master") -> dict[str, t.Any] | None:
         """Obtain realm public info by id
 
@@ -816,11 +1081,15 @@ class KeycloakAPI:
         :param realm: Realm from which to obtain the rolemappings.
         :return: The ID of the role, None if not found.
         """
-        rolemappings = self.get_client_roles_by_id(cid, realm=realm)
-        for role in rolemappings:
-            if name == role["name"]:
-                return role["id"]
-        return None
+        role_url = URL_CLIENT_ROLE.format(url=self.baseurl, realm=realm, id=cid, name=quote(name, safe=""))
+        try:
+            return self._request_and_deserialize(role_url, method="GET")["id"]
+        except HTTPError as e:
+            if e.code == HTTPStatus.NOT_FOUND:
+                return None
+            self.fail_request(e, msg=f"Could not fetch role {name} of client {cid} in realm {realm}: {e}")
+        except Exception as e:
+            self.module.fail_json(msg=f"Could not fetch role {name} of client {cid} in realm {realm}: {e}")
 
     def get_client_group_rolemapping_by_id(self, gid, cid, rid, realm: str = "master"):
         """Obtain client representation by id
@@ -1107,15 +1376,33 @@ class KeycloakAPI:
         except Exception as e:
             self.fail_request(e, msg=f"Could not obtain the user for realm {realm} and username {username}: {e}")
 
-    def get_realm_users(self, realm: str = "master") -> list[dict[str, t.Any]]:
+    def iter_realm_users(
+        self, realm: str = "master", query: dict[str, t.Any] | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> t.Iterator[dict[str, t.Any]]:
+        """Iterates over the users of the realm, fetching them one page at a time
+
+        :param realm: realm id
+        :param query: (optional) query parameters of the users endpoint, for instance 'search' or 'briefRepresentation'
+        :param page_size: number of users requested per page
+        :return: generator of user representations
+        """
+        users_url = URL_USERS.format(url=self.baseurl, realm=realm)
+        for page in self.iter_pages(users_url, query=query, page_size=page_size):
+            yield from page
+
+    def get_realm_users(
+        self, realm: str = "master", search: str | None = None, brief_representation: bool | None = None
+    ) -> list[dict[str, t.Any]]:
         """Obtain list of users from the realm
 
         :param realm: realm id
+        :param search: (optional) only return the users whose username, name or email contain this string
+        :param brief_representation: (optional) only return the basic attributes of the users
         :return: list of user representations
         """
-        users_url = URL_USERS.format(url=self.baseurl, realm=realm)
+        query = {"search": search, "briefRepresentation": brief_representation}
         try:
-            return self._request_and_deserialize(users_url, method="GET")
+            return list(self.iter_realm_users(realm=realm, query=query))
         except ValueError as e:
             self.module.fail_json(
                 msg=f"API returned incorrect JSON when trying to obtain the users for realm {realm}: {e}"
@@ -1715,7 +2002,7 @@ class KeycloakAPI:
         """
         groups_url = URL_GROUPS.format(url=self.baseurl, realm=realm)
         try:
-            return self._request_and_deserialize(groups_url, method="GET")
+            return [group for page in self.iter_pages(groups_url) for group in page]
         except Exception as e:
             self.fail_request(e, msg=f"Could not fetch list of groups in realm {realm}: {e}")
 
@@ -1772,29 +2059,38 @@ class KeycloakAPI:
                 if not parent:
                     return None
 
-                # For subgroups: use children endpoint with search parameter
-                search_url = "{url}?search={name}&exact=true".format(
-                    url=URL_GROUP_CHILDREN.format(url=self.baseurl, realm=realm, groupid=parent["id"]),
-                    name=quote(name, safe=""),
-                )
+                groups = self.search_groups(name, realm=realm, parent_id=parent["id"])
             else:
-                # For top-level groups: use groups endpoint with search parameter
-                search_url = "{url}?search={name}&exact=true".format(
-                    url=URL_GROUPS.format(url=self.baseurl, realm=realm), name=quote(name, safe="")
-                )
-
-            groups = self._request_and_deserialize(search_url, method="GET")
+                groups = self.search_groups(name, realm=realm)
 
-            # exact=true should return only exact matches, but verify the name
-            for group in groups:
-                if group["name"] == name:
-                    return self.get_group_by_groupid(group["id"], realm=realm)
+            if groups:
+                return self.get_group_by_groupid(groups[0]["id"], realm=realm)
 
             return None
 
         except Exception as e:
             self.module.fail_json(msg=f"Could not fetch group {name} in realm {realm}: {e}")
 
+    def search_groups(self, name, realm: str = "master", parent_id=None):
+        """Find the groups with exactly the given name, using the Keycloak search API.
+
+        Only the brief representations of the groups are returned.
+        :param name: Name of the groups to find.
+        :param realm: Realm in which the groups reside; default 'master'
+        :param parent_id: Optional ID of the parent group, to search its children instead of the top-level groups
+        :return: list of group representations, empty if no group has that name
+        """
+        if parent_id:
+            # For subgroups: use children endpoint with search parameter
+            search_url = URL_GROUP_CHILDREN.format(url=self.baseurl, realm=realm, groupid=parent_id)
+        else:
+            # For top-level groups: use groups endpoint with search parameter
+            search_url = URL_GROUPS.format(url=self.baseurl, realm=realm)
+        search_url += f"?search={quote(name, safe='')}&exact=true&briefRepresentation=true"
+
+        # exact=true should return only exact matches, but verify the name
+        return [group for group in self._request_and_deserialize(search_url, method="GET") if group["name"] == name]
+
     def _get_normed_group_parent(self, parent):
         """Converts parent dict information into a more easy to use form.
 
@@ -1961,10 +2257,12 @@ class KeycloakAPI:
         # in the case that both are provided, prefer the ID, since it is one
         # less lookup.
         if groupid is None and name is not None:
-            for group in self.get_groups(realm=realm):
-                if group["name"] == name:
-                    groupid = group["id"]
-                    break
+            try:
+                groups = self.search_groups(name, realm=realm)
+            except Exception as e:
+                self.fail_request(e, msg=f"Could not fetch group {name} in realm {realm}: {e}")
+            if groups:
+                groupid = groups[0]["id"]
 
         # if the group doesn't exist - no problem, nothing to delete.
         if groupid is None:
@@ -3154,8 +3452,16 @@ class KeycloakAPI:
         The path is formed by prepending a '/' character to `target` unless it's already present.
         This adds support for finding top level groups by name and subgroups by path.
         """
-        groups = self.get_groups(realm=realm)
         path = target if target.startswith("/") else f"/{target}"
+        group_url = URL_GROUP_BY_PATH.format(url=self.baseurl, realm=realm, path=quote(path.lstrip("/"), safe="/"))
+        try:
+            return self._request_and_deserialize(group_url, method="GET")
+        except HTTPError as e:
+            if e.code == HTTPStatus.NOT_FOUND:
+                return None
+            # Walk down the group tree below if the server does not support the group-by-path endpoint
+
+        groups = self.get_groups(realm=realm)
         for segment in path.split("/"):
             if not segment:
                 continue
@@ -10,10 +10,13 @@ from __future__ import annotations
 import http.client as http_client
 import json
 import os
+import queue
 import socket
 import ssl
 import typing as t
-from urllib.parse import urlparse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode, urlparse
 
 from ansible.module_utils.urls import generic_urlparse
 
@@ -48,6 +51,7 @@ class LXDClient:
         debug: bool = False,
         server_cert_file: str | None = None,
         server_check_hostname: bool = True,
+        pool_size: int = 1,
     ) -> None:
         """LXD Client.
 
@@ -57,11 +61,16 @@ class LXDClient:
         :param debug: The debug flag. The request and response are stored in logs when debug is true.
         :param server_cert_file: The path of the server certificate file.
         :param server_check_hostname: Whether to check the server's hostname as part of TLS verification.
+        :param pool_size: The maximum number of keep-alive connections used concurrently by do_many().
         """
         self.url = url
         self.debug = debug
+        self.pool_size = max(1, pool_size)
         self.logs: list[dict[str, t.Any]] = []
         self.connection: UnixHTTPConnection | HTTPSConnection
+        self._unix_socket_path: str | None = None
+        self._netloc: str | None = None
+        self._ssl_context: ssl.SSLContext | None = None
         if url.startswith("https:"):
             self.cert_file = cert_file
             self.key_file = key_file
@@ -72,12 +81,36 @@ class LXDClient:
                 ctx.load_verify_locations(cafile=server_cert_file)
             ctx.check_hostname = server_check_hostname
             ctx.load_cert_chain(cert_file, keyfile=key_file)  # type: ignore # TODO!
-            self.connection = HTTPSConnection(parts.get("netloc"), context=ctx)
+            self._netloc = parts.get("netloc")
+            self._ssl_context = ctx
         elif url.startswith("unix:"):
-            unix_socket_path = url[len("unix:") :]
-            self.connection = UnixHTTPConnection(unix_socket_path)
+            self._unix_socket_path = url[len("unix:") :]
         else:
             raise LXDClientException("URL scheme must be unix: or https:")
+        self.connection = self._new_connection()
+        # Idle keep-alive connections; further connections are only opened by do_many()
+        self._idle_connections: queue.LifoQueue[UnixHTTPConnection | HTTPSConnection] = queue.LifoQueue()
+        self._idle_connections.put(self.connection)
+
+    def _new_connection(self) -> UnixHTTPConnection | HTTPSConnection:
+        if self._unix_socket_path is not None:
+            return UnixHTTPConnection(self._unix_socket_path)
+        return HTTPSConnection(self._netloc, context=self._ssl_context)
+
+    def _acquire_connection(self) -> UnixHTTPConnection | HTTPSConnection:
+        try:
+            return self._idle_connections.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                self._idle_connections.get_nowait().close()
+            except queue.Empty:
+                break
+        self._idle_connections.put(self.connection)
 
     def do(self, method: str, url: str, body_json=None, ok_error_codes=None, timeout=None, wait_for_container=None):
         resp_json = self._send_request(method, url, body_json=body_json, ok_error_codes=ok_error_codes, timeout=timeout)
@@ -91,16 +124,46 @@ class LXDClient:
                 self._raise_err_from_json(resp_json)
         return resp_json
 
+    def do_many(self, urls, ok_error_codes=None, return_exceptions=False):
+        """Send independent GET requests concurrently over up to pool_size connections.
+
+        :param urls: The URLs to GET.
+        :param ok_error_codes: Error codes which are returned instead of raised.
+        :param return_exceptions: Return LXDClientException instances in place of the failed
+            responses instead of raising the first one.
+        :return: The response JSONs in the same order as urls.
+        """
+
+        def get(url):
+            try:
+                return self.do("GET", url, ok_error_codes=ok_error_codes)
+            except LXDClientException as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        urls = list(urls)
+        if self.pool_size == 1 or len(urls) < 2:
+            return [get(url) for url in urls]
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(urls))) as executor:
+            return list(executor.map(get, urls))
+
     def authenticate(self, trust_password):
         body_json = {"type": "client", "password": trust_password}
         return self._send_request("POST", "/1.0/certificates", body_json=body_json)
 
     def _send_request(self, method: str, url: str, body_json=None, ok_error_codes=None, timeout=None):
+        connection = self._acquire_connection()
         try:
             body = json.dumps(body_json)
-            self.connection.request(method, url, body=body)
-            resp = self.connection.getresponse()
-            resp_data = resp.read()
+            try:
+                resp_data = self._request(connection, method, url, body)
+            except (http_client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server may have closed an idle keep-alive connection; GET can safely be retried once
+                connection.close()
+                if method != "GET":
+                    raise
+                resp_data = self._request(connection, method, url, body)
             resp_json = json.loads(resp_data)
             self.logs.append(
                 {
@@ -118,7 +181,57 @@ class LXDClient:
                 self._raise_err_from_json(resp_json)
             return resp_json
         except OSError as e:
+            connection.close()
+            raise LXDClientException("cannot connect to the LXD server", err=e) from e
+        finally:
+            self._idle_connections.put(connection)
+
+    def do_raw(self, method: str, url: str, body=None, headers=None, out_file=None) -> bytes | None:
+        """Send a request whose body or response is not JSON, like file transfers and exec logs.
+
+        :param body: The request body, as bytes or as a binary file object which is streamed.
+        :param headers: Additional request headers.
+        :param out_file: A binary file object receiving the response body instead of returning it.
+        :return: The response body, or None if out_file is given.
+        """
+        connection = self._acquire_connection()
+        try:
+            try:
+                response = self._raw_request(connection, method, url, body, headers)
+            except (http_client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server may have closed an idle keep-alive connection; GET can safely be retried once
+                connection.close()
+                if method != "GET":
+                    raise
+                response = self._raw_request(connection, method, url, body, headers)
+            self.logs.append({"type": "sent raw request", "request": {"method": method, "url": url}})
+            if response.status >= 400:
+                data = response.read()
+                try:
+                    err = self._get_err_from_resp_json(json.loads(data))
+                except ValueError:
+                    err = data.decode("utf-8", "replace")
+                raise LXDClientException(err or f"{method} {url} failed with status {response.status}")
+            if out_file is None:
+                return response.read()
+            while chunk := response.read(65536):
+                out_file.write(chunk)
+            return None
+        except OSError as e:
+            connection.close()
             raise LXDClientException("cannot connect to the LXD server", err=e) from e
+        finally:
+            self._idle_connections.put(connection)
+
+    @staticmethod
+    def _raw_request(connection: UnixHTTPConnection | HTTPSConnection, method: str, url: str, body, headers):
+        connection.request(method, url, body=body, headers=headers or {})
+        return connection.getresponse()
+
+    @staticmethod
+    def _request(connection: UnixHTTPConnection | HTTPSConnection, method: str, url: str, body: str) -> bytes:
+        connection.request(method, url, body=body)
+        return connection.getresponse().read()
 
     def _raise_err_from_json(self, resp_json):
         err_params = {}
@@ -137,6 +250,73 @@ class LXDClient:
         return err
 
 
+class LXDInstance:
+    """Run commands and transfer files in an LXD or Incus instance with the REST API.
+
+    Incus kept the LXD API, but prefixes the file headers with X-Incus instead of X-LXD.
+    """
+
+    def __init__(self, client: LXDClient, name: str, project: str | None = None, header_prefix: str = "X-LXD") -> None:
+        self.client = client
+        self.project = project
+        self.header_prefix = header_prefix
+        self._url = f"/1.0/instances/{quote(name, safe='')}"
+
+    def _query(self, **params) -> str:
+        if self.project:
+            params["project"] = self.project
+        return f"?{urlencode(params)}" if params else ""
+
+    def exec(self, command: list[str], stdin: bytes | None = None) -> tuple[int, bytes, bytes]:
+        """Run command and return its exit code, stdout and stderr.
+
+        The API only records the output of commands without websockets, so input data is
+        pushed to a temporary file first, which a shell opens as stdin and removes before
+        running the command.
+        """
+        if stdin is not None:
+            stdin_path = f"/tmp/.ansible-stdin-{uuid.uuid4().hex}"
+            self.push(stdin, stdin_path, uid=0, gid=0, mode=0o600)
+            command = ["/bin/sh", "-c", 'exec 0<"$0" && rm -f "$0" && exec "$@"', stdin_path] + list(command)
+        body = {
+            "command": command,
+            "environment": {},
+            "interactive": False,
+            "wait-for-websocket": False,
+            "record-output": True,
+        }
+        operation = self.client.do("POST", f"{self._url}/exec{self._query()}", body_json=body)
+        metadata = operation["metadata"]["metadata"]
+        output = {}
+        for fd, path in (metadata.get("output") or {}).items():
+            url = f"{path}{self._query()}"
+            output[fd] = self.client.do_raw("GET", url)
+            self.client.do_raw("DELETE", url)
+        return metadata["return"], output.get("1", b""), output.get("2", b"")
+
+    def push(self, data, path: str, uid: int | None = None, gid: int | None = None, mode: int | None = None) -> None:
+        """Write data, bytes or a seekable binary file object which is streamed, to path in the instance."""
+        headers = {f"{self.header_prefix}-type": "file", f"{self.header_prefix}-write": "overwrite"}
+        if uid is not None:
+            headers[f"{self.header_prefix}-uid"] = str(uid)
+        if gid is not None:
+            headers[f"{self.header_prefix}-gid"] = str(gid)
+        if mode is not None:
+            headers[f"{self.header_prefix}-mode"] = f"{mode:04o}"
+        if isinstance(data, bytes):
+            headers["Content-Length"] = str(len(data))
+        else:
+            start = data.tell()
+            headers["Content-Length"] = str(data.seek(0, os.SEEK_END) - start)
+            data.seek(start)
+        headers["Content-Type"] = "application/octet-stream"
+        self.client.do_raw("POST", f"{self._url}/files{self._query(path=path)}", body=data, headers=headers)
+
+    def pull(self, path: str, out_file) -> None:
+        """Write the content of path in the instance to the binary file object out_file."""
+        self.client.do_raw("GET", f"{self._url}/files{self._query(path=path)}", out_file=out_file)
+
+
 def default_key_file() -> str:
     return os.path.expanduser("~/.config/lxc/client.key")
 
@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+import copy
 import http.client as http_client
 import json
 import os
@@ -14,6 +15,7 @@ import random
 import string
 import time
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
@@ -65,6 +67,9 @@ class RedfishUtils:
         data_modification: bool = False,
         strip_etag_quotes: bool = False,
         ciphers: str | None = None,
+        resource_cache: bool = False,
+        max_concurrent_requests: int = 1,
+        expand_collections: bool = False,
     ) -> None:
         self.root_uri = root_uri
         self.creds = creds
@@ -80,6 +85,12 @@ class RedfishUtils:
         self._vendor = None
         self.validate_certs = module.params.get("validate_certs", False)
         self.ca_path = module.params.get("ca_path")
+        # Per-run cache of GET responses (URI -> response); entries are revalidated
+        # with If-None-Match after the service has been modified
+        self._resource_cache: dict[str, dict[str, t.Any]] | None = {} if resource_cache else None
+        self.max_concurrent_requests = max(1, max_concurrent_requests)
+        self.expand_collections = expand_collections
+        self._expand_query: str | None = None
 
     def _auth_params(self, headers: dict[str, str]) -> tuple[str | None, str | None, bool]:
         """
@@ -166,6 +177,10 @@ class RedfishUtils:
         kwargs.setdefault("timeout", self.timeout)
         kwargs.setdefault("ciphers", self.ciphers)
         kwargs.setdefault("ca_path", self.ca_path)
+        if self._resource_cache and kwargs.get("method", "GET") != "GET":
+            # The service is being modified; cached responses need revalidation
+            for entry in self._resource_cache.values():
+                entry["stale"] = True
         resp = open_url(uri, **kwargs)
         headers = {k.lower(): v for (k, v) in resp.info().items()}
         return resp, headers
@@ -180,6 +195,14 @@ class RedfishUtils:
         username, password, basic_auth = self._auth_params(req_headers)
         if timeout is None:
             timeout = self.timeout
+        cached = None
+        if self._resource_cache is not None and not override_headers:
+            cached = self._resource_cache.get(uri)
+            if cached is not None:
+                if not cached["stale"]:
+                    return self._cached_response(cached)
+                if cached["etag"]:
+                    req_headers["If-None-Match"] = cached["etag"]
         try:
             # Service root is an unauthenticated resource; remove credentials
             # in case the caller will be using sessions later.
@@ -202,6 +225,9 @@ class RedfishUtils:
                 if not allow_no_resp:
                     raise
         except HTTPError as e:
+            if e.code == HTTPStatus.NOT_MODIFIED and cached is not None:
+                cached["stale"] = False
+                return self._cached_response(cached)
             msg, data = self._get_extended_message(e)
             return {
                 "ret": False,
@@ -214,8 +240,96 @@ class RedfishUtils:
         # Almost all errors should be caught above, but just in case
         except Exception as e:
             return {"ret": False, "msg": f"Failed GET request to '{uri}': '{e}'"}
+        if self._resource_cache is not None and not override_headers and data is not None:
+            self._resource_cache[uri] = {
+                "data": copy.deepcopy(data),
+                "headers": headers,
+                "resp": resp,
+                "etag": headers.get("etag"),
+                "stale": False,
+            }
         return {"ret": True, "data": data, "headers": headers, "resp": resp}
 
+    @staticmethod
+    def _cached_response(cached):
+        return {
+            "ret": True,
+            "data": copy.deepcopy(cached["data"]),
+            "headers": cached["headers"],
+            "resp": cached["resp"],
+        }
+
+    def get_requests(self, uris: list[str]) -> list[dict[str, t.Any]]:
+        """
+        Sends GET requests for several URIs, using up to max_concurrent_requests
+        requests at a time.
+
+        :param uris: list of full URIs to GET
+        :return: list of responses in the same order as uris
+        """
+        if self.max_concurrent_requests == 1 or len(uris) < 2:
+            return [self.get_request(uri) for uri in uris]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_requests, len(uris))) as executor:
+            return list(executor.map(self.get_request, uris))
+
+    def get_resources(self, uris: list[str]) -> dict[str, t.Any]:
+        """
+        Gets the resources behind a list of URIs relative to the root URI.
+
+        :param uris: list of resource URIs, for example taken from @odata.id
+        :return: dict containing the resources in the same order as uris, or the first failed response
+        """
+        entries = []
+        for response in self.get_requests([self.root_uri + uri for uri in uris]):
+            if response["ret"] is False:
+                return response
+            entries.append(response["data"])
+        return {"ret": True, "entries": entries}
+
+    def _get_expand_query(self) -> str:
+        """
+        Determines the $expand query to use for collections from the
+        ProtocolFeaturesSupported property of the service root.
+
+        :return: the query string, or an empty string if collections are not expanded
+        """
+        if self._expand_query is None:
+            self._expand_query = ""
+            if self.expand_collections:
+                response = self.get_request(self.root_uri + self.service_root)
+                if response["ret"]:
+                    expand = response["data"].get("ProtocolFeaturesSupported", {}).get("ExpandQuery", {})
+                    if expand.get("NoLinks"):
+                        self._expand_query = "$expand=."
+                    elif expand.get("ExpandAll"):
+                        self._expand_query = "$expand=*"
+                    if self._expand_query and expand.get("Levels"):
+                        self._expand_query += "($levels=1)"
+        return self._expand_query
+
+    def get_collection_members(self, collection_uri: str) -> dict[str, t.Any]:
+        """
+        Gets all members of a resource collection, with a single $expand
+        request if the service supports it.
+
+        :param collection_uri: URI of the collection relative to the root URI
+        :return: dict containing the member resources, or the failed response
+        """
+        response = None
+        expand = self._get_expand_query()
+        if expand:
+            response = self.get_request(f"{self.root_uri}{collection_uri}?{expand}")
+            if response["ret"]:
+                members = response["data"].get("Members", [])
+                # Members that were not expanded only contain @odata.id
+                if all(len(member) > 1 for member in members):
+                    return {"ret": True, "entries": members}
+        if response is None or response["ret"] is False:
+            response = self.get_request(self.root_uri + collection_uri)
+            if response["ret"] is False:
+                return response
+        return self.get_resources([member["@odata.id"] for member in response["data"].get("Members", [])])
+
     def post_request(self, uri: str, pyld, multipart: bool = False):
         req_headers = dict(POST_HEADERS)
         username, password, basic_auth = self._auth_params(req_headers)
@@ -838,29 +952,20 @@ class RedfishUtils:
         # Loop through Members and their StorageControllers
         # and gather properties from each StorageController
         if data["Members"]:
-            for storage_member in data["Members"]:
-                storage_member_uri = storage_member["@odata.id"]
-                response = self.get_request(self.root_uri + storage_member_uri)
-                data = response["data"]
-
+            response = self.get_resources([storage_member["@odata.id"] for storage_member in data["Members"]])
+            if response["ret"] is False:
+                return response
+            for data in response["entries"]:
                 if key in data:
                     controllers_uri = data[key]["@odata.id"]
 
-                    response = self.get_request(self.root_uri + controllers_uri)
+                    response = self.get_collection_members(controllers_uri)
                     if response["ret"] is False:
                         return response
                     result["ret"] = True
-                    data = response["data"]
-
-                    if data["Members"]:
-                        for controller_member in data["Members"]:
-                            controller_member_uri = controller_member["@odata.id"]
-                            response = self.get_request(self.root_uri + controller_member_uri)
-                            if response["ret"] is False:
-                                return response
-                            result["ret"] = True
-                            data = response["data"]
 
+                    if response["entries"]:
+                        for data in response["entries"]:
                             controller_result = {}
                             for property in properties:
                                 if property in data:
@@ -935,12 +1040,10 @@ class RedfishUtils:
             if data["Members"]:
                 for controller in data["Members"]:
                     controller_list.append(controller["@odata.id"])
-                for c in controller_list:
-                    uri = self.root_uri + c
-                    response = self.get_request(uri)
-                    if response["ret"] is False:
-                        return response
-                    data = response["data"]
+                response = self.get_resources(controller_list)
+                if response["ret"] is False:
+                    return response
+                for data in response["entries"]:
                     controller_name = "Controller 1"
                     storage_id = data["Id"]
                     if "Controllers" in data:
@@ -971,11 +1074,10 @@ class RedfishUtils:
                                 controller_name = f"Controller {sc_id}"
                     drive_results = []
                     if "Drives" in data:
-                        for device in data["Drives"]:
-                            disk_uri = self.root_uri + device["@odata.id"]
-                            response = self.get_request(disk_uri)
-                            data = response["data"]
-
+                        response = self.get_resources([device["@odata.id"] for device in data["Drives"]])
+                        if response["ret"] is False:
+                            return response
+                        for data in response["entries"]:
                             drive_result = {}
                             drive_result["RedfishURI"] = data["@odata.id"]
                             for property in properties:
@@ -1032,7 +1134,6 @@ class RedfishUtils:
     def get_volume_inventory(self, systems_uri):
         result = {"entries": []}
         controller_list = []
-        volume_list = []
         # Get these entries, but does not fail if not found
         properties = [
             "Id",
@@ -1078,12 +1179,10 @@ class RedfishUtils:
             if data.get("Members"):
                 for controller in data["Members"]:
                     controller_list.append(controller["@odata.id"])
-                for idx, c in enumerate(controller_list):
-                    uri = self.root_uri + c
-                    response = self.get_request(uri)
-                    if response["ret"] is False:
-                        return response
-                    data = response["data"]
+                response = self.get_resources(controller_list)
+                if response["ret"] is False:
+                    return response
+                for idx, data in enumerate(response["entries"]):
                     controller_name = f"Controller {idx}"
                     if "Controllers" in data:
                         response = self.get_request(self.root_uri + data["Controllers"]["@odata.id"])
@@ -1112,23 +1211,15 @@ class RedfishUtils:
                                 sc_id = sc[0].get("Id", "1")
                                 controller_name = f"Controller {sc_id}"
                     volume_results = []
-                    volume_list = []
                     if "Volumes" in data:
-                        # Get a list of all volumes and build respective URIs
+                        # Get all volumes of the collection
                         volumes_uri = data["Volumes"]["@odata.id"]
-                        response = self.get_request(self.root_uri + volumes_uri)
-                        data = response["data"]
-
-                        if data.get("Members"):
-                            for volume in data["Members"]:
-                                volume_list.append(volume["@odata.id"])
-                            for v in volume_list:
-                                uri = self.root_uri + v
-                                response = self.get_request(uri)
-                                if response["ret"] is False:
-                                    return response
-                                data = response["data"]
+                        response = self.get_collection_members(volumes_uri)
+                        if response["ret"] is False:
+                            return response
 
+                        if response["entries"]:
+                            for data in response["entries"]:
                                 volume_result = {}
                                 for property in properties:
                                     if property in data:
@@ -245,6 +245,8 @@ from ansible_collections.community.general.plugins.module_utils._keycloak import
     KeycloakError,
     get_token,
     keycloak_argument_spec,
+    plan_rolemapping,
+    resolve_roles,
 )
 
 
@@ -326,55 +328,27 @@ def main():
             module.fail_json(msg=f"Could not fetch client {client_id}:")
     if roles is None:
         module.exit_json(msg="Nothing to do (no roles specified).")
-    else:
-        for role in roles:
-            if role["name"] is None and role["id"] is None:
-                module.fail_json(msg="Either the `name` or `id` has to be specified on each role.")
-            # Fetch missing role_id
-            if role["id"] is None:
-                role_id = kc.get_client_role_id_by_name(cid, role["name"], realm=realm)
-                if role_id is not None:
-                    role["id"] = role_id
-                else:
-                    module.fail_json(msg=f"Could not fetch role {role['name']}:")
-            # Fetch missing role_name
-            else:
-                role["name"] = kc.get_client_group_rolemapping_by_id(gid, cid, role["id"], realm=realm)["name"]
-                if role["name"] is None:
-                    module.fail_json(msg=f"Could not fetch role {role['id']}")
-
-    # Get effective client-level role mappings
-    available_roles_before = kc.get_client_group_available_rolemappings(gid, cid, realm=realm)
-    assigned_roles_before = kc.get_client_group_composite_rolemappings(gid, cid, realm=realm)
+    for role in roles:
+        if role["name"] is None and role["id"] is None:
+            module.fail_json(msg="Either the `name` or `id` has to be specified on each role.")
+
+    # Get effective client-level role mappings, together they contain all the roles of the client
+    available_roles_before = kc.get_client_group_available_rolemappings(gid, cid, realm=realm) or []
+    assigned_roles_before = kc.get_client_group_composite_rolemappings(gid, cid, realm=realm) or []
+
+    # Fetch missing role ids and names
+    for role in resolve_roles(roles, available_roles_before, assigned_roles_before):
+        module.fail_json(msg=f"Could not fetch role {role['name'] if role['id'] is None else role['id']}:")
 
     result["existing"] = assigned_roles_before
-    result["proposed"] = list(assigned_roles_before) if assigned_roles_before else []
+    result["proposed"] = list(assigned_roles_before)
 
-    update_roles = []
-    for role in roles:
-        # Fetch roles to assign if state present
-        if state == "present":
-            for available_role in available_roles_before:
-                if role["name"] == available_role["name"]:
-                    update_roles.append(
-                        {
-                            "id": role["id"],
-                            "name": role["name"],
-                        }
-                    )
-                    result["proposed"].append(available_role)
-        # Fetch roles to remove if state absent
-        else:
-            for assigned_role in assigned_roles_before:
-                if role["name"] == assigned_role["name"]:
-                    update_roles.append(
-                        {
-                            "id": role["id"],
-                            "name": role["name"],
-                        }
-                    )
-                    if assigned_role in result["proposed"]:  # Handle double removal
-                        result["proposed"].remove(assigned_role)
+    update_roles = plan_rolemapping(roles, state, available_roles_before, assigned_roles_before)
+    update_names = {role["name"] for role in update_roles}
+    if state == "present":
+        result["proposed"].extend(role for role in available_roles_before if role["name"] in update_names)
+    else:
+        result["proposed"] = [role for role in result["proposed"] if role["name"] not in update_names]
 
     if len(update_roles):
         if state == "present":
@@ -230,6 +230,7 @@ from ansible_collections.community.general.plugins.module_utils._keycloak import
     KeycloakError,
     get_token,
     keycloak_argument_spec,
+    resolve_roles,
 )
 
 
@@ -304,26 +305,16 @@ def main():
 
     if roles is None:
         module.exit_json(msg="Nothing to do (no roles specified).")
-    else:
-        for role in roles:
-            if role["name"] is None and role["id"] is None:
-                module.fail_json(msg="Either the `name` or `id` has to be specified on each role.")
-            # Fetch missing role_id
-            if role["id"] is None:
-                role_rep = kc.get_realm_role(role["name"], realm=realm)
-                if role_rep is not None:
-                    role["id"] = role_rep["id"]
-                else:
-                    module.fail_json(msg=f"Could not fetch realm role {role['name']} by name:")
-            # Fetch missing role_name
-            else:
-                for realm_role in kc.get_realm_roles(realm=realm):
-                    if realm_role["id"] == role["id"]:
-                        role["name"] = realm_role["name"]
-                        break
+    for role in roles:
+        if role["name"] is None and role["id"] is None:
+            module.fail_json(msg="Either the `name` or `id` has to be specified on each role.")
 
-                if role["name"] is None:
-                    module.fail_json(msg=f"Could not fetch realm role {role['id']} by ID")
+    # Fetch missing role ids and names, with a single request for all the roles
+    if any(role["name"] is None or role["id"] is None for role in roles):
+        for role in resolve_roles(roles, kc.get_realm_roles(realm=realm)):
+            if role["id"] is None:
+                module.fail_json(msg=f"Could not fetch realm role {role['name']} by name:")
+            module.fail_json(msg=f"Could not fetch realm role {role['id']} by ID")
 
     assigned_roles_before = group_rep.get("realmRoles", [])
 
@@ -32,6 +32,18 @@ options:
     description:
       - The Keycloak realm from which users should be retrieved.
     default: 'master'
+  search:
+    type: str
+    description:
+      - Only retrieve the users whose username, first or last name, or email contain this string.
+      - The search is done by Keycloak.
+    version_added: 13.4.0
+  brief_representation:
+    type: bool
+    description:
+      - Only retrieve the basic attributes of the users, without their custom attributes.
+    default: false
+    version_added: 13.4.0
 
 extends_documentation_fragment:
   - community.general._keycloak
@@ -61,6 +73,15 @@ EXAMPLES = r"""
     auth_keycloak_url: https://auth.example.com/auth
     token: TOKEN
   delegate_to: localhost
+
+- name: List the users of the "MyCustomRealm" realm whose name or email contain "example.com"
+  community.general.keycloak_realm_users_info:
+    realm: MyCustomRealm
+    search: example.com
+    brief_representation: true
+    auth_keycloak_url: https://auth.example.com/auth
+    token: TOKEN
+  delegate_to: localhost
 """
 
 RETURN = r"""
@@ -92,6 +113,8 @@ def main():
     argument_spec = keycloak_argument_spec()
 
     argument_spec["realm"] = dict(default="master")
+    argument_spec["search"] = dict(type="str")
+    argument_spec["brief_representation"] = dict(type="bool", default=False)
 
     module = AnsibleModule(
         argument_spec=argument_spec,
@@ -115,7 +138,11 @@ def main():
 
     realm = module.params.get("realm")
 
-    result["users"] = kc.get_realm_users(realm=realm)
+    result["users"] = kc.get_realm_users(
+        realm=realm,
+        search=module.params.get("search"),
+        brief_representation=module.params.get("brief_representation"),
+    )
     module.exit_json(**result)
 
 
@@ -246,6 +246,8 @@ from ansible_collections.community.general.plugins.module_utils._keycloak import
     KeycloakError,
     get_token,
     keycloak_argument_spec,
+    plan_rolemapping,
+    resolve_roles,
 )
 
 
@@ -334,70 +336,28 @@ def main():
             module.fail_json(msg=f"Could not fetch client {client_id}:")
     if roles is None:
         module.exit_json(msg="Nothing to do (no roles specified).")
-    else:
-        for role in roles:
-            if role.get("name") is None and role.get("id") is None:
-                module.fail_json(msg="Either the `name` or `id` has to be specified on each role.")
-            # Fetch missing role_id
-            if role.get("id") is None:
-                if cid is None:
-                    role_id = kc.get_realm_role(name=role.get("name"), realm=realm)["id"]
-                else:
-                    role_id = kc.get_client_role_id_by_name(cid=cid, name=role.get("name"), realm=realm)
-                if role_id is not None:
-                    role["id"] = role_id
-                else:
-                    module.fail_json(
-                        msg=f"Could not fetch role {role.get('name')} for client_id {client_id} or realm {realm}"
-                    )
-            # Fetch missing role_name
-            else:
-                if cid is None:
-                    role_rep = kc.get_realm_user_rolemapping_by_id(uid=uid, rid=role.get("id"), realm=realm)
-                    if role_rep is not None:
-                        role["name"] = role_rep["name"]
-                else:
-                    role_rep = kc.get_client_user_rolemapping_by_id(uid=uid, cid=cid, rid=role.get("id"), realm=realm)
-                    if role_rep is not None:
-                        role["name"] = role_rep["name"]
-                if role.get("name") is None:
-                    module.fail_json(
-                        msg=f"Could not fetch role {role.get('id')} for client_id {client_id} or realm {realm}"
-                    )
-
-    # Get effective role mappings
+    for role in roles:
+        if role.get("name") is None and role.get("id") is None:
+            module.fail_json(msg="Either the `name` or `id` has to be specified on each role.")
+
+    # Get effective role mappings, together they contain all the roles of the realm or client
     if cid is None:
-        available_roles_before = kc.get_realm_user_available_rolemappings(uid=uid, realm=realm)
-        assigned_roles_before = kc.get_realm_user_composite_rolemappings(uid=uid, realm=realm)
+        available_roles_before = kc.get_realm_user_available_rolemappings(uid=uid, realm=realm) or []
+        assigned_roles_before = kc.get_realm_user_composite_rolemappings(uid=uid, realm=realm) or []
     else:
-        available_roles_before = kc.get_client_user_available_rolemappings(uid=uid, cid=cid, realm=realm)
-        assigned_roles_before = kc.get_client_user_composite_rolemappings(uid=uid, cid=cid, realm=realm)
+        available_roles_before = kc.get_client_user_available_rolemappings(uid=uid, cid=cid, realm=realm) or []
+        assigned_roles_before = kc.get_client_user_composite_rolemappings(uid=uid, cid=cid, realm=realm) or []
+
+    # Fetch missing role ids and names
+    for role in resolve_roles(roles, available_roles_before, assigned_roles_before):
+        module.fail_json(
+            msg=f"Could not fetch role {role.get('name') if role.get('id') is None else role.get('id')} for client_id {client_id} or realm {realm}"
+        )
 
     result["existing"] = assigned_roles_before
     result["proposed"] = roles
 
-    update_roles = []
-    for role in roles:
-        # Fetch roles to assign if state present
-        if state == "present":
-            for available_role in available_roles_before:
-                if role.get("name") == available_role.get("name"):
-                    update_roles.append(
-                        {
-                            "id": role.get("id"),
-                            "name": role.get("name"),
-                        }
-                    )
-        # Fetch roles to remove if state absent
-        else:
-            for assigned_role in assigned_roles_before:
-                if role.get("name") == assigned_role.get("name"):
-                    update_roles.append(
-                        {
-                            "id": role.get("id"),
-                            "name": role.get("name"),
-                        }
-                    )
+    update_roles = plan_rolemapping(roles, state, available_roles_before, assigned_roles_before)
 
     if len(update_roles):
         if state == "present":
@@ -13,6 +13,8 @@ version_added: '0.2.0'
 short_description: Search for entries in a LDAP server
 description:
   - Return the results of an LDAP search.
+  - Results can also be written to a JSON Lines file on the target with O(output_file), which keeps the memory usage of the
+    module independent of the number of entries found.
 author:
   - Sebastian Pfahl (@eryx12o45)
 requirements:
@@ -46,6 +48,7 @@ options:
     elements: str
     description:
       - A list of attributes for limiting the result. Use an actual list or a comma-separated string.
+      - The list is sent to the server, so only the requested attributes are transferred.
   schema:
     default: false
     type: bool
@@ -69,6 +72,26 @@ options:
     type: list
     elements: str
     version_added: 7.0.0
+  output_file:
+    description:
+      - If provided, write the entries found to this file on the target instead of returning them in RV(results).
+      - The file is written in the JSON Lines format, that is one JSON object per line for every entry found. The objects
+        have the same format as the elements of RV(results).
+      - Entries are written while the search results are received, so the whole result set is never held in memory. This
+        is best combined with O(page_size) for large searches.
+      - The file is replaced atomically once the search completes, and only if its content changes. In check mode, the
+        search is performed but the file is not written.
+    type: path
+    version_added: 13.4.0
+  size_limit:
+    description:
+      - The maximum number of entries to return or write to O(output_file).
+      - Once this number of entries has been received, the search is abandoned and RV(truncated) is set to V(true) if the
+        server had more entries to return.
+      - Setting the limit to V(0) (default) returns all entries.
+    type: int
+    default: 0
+    version_added: 13.4.0
 extends_documentation_fragment:
   - community.general._ldap.documentation
   - community.general._attributes
@@ -87,6 +110,18 @@ EXAMPLES = r"""
     attrs:
       - "gidNumber"
   register: ldap_group_gids
+
+- name: Export all users to a JSON Lines file on the target
+  community.general.ldap_search:
+    dn: "ou=users,dc=example,dc=com"
+    scope: "children"
+    filter: "(objectClass=inetOrgPerson)"
+    attrs:
+      - "uid"
+      - "mail"
+    page_size: 1000
+    output_file: /var/tmp/users.jsonl
+  register: ldap_users
 """
 
 # @FIXME RV 'results' is meant to be used when 'loop:' was used with the module.
@@ -101,9 +136,30 @@ results:
       contain Base64-encoded binary data; which ones is determined by the O(base64_attributes) option.
   type: list
   elements: dict
+count:
+  description:
+    - The number of entries found.
+  returned: success
+  type: int
+  version_added: 13.4.0
+output_file:
+  description:
+    - The path of the file the entries have been written to.
+  returned: when O(output_file) is provided
+  type: str
+  version_added: 13.4.0
+truncated:
+  description:
+    - Whether the search was stopped because O(size_limit) was reached.
+  returned: success
+  type: bool
+  version_added: 13.4.0
 """
 
 import base64
+import json
+import os
+import tempfile
 import traceback
 
 from ansible.module_utils.basic import AnsibleModule, missing_required_lib
@@ -135,6 +191,8 @@ def main():
             schema=dict(type="bool", default=False),
             page_size=dict(type="int", default=0),
             base64_attributes=dict(type="list", elements="str"),
+            output_file=dict(type="path"),
+            size_limit=dict(type="int", default=0),
         ),
         supports_check_mode=True,
         required_together=ldap_required_together(),
@@ -182,6 +240,9 @@ class LdapSearch(LdapGeneric):
         self.filterstr = self.module.params["filter"]
         self.attrlist = []
         self.page_size = self.module.params["page_size"]
+        self.size_limit = self.module.params["size_limit"]
+        self.output_file = self.module.params["output_file"]
+        self.truncated = False
         self._load_scope()
         self._load_attrs()
         self._load_schema()
@@ -207,14 +268,52 @@ class LdapSearch(LdapGeneric):
         self.attrlist = self.module.params["attrs"] or None
 
     def main(self):
+        if self.output_file:
+            count, changed = self.write_search(self.output_file)
+            self.module.exit_json(
+                changed=changed,
+                count=count,
+                output_file=self.output_file,
+                truncated=self.truncated,
+            )
         results = self.perform_search()
-        self.module.exit_json(changed=False, results=results)
+        self.module.exit_json(changed=False, results=results, count=len(results), truncated=self.truncated)
 
     def perform_search(self):
-        ldap_entries = []
+        return list(self.iter_search())
+
+    def write_search(self, path):
+        """
+        Write the entries found to path in the JSON Lines format.
+
+        Return the number of entries, and whether the content of the file changed.
+        In check mode, the entries are written to a temporary file to compare it with path.
+        """
+        count = 0
+        tmp_dir = self.module.tmpdir if self.module.check_mode else os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".ldap_search", dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "w") as f:
+                for entry in self.iter_search():
+                    f.write(json.dumps(entry, separators=(",", ":")))
+                    f.write("\n")
+                    count += 1
+            changed = not os.path.isfile(path) or self.module.sha256(tmp_path) != self.module.sha256(path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        if changed and not self.module.check_mode:
+            self.module.atomic_move(tmp_path, path)
+        else:
+            os.remove(tmp_path)
+        return count, changed
+
+    def iter_search(self):
+        """Yield the entries found, one at a time, while the search results are received."""
         controls = []
         if self.page_size > 0:
             controls.append(ldap.controls.libldap.SimplePagedResultsControl(True, size=self.page_size, cookie=""))
+        count = 0
         try:
             while True:
                 response = self.connection.search_ext(
@@ -225,13 +324,23 @@ class LdapSearch(LdapGeneric):
                     attrsonly=self.attrsonly,
                     serverctrls=controls,
                 )
-                rtype, results, rmsgid, serverctrls = self.connection.result3(response)
-                for result in results:
-                    if isinstance(result[1], dict):
+                # Fetch the results one message at a time instead of the whole page
+                rtype = None
+                while rtype != ldap.RES_SEARCH_RESULT:
+                    rtype, results, rmsgid, serverctrls = self.connection.result3(response, all=0)
+                    for result in results:
+                        if not isinstance(result[1], dict):
+                            continue
+                        if self.size_limit > 0 and count >= self.size_limit:
+                            self.truncated = True
+                            if rtype != ldap.RES_SEARCH_RESULT:
+                                self.connection.abandon(response)
+                            return
+                        count += 1
                         if self.schema:
-                            ldap_entries.append(dict(dn=result[0], attrs=list(result[1].keys())))
+                            yield dict(dn=result[0], attrs=list(result[1].keys()))
                         else:
-                            ldap_entries.append(_extract_entry(result[0], result[1], self._base64_attributes))
+                            yield _extract_entry(result[0], result[1], self._base64_attributes)
                 cookies = [
                     c.cookie
                     for c in serverctrls
@@ -240,7 +349,7 @@ class LdapSearch(LdapGeneric):
                 if self.page_size > 0 and cookies and cookies[0]:
                     controls[0].cookie = cookies[0]
                 else:
-                    return ldap_entries
+                    return
         except ldap.NO_SUCH_OBJECT:
             self.module.fail_json(msg=f"Base not found: {self.dn}")
 
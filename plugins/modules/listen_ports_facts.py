@@ -11,10 +11,11 @@ module: listen_ports_facts
 author:
   - Nathan Davison (@ndavison)
 description:
-  - Gather facts on processes listening on TCP and UDP ports using the C(netstat) or C(ss) commands.
+  - Gather facts on processes listening on TCP and UDP ports by reading C(/proc), or by using the C(netstat) or C(ss)
+    commands.
   - This module currently supports Linux only.
 requirements:
-  - netstat or ss
+  - netstat or ss when C(/proc/net) is not available
 short_description: Gather facts on processes listening on TCP and UDP ports
 notes:
   - C(ss) returns all processes for each listen address and port.
@@ -30,10 +31,15 @@ options:
   command:
     description:
       - Override which command to use for fetching listen ports.
-      - By default module uses first found supported command on the system (in alphanumerical order).
+      - V(proc) reads the sockets from C(/proc/net/tcp), C(/proc/net/tcp6), C(/proc/net/udp), and C(/proc/net/udp6),
+        and maps them to processes through C(/proc/<pid>/fd) without running any command. This choice was added in
+        community.general 13.4.0.
+      - By default the module uses V(proc) if C(/proc/net) exists, and otherwise the first found supported command on
+        the system (in alphanumerical order).
     type: str
     choices:
       - netstat
+      - proc
       - ss
     version_added: 4.1.0
   include_non_listening:
@@ -192,11 +198,45 @@ ansible_facts:
           sample: "root"
 """
 
+import ipaddress
+import os
 import platform
+import pwd
 import re
+import struct
+import time
 
 from ansible.module_utils.basic import AnsibleModule
 
+PROC_PATH = "/proc"
+
+# Socket states from include/net/tcp_states.h
+PROC_TCP_STATES = {
+    "01": "ESTABLISHED",
+    "02": "SYN_SENT",
+    "03": "SYN_RECV",
+    "04": "FIN_WAIT1",
+    "05": "FIN_WAIT2",
+    "06": "TIME_WAIT",
+    "07": "CLOSE",
+    "08": "CLOSE_WAIT",
+    "09": "LAST_ACK",
+    "0A": "LISTEN",
+    "0B": "CLOSING",
+}
+PROC_UDP_STATES = {
+    "01": "ESTAB",
+    "07": "UNCONN",
+}
+PROC_LISTEN_STATES = {
+    "tcp": "0A",
+    "udp": "07",
+}
+
+# Same format as ps -o lstart, independent of the locale
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
 
 def split_pid_name(pid_name):
     """
@@ -335,6 +375,145 @@ def ss_parse(raw):
     return results
 
 
+def proc_decode_address(hex_address):
+    """
+    Decode an address from /proc/net/{tcp,tcp6,udp,udp6}.
+    The address is printed as 32 bit words in host byte order.
+    :param hex_address: Address and port in hex, e.g. 0100007F:0016
+    :return: The address (str) and the port (int)
+    """
+    hex_ip, hex_port = hex_address.split(":")
+    packed = b"".join(struct.pack("=I", int(hex_ip[i : i + 8], 16)) for i in range(0, len(hex_ip), 8))
+    address = ipaddress.ip_address(packed)
+    if getattr(address, "ipv4_mapped", None):
+        # the same notation as ss and netstat, whatever the Python version
+        return f"::ffff:{address.ipv4_mapped}", int(hex_port, 16)
+    return str(address), int(hex_port, 16)
+
+
+def proc_socket_pids(inodes, proc_path=PROC_PATH):
+    """
+    Map socket inodes to the processes holding them, by reading the /proc/<pid>/fd links.
+    :param inodes: Set of socket inodes to look for.
+    :param proc_path: Path of the proc filesystem.
+    :return: Dict mapping each found inode to a list of (pid, name) tuples.
+    """
+    links = {f"socket:[{inode}]": inode for inode in inodes}
+    result = {}
+    for pid in os.listdir(proc_path):
+        if not pid.isdigit():
+            continue
+        fd_path = os.path.join(proc_path, pid, "fd")
+        try:
+            fds = os.listdir(fd_path)
+        except OSError:
+            # process is gone, or it belongs to another user
+            continue
+        found = set()
+        for fd in fds:
+            try:
+                inode = links.get(os.readlink(os.path.join(fd_path, fd)))
+            except OSError:
+                continue
+            if inode is not None:
+                found.add(inode)
+        if not found:
+            continue
+        try:
+            with open(os.path.join(proc_path, pid, "comm")) as f:
+                name = f.read().rstrip("\n")
+        except OSError:
+            name = ""
+        for inode in found:
+            result.setdefault(inode, []).append((int(pid), name))
+    return result
+
+
+def proc_net_parse(include_non_listening=False, proc_path=PROC_PATH):
+    """
+    Read the sockets from /proc/net/{tcp,tcp6,udp,udp6} and map them to processes.
+    :param include_non_listening: Whether to return non-listening sockets as well.
+    :param proc_path: Path of the proc filesystem.
+    :return: List of dicts, each dict contains protocol, state, local address, foreign address, port, name, pid for one
+     connection.
+    """
+    sockets = []
+    for protocol in ("tcp", "udp"):
+        states = PROC_TCP_STATES if protocol == "tcp" else PROC_UDP_STATES
+        for table in (protocol, f"{protocol}6"):
+            try:
+                with open(os.path.join(proc_path, "net", table)) as f:
+                    lines = f.read().splitlines()[1:]
+            except FileNotFoundError:
+                # e.g. IPv6 is disabled
+                continue
+            for line in lines:
+                fields = line.split()
+                if len(fields) < 10:
+                    continue
+                state = fields[3]
+                if not include_non_listening and state != PROC_LISTEN_STATES[protocol]:
+                    continue
+                address, port = proc_decode_address(fields[1])
+                foreign_address, foreign_port = proc_decode_address(fields[2])
+                sockets.append(
+                    {
+                        "protocol": protocol,
+                        "state": states.get(state, state),
+                        "address": address,
+                        "foreign_address": f"{foreign_address}:{foreign_port or '*'}",
+                        "port": port,
+                        "inode": int(fields[9]),
+                    }
+                )
+
+    pids = proc_socket_pids({sock["inode"] for sock in sockets if sock["inode"]}, proc_path=proc_path)
+    results = []
+    for sock in sockets:
+        inode = sock.pop("inode")
+        # likely unprivileged user, so add empty name & pid
+        # as we do in netstat logic to be consistent with output
+        for pid, name in pids.get(inode) or [(0, "")]:
+            result = dict(sock, name=name, pid=pid)
+            if result not in results:
+                results.append(result)
+    return results
+
+
+def proc_pid_stime(pid, proc_path=PROC_PATH):
+    """
+    Get the start time of a process from /proc/<pid>/stat, formatted like ps -o lstart.
+    :return: The start time (str), or None if it cannot be read.
+    """
+    try:
+        with open(os.path.join(proc_path, str(pid), "stat")) as f:
+            # the process name is in parentheses and can contain spaces
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(os.path.join(proc_path, "stat")) as f:
+            btime = next(int(line.split()[1]) for line in f if line.startswith("btime "))
+    except (OSError, IndexError, StopIteration, ValueError):
+        return None
+    # starttime is field 22 of /proc/<pid>/stat, the list starts with field 3
+    lt = time.localtime(btime + int(fields[19]) // os.sysconf("SC_CLK_TCK"))
+    return f"{WEEKDAYS[lt.tm_wday]} {MONTHS[lt.tm_mon - 1]} {lt.tm_mday:2d} {lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d} {lt.tm_year}"
+
+
+def proc_pid_user(pid, proc_path=PROC_PATH):
+    """
+    Get the effective user of a process from /proc/<pid>/status.
+    :return: The user name (str), or None if it cannot be read.
+    """
+    try:
+        with open(os.path.join(proc_path, str(pid), "status")) as f:
+            uid = next(int(line.split()[2]) for line in f if line.startswith("Uid:"))
+    except (OSError, IndexError, StopIteration, ValueError):
+        return None
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
 def main():
     command_args = ["-p", "-l", "-u", "-n", "-t"]
     commands_map = {
@@ -343,7 +522,7 @@ def main():
     }
     module = AnsibleModule(
         argument_spec=dict(
-            command=dict(type="str", choices=list(sorted(commands_map))),
+            command=dict(type="str", choices=list(sorted(commands_map)) + ["proc"]),
             include_non_listening=dict(default=False, type="bool"),
         ),
         supports_check_mode=True,
@@ -360,6 +539,10 @@ def main():
         module.fail_json(msg="This module requires Linux.")
 
     def getPidSTime(pid):
+        if pid:
+            stime = proc_pid_stime(pid)
+            if stime is not None:
+                return stime
         ps_cmd = module.get_bin_path("ps", True)
         rc, ps_output, stderr = module.run_command([ps_cmd, "-o", "lstart", "-p", str(pid)])
         stime = ""
@@ -370,6 +553,10 @@ def main():
         return stime
 
     def getPidUser(pid):
+        if pid:
+            user = proc_pid_user(pid)
+            if user is not None:
+                return user
         ps_cmd = module.get_bin_path("ps", True)
         rc, ps_output, stderr = module.run_command([ps_cmd, "-o", "user", "-p", str(pid)])
         user = ""
@@ -379,6 +566,8 @@ def main():
                     user = line
         return user
 
+    pid_info = {}
+
     result = {
         "changed": False,
         "ansible_facts": {
@@ -392,7 +581,10 @@ def main():
         bin_path = None
         if module.params["command"] is not None:
             command = module.params["command"]
-            bin_path = module.get_bin_path(command, required=True)
+            if command != "proc":
+                bin_path = module.get_bin_path(command, required=True)
+        elif os.path.isdir(os.path.join(PROC_PATH, "net")):
+            command = "proc"
         else:
             for c in sorted(commands_map):
                 bin_path = module.get_bin_path(c, required=False)
@@ -400,23 +592,30 @@ def main():
                     command = c
                     break
 
-        if bin_path is None:
+        if command is None:
             raise OSError(f"Unable to find any of the supported commands in PATH: {', '.join(sorted(commands_map))}")
 
         # which ports are listening for connections?
-        args = commands_map[command]["args"]
-        rc, stdout, stderr = module.run_command([bin_path] + args)
-        if rc == 0:
-            parse_func = commands_map[command]["parse_func"]
-            results = parse_func(stdout)
+        results = None
+        if command == "proc":
+            results = proc_net_parse(include_non_listening=module.params["include_non_listening"])
+        else:
+            args = commands_map[command]["args"]
+            rc, stdout, stderr = module.run_command([bin_path] + args)
+            if rc == 0:
+                parse_func = commands_map[command]["parse_func"]
+                results = parse_func(stdout)
 
+        if results is not None:
             for connection in results:
                 # only display state and foreign_address for include_non_listening.
                 if not module.params["include_non_listening"]:
                     connection.pop("state", None)
                     connection.pop("foreign_address", None)
-                connection["stime"] = getPidSTime(connection["pid"])
-                connection["user"] = getPidUser(connection["pid"])
+                pid = connection["pid"]
+                if pid not in pid_info:
+                    pid_info[pid] = (getPidSTime(pid), getPidUser(pid))
+                connection["stime"], connection["user"] = pid_info[pid]
                 if connection["protocol"].startswith("tcp"):
                     result["ansible_facts"]["tcp_listen"].append(connection)
                 elif connection["protocol"].startswith("udp"):
@@ -902,6 +902,16 @@ options:
     type: bool
     default: false
     version_added: 3.6.0
+  properties_cache:
+    description:
+      - Cache the properties supported by nmcli for the settings validated for O(wifi) and O(wifi_sec), instead of querying
+        them with an interactive C(nmcli con edit) session on every run.
+      - The cache is stored in the C(nmcli_properties.json) file in the remote temporary directory of the target, which is
+        the parent directory of the temporary directory of the module. It is keyed by the connection type, the setting,
+        and the nmcli binary, so it is refreshed when nmcli is upgraded.
+    type: bool
+    default: false
+    version_added: 13.4.0
   gsm:
     description:
       - The configuration of the GSM connection.
@@ -1714,7 +1724,10 @@ EXAMPLES = r"""
 RETURN = r"""#
 """
 
+import json
+import os
 import re
+import tempfile
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.locale import get_best_parsable_locale
@@ -1755,6 +1768,7 @@ class Nmcli:
         self.module = module
         self.state = module.params["state"]
         self.ignore_unsupported_suboptions = module.params["ignore_unsupported_suboptions"]
+        self.properties_cache = module.params["properties_cache"]
         self.autoconnect = module.params["autoconnect"]
         self.autoconnect_priority = module.params["autoconnect_priority"]
         self.autoconnect_retries = module.params["autoconnect_retries"]
@@ -1866,6 +1880,7 @@ class Nmcli:
             self.table = module.params["table"]
 
         self.edit_commands = []
+        self._connections = None
 
         self.extra_options_validation()
 
@@ -2416,12 +2431,44 @@ class Nmcli:
             routes_params.append(route_params)
         return [self.route_to_string(route_params) for route_params in routes_params]
 
+    @staticmethod
+    def split_terse_line(line):
+        """Split a line of nmcli --terse output, where ":" and "\\" in values are escaped with "\\"."""
+        fields = [""]
+        escaped = False
+        for char in line:
+            if escaped:
+                fields[-1] += char
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == ":":
+                fields.append("")
+            else:
+                fields[-1] += char
+        return fields
+
     def list_connection_info(self):
-        cmd = [self.nmcli_bin, "--fields", "name", "--terse", "--escape", "no", "con", "show"]
-        (rc, out, err) = self.execute_command(cmd)
-        if rc != 0:
-            raise NmcliModuleError(err)
-        return out.splitlines()
+        return [connection["name"] for connection in self.list_connections()]
+
+    def list_connections(self):
+        """Return all connections as a list of dicts with name, uuid, type, and state.
+
+        The list is read with a single nmcli call and kept for the rest of the run, until a connection is created or removed.
+        """
+        if self._connections is None:
+            cmd = [self.nmcli_bin, "--terse", "--fields", "NAME,UUID,TYPE,STATE", "con", "show"]
+            (rc, out, err) = self.execute_command(cmd)
+            if rc != 0:
+                raise NmcliModuleError(err)
+            self._connections = []
+            for line in out.splitlines():
+                fields = self.split_terse_line(line)
+                if len(fields) != 4:
+                    continue
+                name, uuid, conn_type, state = fields
+                self._connections.append(dict(name=name, uuid=uuid, type=conn_type, state=state or None))
+        return self._connections
 
     def connection_exists(self):
         return self.conn_name in self.list_connection_info()
@@ -2432,13 +2479,10 @@ class Nmcli:
 
     def get_connection_state(self):
         """Get the current state of the connection"""
-        cmd = [self.nmcli_bin, "--terse", "--escape", "no", "--fields", "GENERAL.STATE", "con", "show", self.conn_name]
-        (rc, out, err) = self.execute_command(cmd)
-        if rc != 0:
-            raise NmcliModuleError(err)
-
-        lines = [ll.strip() for ll in out.splitlines() if "GENERAL.STATE" in ll]
-        return lines[0].split(":")[1] if lines else None
+        for connection in self.list_connections():
+            if connection["name"] == self.conn_name:
+                return connection["state"]
+        return None
 
     def is_connection_active(self):
         """Check if the connection is currently active"""
@@ -2497,6 +2541,7 @@ class Nmcli:
         return self.execute_command(cmd)
 
     def create_connection(self):
+        self._connections = None
         status = self.connection_update("create")
         if status[0] == 0 and self.edit_commands:
             status = self.edit_connection()
@@ -2516,6 +2561,7 @@ class Nmcli:
 
     def remove_connection(self):
         # self.down_connection()
+        self._connections = None
         cmd = [self.nmcli_bin, "con", "del", self.conn_name]
         return self.execute_command(cmd)
 
@@ -2574,7 +2620,52 @@ class Nmcli:
 
         return conn_info
 
+    def _properties_cache_path(self):
+        return os.path.join(os.path.dirname(self.module.tmpdir), "nmcli_properties.json")
+
+    def _properties_cache_key(self, setting):
+        """Identify nmcli by its binary, so the cache is refreshed when it is upgraded, without running it."""
+        try:
+            st = os.stat(self.nmcli_bin)
+        except OSError:
+            return None
+        return f"{os.path.realpath(self.nmcli_bin)}:{st.st_size}:{st.st_mtime_ns}:{self.type}:{setting}"
+
+    def _read_properties_cache(self):
+        try:
+            with open(self._properties_cache_path()) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _write_properties_cache(self, cache):
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.module.tmpdir)
+            with os.fdopen(fd, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self._properties_cache_path())
+        except OSError as e:
+            self.module.warn(f"Unable to write the nmcli properties cache: {e}")
+
     def get_supported_properties(self, setting):
+        cache_key = self._properties_cache_key(setting) if self.properties_cache else None
+        if cache_key is not None:
+            cache = self._read_properties_cache()
+            if isinstance(cache.get(cache_key), list):
+                return cache[cache_key]
+
+        properties = self._query_supported_properties(setting)
+
+        if cache_key is not None:
+            # Entries of older nmcli binaries are dropped
+            prefix = cache_key.split(":", 3)[:3]
+            cache = {key: value for key, value in cache.items() if key.split(":", 3)[:3] == prefix}
+            cache[cache_key] = properties
+            self._write_properties_cache(cache)
+        return properties
+
+    def _query_supported_properties(self, setting):
         properties = []
 
         if setting == "802-11-wireless-security":
@@ -2737,6 +2828,7 @@ def create_module() -> AnsibleModule:
     module = AnsibleModule(
         argument_spec=dict(
             ignore_unsupported_suboptions=dict(type="bool", default=False),
+            properties_cache=dict(type="bool", default=False),
             autoconnect=dict(type="bool", default=True),
             autoconnect_priority=dict(type="int"),
             autoconnect_retries=dict(type="int"),
@@ -1215,13 +1215,11 @@ def generate_next_index(vm_filled_indexes_list, num_sign_cnt):
     return cnt_str
 
 
-def get_vm_labels_and_attributes_dict(client, vm_id):
-    vm_USER_TEMPLATE = client.vm.info(vm_id).USER_TEMPLATE
-
+def _parse_labels_and_attributes(user_template):
     attrs_dict = {}
     labels_list = []
 
-    for key, value in vm_USER_TEMPLATE.items():
+    for key, value in (user_template or {}).items():
         if key != "LABELS":
             attrs_dict[key] = value
         else:
@@ -1231,52 +1229,53 @@ def get_vm_labels_and_attributes_dict(client, vm_id):
     return labels_list, attrs_dict
 
 
-def get_all_vms_by_attributes(client, attributes_dict, labels_list):
-    pool = client.vmpool.info(-2, -1, -1, -1).VM
-    vm_list = []
+def get_vm_labels_and_attributes_dict(client, vm_id):
+    return _parse_labels_and_attributes(client.vm.info(vm_id).USER_TEMPLATE)
+
+
+def get_vm_pool_index(client):
+    """Return (vm, labels set, attributes dict) for every VM visible to the user.
+
+    The extended pool info includes the USER_TEMPLATE of each VM, so the whole
+    index is built from a single XML-RPC call instead of one vm.info per VM.
+    """
+    index = []
+    for vm in client.vmpool.infoextended(-2, -1, -1, -1).VM:
+        labels, attributes = _parse_labels_and_attributes(vm.USER_TEMPLATE)
+        index.append((vm, frozenset(labels), attributes))
+    return index
+
+
+def _vm_name_matches(vm_name, name, base_name, with_hash):
+    if with_hash:
+        # If the name has indexed format and after base_name it has only digits it'll be matched
+        return vm_name.startswith(base_name) and vm_name[len(base_name) :].isdigit()
+    # If the name is not indexed it has to be same
+    return vm_name == name
+
+
+def get_all_vms_by_attributes(client, attributes_dict, labels_list, pool_index=None):
+    if pool_index is None:
+        pool_index = get_vm_pool_index(client)
+
     name = ""
     if attributes_dict:
         name = attributes_dict.pop("NAME", "")
+    attributes = list((attributes_dict or {}).items())
+    base_name = name[: len(name) - name.count("#")]
+    # Check does the name have indexed format
+    with_hash = name.endswith("#")
+    required_labels = frozenset(labels_list or ())
 
-    if name != "":
-        base_name = name[: len(name) - name.count("#")]
-        # Check does the name have indexed format
-        with_hash = name.endswith("#")
-
-        for vm in pool:
-            if vm.NAME.startswith(base_name):
-                if with_hash and vm.NAME[len(base_name) :].isdigit():
-                    # If the name has indexed format and after base_name it has only digits it'll be matched
-                    vm_list.append(vm)
-                elif not with_hash and name == vm.NAME:
-                    # If the name is not indexed it has to be same
-                    vm_list.append(vm)
-        pool = vm_list
-
-    vm_list = copy.copy(pool)
-
-    for vm in pool:
-        remove_list = []
-        vm_labels_list, vm_attributes_dict = get_vm_labels_and_attributes_dict(client, vm.ID)
-
-        if attributes_dict and len(attributes_dict) > 0:
-            for key, val in attributes_dict.items():
-                if key in vm_attributes_dict:
-                    if val and vm_attributes_dict[key] != val:
-                        remove_list.append(vm)
-                        break
-                else:
-                    remove_list.append(vm)
-                    break
-        vm_list = list(set(vm_list).difference(set(remove_list)))
-
-        remove_list = []
-        if labels_list and len(labels_list) > 0:
-            for label in labels_list:
-                if label not in vm_labels_list:
-                    remove_list.append(vm)
-                    break
-        vm_list = list(set(vm_list).difference(set(remove_list)))
+    vm_list = []
+    for vm, vm_labels, vm_attributes in pool_index:
+        if name and not _vm_name_matches(vm.NAME, name, base_name, with_hash):
+            continue
+        if not required_labels <= vm_labels:
+            continue
+        if any(key not in vm_attributes or (val and vm_attributes[key] != val) for key, val in attributes):
+            continue
+        vm_list.append(vm)
 
     return vm_list
 
@@ -1295,6 +1294,7 @@ def create_count_of_vms(
     vm_start_on_hold,
     vm_persistent,
     updateconf_dict,
+    pool_index=None,
 ):
     new_vms_list = []
 
@@ -1309,7 +1309,7 @@ def create_count_of_vms(
     vm_filled_indexes_list = None
     num_sign_cnt = vm_name.count("#")
     if vm_name != "" and num_sign_cnt > 0:
-        vm_list = get_all_vms_by_attributes(client, {"NAME": vm_name}, None)
+        vm_list = get_all_vms_by_attributes(client, {"NAME": vm_name}, None, pool_index)
         base_name = vm_name[: len(vm_name) - num_sign_cnt]
         vm_name = base_name
         # Make list which contains used indexes in format ['000', '001',...]
@@ -1343,12 +1343,10 @@ def create_count_of_vms(
 
     if vm_start_on_hold:
         if wait:
-            for vm in new_vms_list:
-                wait_for_hold(module, client, vm, wait_timeout)
+            wait_for_hold(module, client, new_vms_list, wait_timeout)
     else:
         if wait:
-            for vm in new_vms_list:
-                wait_for_running(module, client, vm, wait_timeout)
+            wait_for_running(module, client, new_vms_list, wait_timeout)
 
     return True, new_vms_list, []
 
@@ -1371,7 +1369,9 @@ def create_exact_count_of_vms(
     vm_persistent,
     updateconf_dict,
 ):
-    vm_list = get_all_vms_by_attributes(client, count_attributes_dict, count_labels_list)
+    # The pool is listed once and reused to find the indexes taken by the VMs to create
+    pool_index = get_vm_pool_index(client)
+    vm_list = get_all_vms_by_attributes(client, count_attributes_dict, count_labels_list, pool_index)
 
     vm_count_diff = exact_count - len(vm_list)
     changed = vm_count_diff != 0
@@ -1398,6 +1398,7 @@ def create_exact_count_of_vms(
             vm_start_on_hold,
             vm_persistent,
             updateconf_dict,
+            pool_index,
         )
 
         tagged_instances_list += instances_list
@@ -1412,8 +1413,7 @@ def create_exact_count_of_vms(
             vm_count_diff += 1
 
         if wait:
-            for vm in old_vms_list:
-                wait_for_done(module, client, vm, wait_timeout)
+            wait_for_done(module, client, old_vms_list, wait_timeout)
 
         instances_list = old_vms_list
         # store only the remaining instances
@@ -1471,52 +1471,109 @@ LCM_STATES = [
 ]
 
 
-def wait_for_state(module, client, vm, wait_timeout, state_predicate):
-    start_time = time.time()
+# Polling interval bounds in seconds while waiting for VM states
+WAIT_INTERVAL_MIN = 1
+WAIT_INTERVAL_MAX = 5
 
-    while (time.time() - start_time) < wait_timeout:
-        vm = client.vm.info(vm.ID)
-        state = vm.STATE
-        lcm_state = vm.LCM_STATE
+# Largest gap between the IDs of VMs waited for with the same VM pool query
+WAIT_ID_GAP = 16
 
-        if state_predicate(state, lcm_state):
-            return vm
-        elif state not in [
-            VM_STATES.index("INIT"),
-            VM_STATES.index("PENDING"),
-            VM_STATES.index("HOLD"),
-            VM_STATES.index("ACTIVE"),
-            VM_STATES.index("CLONING"),
-            VM_STATES.index("POWEROFF"),
-        ]:
-            module.fail_json(msg=f"Action is unsuccessful. VM state: {VM_STATES[state]}")
+# States a VM can pass through before it reaches the one waited for
+WAIT_STATES = frozenset(
+    VM_STATES.index(state) for state in ("INIT", "PENDING", "HOLD", "ACTIVE", "CLONING", "POWEROFF")
+)
 
-        time.sleep(1)
 
-    module.fail_json(msg="Wait timeout has expired!")
+def _vm_id_ranges(vm_ids, max_gap=WAIT_ID_GAP):
+    """Split VM IDs into (start, end) ranges, so that no range spans a gap larger than max_gap."""
+    ranges = []
+    for vm_id in sorted(vm_ids):
+        if ranges and vm_id - ranges[-1][1] <= max_gap:
+            ranges[-1][1] = vm_id
+        else:
+            ranges.append([vm_id, vm_id])
+    return [tuple(id_range) for id_range in ranges]
+
 
+def wait_for_vms_state(module, client, vms, wait_timeout, state_predicate, include_done=False):
+    """Wait until every VM satisfies state_predicate and return their latest info.
 
-def wait_for_running(module, client, vm, wait_timeout):
-    return wait_for_state(
+    The pending VMs are read with one VM pool query per range of close IDs and
+    interval, and the interval doubles up to WAIT_INTERVAL_MAX, so the wait
+    lasts as long as the slowest VM instead of the sum of all VMs. VMs in the
+    DONE state are only listed when include_done is set, since OpenNebula
+    keeps all of them until they are purged.
+    """
+    result = list(vms)
+    pending = {}
+    for index, vm in enumerate(vms):
+        pending.setdefault(vm.ID, []).append(index)
+
+    # State -2 includes VMs in the DONE state, -1 is any other state
+    state_filter = -2 if include_done else -1
+    deadline = time.time() + wait_timeout
+    interval = WAIT_INTERVAL_MIN
+    while pending and time.time() < deadline:
+        found = set()
+        for start_id, end_id in _vm_id_ranges(pending):
+            # Filter -2 lists the VMs of all users
+            for vm in client.vmpool.info(-2, start_id, end_id, state_filter).VM:
+                if vm.ID not in pending:
+                    continue
+                found.add(vm.ID)
+                if state_predicate(vm.STATE, vm.LCM_STATE):
+                    for index in pending.pop(vm.ID):
+                        result[index] = vm
+                elif vm.STATE not in WAIT_STATES:
+                    module.fail_json(msg=f"Action is unsuccessful. VM state: {VM_STATES[vm.STATE]}")
+
+        missing = set(pending) - found
+        if missing:
+            vm_id = min(missing)
+            if include_done:
+                module.fail_json(msg=f"Action is unsuccessful. There is no VM with id={vm_id}")
+            module.fail_json(msg=f"Action is unsuccessful. There is no VM with id={vm_id}, or it is in the DONE state")
+
+        if pending:
+            time.sleep(max(0, min(interval, deadline - time.time())))
+            interval = min(interval * 2, WAIT_INTERVAL_MAX)
+
+    if pending:
+        module.fail_json(msg="Wait timeout has expired!")
+
+    return result
+
+
+def wait_for_running(module, client, vms, wait_timeout):
+    return wait_for_vms_state(
         module,
         client,
-        vm,
+        vms,
         wait_timeout,
         lambda state, lcm_state: state in [VM_STATES.index("ACTIVE")] and lcm_state in [LCM_STATES.index("RUNNING")],
     )
 
 
-def wait_for_done(module, client, vm, wait_timeout):
-    return wait_for_state(module, client, vm, wait_timeout, lambda state, lcm_state: state in [VM_STATES.index("DONE")])
+def wait_for_done(module, client, vms, wait_timeout):
+    return wait_for_vms_state(
+        module,
+        client,
+        vms,
+        wait_timeout,
+        lambda state, lcm_state: state in [VM_STATES.index("DONE")],
+        include_done=True,
+    )
 
 
-def wait_for_hold(module, client, vm, wait_timeout):
-    return wait_for_state(module, client, vm, wait_timeout, lambda state, lcm_state: state in [VM_STATES.index("HOLD")])
+def wait_for_hold(module, client, vms, wait_timeout):
+    return wait_for_vms_state(
+        module, client, vms, wait_timeout, lambda state, lcm_state: state in [VM_STATES.index("HOLD")]
+    )
 
 
-def wait_for_poweroff(module, client, vm, wait_timeout):
-    return wait_for_state(
-        module, client, vm, wait_timeout, lambda state, lcm_state: state in [VM_STATES.index("POWEROFF")]
+def wait_for_poweroff(module, client, vms, wait_timeout):
+    return wait_for_vms_state(
+        module, client, vms, wait_timeout, lambda state, lcm_state: state in [VM_STATES.index("POWEROFF")]
     )
 
 
@@ -1587,8 +1644,7 @@ def reboot_vms(module, client, vms, wait_timeout, hard):
                 poweroff_vm(module, client, vm, hard)
 
         # Wait for all to be power-off
-        for vm in vms:
-            wait_for_poweroff(module, client, vm, wait_timeout)
+        wait_for_poweroff(module, client, vms, wait_timeout)
 
         for vm in vms:
             resume_vm(module, client, vm)
@@ -1714,7 +1770,7 @@ def disk_save_as(module, client, vm, disk_saveas, wait_timeout):
             client.vm.disksaveas(vm.ID, disk_id, image_name, "OS", -1)
         except pyone.OneException as e:
             module.fail_json(msg=str(e))
-        wait_for_poweroff(module, client, vm, wait_timeout)  # wait for VM to leave the hotplug_saveas_poweroff state
+        wait_for_poweroff(module, client, [vm], wait_timeout)  # wait for VM to leave the hotplug_saveas_poweroff state
 
 
 def get_connection_info(module):
@@ -2045,9 +2101,7 @@ def main():
             "poweredoff": wait_for_poweroff,
             "running": wait_for_running,
         }
-        for vm in vms:
-            if vm is not None:
-                wait_for[state](module, one_client, vm, wait_timeout)
+        wait_for[state](module, one_client, [vm for vm in vms if vm is not None], wait_timeout)
 
     if disk_saveas is not None:
         if len(vms) == 0:
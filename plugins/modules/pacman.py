@@ -139,6 +139,20 @@ options:
     type: str
     version_added: 5.4.0
 
+  inventory_source:
+    description:
+      - How to gather the installed and available packages and groups before acting on O(name) or O(upgrade).
+      - V(pacman) runs several C(pacman --query) and C(pacman --sync) commands.
+      - V(database) reads the local package database and the sync databases of the repositories configured in the pacman
+        configuration file directly. Packages given as V(repository/package) or as a name provided by another package are then
+        resolved without running pacman. The list of upgradable packages is only queried from pacman when O(state=latest) or O(upgrade=true).
+      - If a sync database cannot be read, for example because it uses a compression not supported by Python, the module falls
+        back to V(pacman) for the available packages and groups.
+    default: pacman
+    choices: [database, pacman]
+    type: str
+    version_added: 13.4.0
+
 notes:
   - When used with a C(loop:) each package is processed individually, it is much more efficient to pass the list directly
     to the O(name) option.
@@ -271,15 +285,114 @@ EXAMPLES = r"""
     cachedir: /mnt/var/cache/pacman/pkg
     config: /path/to/another/pacman.conf
     update_cache: true
+
+- name: Install packages, reading the package databases directly
+  community.general.pacman:
+    name:
+      - foo
+      - extra/bar
+    state: present
+    inventory_source: database
 """
 
+import os
 import re
 import shlex
+import tarfile
 from collections import defaultdict
 from dataclasses import dataclass
 
 from ansible.module_utils.basic import AnsibleModule
 
+DEFAULT_CONFIG = "/etc/pacman.conf"
+DEFAULT_DBPATH = "var/lib/pacman"
+
+
+def parse_desc(content):
+    """Parses the content of a desc file from the pacman databases
+
+    Returns a dict {FIELD: [values]}, for example {"NAME": ["pacman"], "GROUPS": ["base-devel"]}
+    """
+    fields = {}
+    values = None
+    for line in content.splitlines():
+        if line.startswith("%") and line.endswith("%") and len(line) > 2:
+            values = fields.setdefault(line[1:-1], [])
+        elif line and values is not None:
+            values.append(line)
+        else:
+            values = None
+    return fields
+
+
+def _load_local_desc(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        desc = parse_desc(f.read())
+    return dict(
+        name=desc["NAME"][0],
+        version=desc["VERSION"][0],
+        groups=desc.get("GROUPS", []),
+        reason="dependency" if desc.get("REASON") == ["1"] else "explicit",
+    )
+
+
+def _load_sync_db(path):
+    pkgs = {}
+    with tarfile.open(path) as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            entry, dummy, filename = member.name.rpartition("/")
+            if filename not in ("desc", "depends"):
+                continue
+            pkgs.setdefault(entry, {}).update(parse_desc(tar.extractfile(member).read().decode("utf-8", "replace")))
+    return [
+        dict(
+            name=desc["NAME"][0],
+            version=desc["VERSION"][0],
+            groups=desc.get("GROUPS", []),
+            # Strip version constraints: "sh=5.1" provides "sh"
+            provides=[re.split(r"[<>=]", provide, maxsplit=1)[0] for provide in desc.get("PROVIDES", [])],
+        )
+        for desc in pkgs.values()
+        if "NAME" in desc and "VERSION" in desc
+    ]
+
+
+def read_config(path):
+    """Reads the DBPath option and the list of repositories, in order, from a pacman configuration file"""
+    dbpath = None
+    repos = []
+    section = None
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line.startswith("[") and line.endswith("]"):
+                section = line[1:-1]
+                if section != "options" and section not in repos:
+                    repos.append(section)
+            elif section == "options" and "=" in line:
+                key, value = (part.strip() for part in line.split("=", 1))
+                if key == "DBPath":
+                    dbpath = value
+    return dbpath, repos
+
+
+def read_local_database(dbpath):
+    """Returns the installed packages as a list of dicts with name, version, groups, and reason"""
+    local = os.path.join(dbpath, "local")
+    pkgs = []
+    for entry in sorted(os.listdir(local)):
+        desc = os.path.join(local, entry, "desc")
+        if os.path.isfile(desc):
+            pkgs.append(_load_local_desc(desc))
+    return pkgs
+
+
+def read_sync_database(dbpath, repo):
+    """Returns the packages available in repo as a list of dicts with name, version, groups, and provides"""
+    return _load_sync_db(os.path.join(dbpath, "sync", f"{repo}.db"))
+
 
 class Package:
     def __init__(self, name, source, source_is_URL=False):
@@ -327,6 +440,7 @@ class Pacman:
                 self.pacman_cmd += ["--cachedir", p["cachedir"]]
 
         self._cached_database = None
+        self._sync_index = None
 
         # Normalize for old configs
         if p["state"] == "installed":
@@ -615,6 +729,13 @@ class Pacman:
     def _list_database(self):
         """runs pacman --sync --list with some caching"""
         if self._cached_database is None:
+            if self.m.params["inventory_source"] == "database":
+                sync_dbs = self._read_sync_databases()
+                if sync_dbs is not None:
+                    self._cached_database = [
+                        f"{repo} {pkg['name']} {pkg['version']}" for repo, pkgs in sync_dbs for pkg in pkgs
+                    ]
+                    return self._cached_database
             dummy, packages, dummy = self.m.run_command(self.pacman_cmd + ["--sync", "--list"], check_rc=True)
             self._cached_database = packages.splitlines()
         return self._cached_database
@@ -674,7 +795,10 @@ class Pacman:
                 continue
 
             is_URL = False
-            if pkg in self.inventory["available_groups"]:
+            resolved = self._resolve_from_sync_index(pkg)
+            if resolved is not None:
+                pkg_list.append(Package(name=resolved, source=pkg))
+            elif pkg in self.inventory["available_groups"]:
                 # Expand group members
                 for group_member in self.inventory["available_groups"][pkg]:
                     pkg_list.append(Package(name=group_member, source=group_member))
@@ -713,6 +837,155 @@ class Pacman:
 
         return pkg_list
 
+    def _resolve_from_sync_index(self, pkg):
+        """Resolves <repo>/<pkgname> and provided names using the sync databases read for the inventory
+
+        Returns the package name, or None if pkg is a package or group name, or cannot be resolved this way
+        """
+        if self._sync_index is None or pkg in self.inventory["available_groups"]:
+            return None
+        if pkg in self.inventory["available_pkgs"] or pkg in self.inventory["installed_pkgs"]:
+            return None
+        repo, sep, name = pkg.partition("/")
+        if sep:
+            return name if name in self._sync_index["repos"].get(repo, ()) else None
+        return self._sync_index["provides"].get(pkg)
+
+    def _database_path(self):
+        """Returns the database directory and the list of configured repositories"""
+        p = self.m.params
+        try:
+            dbpath, repos = read_config(p["config"] or DEFAULT_CONFIG)
+        except OSError:
+            dbpath, repos = None, None
+        if dbpath is None:
+            dbpath = os.path.join(p["root"] or "/", DEFAULT_DBPATH)
+        if repos is None:
+            sync = os.path.join(dbpath, "sync")
+            repos = (
+                sorted(f[: -len(".db")] for f in os.listdir(sync) if f.endswith(".db")) if os.path.isdir(sync) else []
+            )
+        return dbpath, repos
+
+    def _read_sync_databases(self):
+        """Returns a list of (repo, packages) tuples in configuration order, or None if a database cannot be read"""
+        dbpath, repos = self._database_path()
+        sync_dbs = []
+        for repo in repos:
+            try:
+                sync_dbs.append((repo, read_sync_database(dbpath, repo)))
+            except FileNotFoundError:
+                # Configured, but never synced
+                continue
+            except (OSError, tarfile.TarError, KeyError, IndexError):
+                return None
+        return sync_dbs
+
+    def _query_upgradable(self):
+        """Runs pacman --query --upgrades
+
+        Returns a dict {pkgname: VersionTuple}
+        """
+        upgradable_pkgs = {}
+        rc, stdout, stderr = self.m.run_command(self.pacman_cmd + ["--query", "--upgrades"], check_rc=False)
+
+        stdout = stdout.splitlines()
+        if stdout and "Avoid running" in stdout[0]:
+            stdout = stdout[1:]
+        stdout = "\n".join(stdout)
+
+        # non-zero exit with nothing in stdout -> nothing to upgrade, all good
+        # stderr can have warnings, so not checked here
+        if rc == 1 and not stdout:
+            pass  # nothing to upgrade
+        elif rc == 0:
+            # Format of lines:
+            #     strace 5.14-1 -> 5.15-1
+            #     systemd 249.7-1 -> 249.7-2 [ignored]
+            for l in stdout.splitlines():
+                l = l.strip()
+                if not l:
+                    continue
+                if "[ignored]" in l or "Avoid running" in l:
+                    continue
+                s = l.split()
+                if len(s) != 4:
+                    self.fail(msg=f"Invalid line: {l}")
+
+                pkg = s[0]
+                current = s[1]
+                latest = s[3]
+                upgradable_pkgs[pkg] = VersionTuple(current=current, latest=latest)
+        else:
+            # stuff in stdout but rc!=0, abort
+            self.fail(
+                "Couldn't get list of packages available for upgrade",
+                stdout=stdout,
+                stderr=stderr,
+                rc=rc,
+            )
+        return upgradable_pkgs
+
+    def _build_inventory_from_database(self):
+        """Same as _build_inventory(), but reads the pacman databases instead of running pacman"""
+        dbpath = self._database_path()[0]
+        installed_pkgs = {}
+        installed_groups = defaultdict(set)
+        pkg_reasons = {}
+        try:
+            local_pkgs = read_local_database(dbpath)
+        except (OSError, KeyError, IndexError) as e:
+            self.fail(msg=f"Failed to read the local package database in {dbpath}: {e}")
+        for pkg in local_pkgs:
+            installed_pkgs[pkg["name"]] = pkg["version"]
+            pkg_reasons[pkg["name"]] = pkg["reason"]
+            for group in pkg["groups"]:
+                installed_groups[group].add(pkg["name"])
+
+        available_pkgs = {}
+        available_groups = defaultdict(set)
+        sync_dbs = self._read_sync_databases()
+        if sync_dbs is None:
+            # Fall back to pacman for the sync databases
+            for l in self._list_database():
+                l = l.strip()
+                if l:
+                    repo, pkg, ver = l.split()[:3]
+                    available_pkgs[pkg] = ver
+            dummy, stdout, dummy = self.m.run_command(
+                self.pacman_cmd + ["--sync", "--groups", "--groups"], check_rc=True
+            )
+            for l in stdout.splitlines():
+                s = l.split()
+                if len(s) == 2:
+                    available_groups[s[0]].add(s[1])
+        else:
+            self._sync_index = {"repos": {}, "provides": {}}
+            for repo, pkgs in sync_dbs:
+                names = self._sync_index["repos"][repo] = set()
+                for pkg in pkgs:
+                    names.add(pkg["name"])
+                    # Same as pacman --sync --list: the last repository wins
+                    available_pkgs[pkg["name"]] = pkg["version"]
+                    for group in pkg["groups"]:
+                        available_groups[group].add(pkg["name"])
+                    for provide in pkg["provides"]:
+                        # The first repository providing a name wins, like pacman does
+                        self._sync_index["provides"].setdefault(provide, pkg["name"])
+
+        upgradable_pkgs = {}
+        if self.target_state == "latest" or self.m.params["upgrade"]:
+            upgradable_pkgs = self._query_upgradable()
+
+        return dict(
+            installed_pkgs=installed_pkgs,
+            installed_groups=installed_groups,
+            available_pkgs=available_pkgs,
+            available_groups=available_groups,
+            upgradable_pkgs=upgradable_pkgs,
+            pkg_reasons=pkg_reasons,
+        )
+
     def _build_inventory(self):
         """Build a cache datastructure used for all pkg lookups
         Returns a dict:
@@ -727,6 +1000,8 @@ class Pacman:
 
         Fails the module if a package requested for install cannot be found
         """
+        if self.m.params["inventory_source"] == "database":
+            return self._build_inventory_from_database()
 
         installed_pkgs = {}
         dummy, stdout, dummy = self.m.run_command(self.pacman_cmd + ["--query"], check_rc=True)
@@ -778,44 +1053,7 @@ class Pacman:
             group, pkg = sync_groups_match.groups()
             available_groups[group].add(pkg)
 
-        upgradable_pkgs = {}
-        rc, stdout, stderr = self.m.run_command(self.pacman_cmd + ["--query", "--upgrades"], check_rc=False)
-
-        stdout = stdout.splitlines()
-        if stdout and "Avoid running" in stdout[0]:
-            stdout = stdout[1:]
-        stdout = "\n".join(stdout)
-
-        # non-zero exit with nothing in stdout -> nothing to upgrade, all good
-        # stderr can have warnings, so not checked here
-        if rc == 1 and not stdout:
-            pass  # nothing to upgrade
-        elif rc == 0:
-            # Format of lines:
-            #     strace 5.14-1 -> 5.15-1
-            #     systemd 249.7-1 -> 249.7-2 [ignored]
-            for l in stdout.splitlines():
-                l = l.strip()
-                if not l:
-                    continue
-                if "[ignored]" in l or "Avoid running" in l:
-                    continue
-                s = l.split()
-                if len(s) != 4:
-                    self.fail(msg=f"Invalid line: {l}")
-
-                pkg = s[0]
-                current = s[1]
-                latest = s[3]
-                upgradable_pkgs[pkg] = VersionTuple(current=current, latest=latest)
-        else:
-            # stuff in stdout but rc!=0, abort
-            self.fail(
-                "Couldn't get list of packages available for upgrade",
-                stdout=stdout,
-                stderr=stderr,
-                rc=rc,
-            )
+        upgradable_pkgs = self._query_upgradable()
 
         pkg_reasons = {}
         dummy, stdout, dummy = self.m.run_command(self.pacman_cmd + ["--query", "--explicit"], check_rc=True)
@@ -867,6 +1105,7 @@ def setup_module():
             update_cache_extra_args=dict(type="str", default=""),
             reason=dict(type="str", choices=["explicit", "dependency"]),
             reason_for=dict(type="str", default="new", choices=["new", "all"]),
+            inventory_source=dict(type="str", default="pacman", choices=["pacman", "database"]),
         ),
         required_one_of=[["name", "update_cache", "upgrade"]],
         mutually_exclusive=[["name", "upgrade"]],
@@ -66,6 +66,21 @@ options:
       - Handle to check the status of an update in progress.
     type: str
     version_added: '6.1.0'
+  max_concurrent_requests:
+    description:
+      - Maximum number of GET requests sent to the OOB controller at the same time when retrieving the members of a
+        collection, for example the drives of a storage subsystem.
+    type: int
+    default: 1
+    version_added: 13.4.0
+  expand_collections:
+    description:
+      - Retrieve the members of collections with a single C($expand) request when the service advertises support for it
+        in C(ProtocolFeaturesSupported.ExpandQuery).
+      - Falls back to retrieving every member when the service does not support this.
+    type: bool
+    default: false
+    version_added: 13.4.0
   ciphers:
     version_added: 9.2.0
   validate_certs:
@@ -469,6 +484,8 @@ def main():
         timeout=dict(type="int", default=60),
         update_handle=dict(),
         manager=dict(),
+        max_concurrent_requests=dict(type="int", default=1),
+        expand_collections=dict(type="bool", default=False),
     )
     argument_spec.update(REDFISH_COMMON_ARGUMENT_SPEC)
     module = AnsibleModule(
@@ -499,7 +516,16 @@ def main():
 
     # Build root URI
     root_uri = f"https://{module.params['baseuri']}"
-    rf_utils = RedfishUtils(creds, root_uri, timeout, module)
+    # Responses are cached for the whole run, since this module does not modify the service
+    rf_utils = RedfishUtils(
+        creds,
+        root_uri,
+        timeout,
+        module,
+        resource_cache=True,
+        max_concurrent_requests=module.params["max_concurrent_requests"],
+        expand_collections=module.params["expand_collections"],
+    )
 
     # Build Category list
     if "all" in module.params["category"]:
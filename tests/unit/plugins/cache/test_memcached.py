@@ -12,7 +12,162 @@ pytest.importorskip("memcache")
 from ansible.plugins.loader import cache_loader
 
 from ansible_collections.community.general.plugins.cache.memcached import CacheModule as MemcachedCache
+from ansible_collections.community.general.plugins.cache.memcached import CacheModuleKeys
 
 
 def test_memcached_cachemodule():
     assert isinstance(cache_loader.get("community.general.memcached"), MemcachedCache)
+
+
+class FakeClient:
+    """In-memory stand-in for memcache.Client, shared by all connections."""
+
+    data = {}
+    versions = {}
+    calls = []
+
+    def __init__(self, *args, **kwargs):
+        self.cas_ids = {}
+
+    def _store(self, key, value):
+        self.data[key] = value
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get(self, key):
+        self.calls.append("get")
+        return self.data.get(key)
+
+    def gets(self, key):
+        self.calls.append("gets")
+        if key in self.data:
+            self.cas_ids[key] = self.versions[key]
+        return self.data.get(key)
+
+    def get_multi(self, keys, key_prefix=""):
+        self.calls.append("get_multi")
+        return {key: self.data[key_prefix + key] for key in keys if key_prefix + key in self.data}
+
+    def set(self, key, value, time=0, min_compress_len=0):
+        self.calls.append("set")
+        self._store(key, value)
+        return True
+
+    def add(self, key, value):
+        self.calls.append("add")
+        if key in self.data:
+            return False
+        self._store(key, value)
+        return True
+
+    def cas(self, key, value):
+        self.calls.append("cas")
+        if self.versions.get(key) != self.cas_ids.pop(key, None):
+            return False
+        self._store(key, value)
+        return True
+
+    def delete(self, key):
+        self.calls.append("delete")
+        self.data.pop(key, None)
+
+    def delete_multi(self, keys, key_prefix=""):
+        self.calls.append("delete_multi")
+        for key in keys:
+            self.data.pop(key_prefix + key, None)
+
+
+@pytest.fixture
+def memcached(mocker):
+    mocker.patch.object(FakeClient, "data", {})
+    mocker.patch.object(FakeClient, "versions", {})
+    mocker.patch.object(FakeClient, "calls", [])
+    mocker.patch("ansible_collections.community.general.plugins.cache.memcached.memcache.Client", FakeClient)
+
+    def get_cache(**kwargs):
+        return cache_loader.get("community.general.memcached", **kwargs).__wrapped__
+
+    return get_cache
+
+
+def test_memcached_index_shards(memcached):
+    cache = memcached()
+    for i in range(100):
+        cache.set(f"host{i}", {"i": i})
+    shards = [key for key in FakeClient.data if key.startswith("ansible_cache_keys:")]
+    assert 1 < len(shards) <= CacheModuleKeys.SHARDS
+    assert sum(len(FakeClient.data[key]) for key in shards) == 100
+    assert sorted(cache.keys()) == sorted(f"host{i}" for i in range(100))
+
+    # A fresh instance reads every record with one get_multi
+    other = memcached()
+    FakeClient.calls.clear()
+    assert other.copy() == {f"host{i}": {"i": i} for i in range(100)}
+    assert FakeClient.calls == ["get_multi", "get_multi"]
+
+
+def test_memcached_concurrent_index_update(memcached, mocker):
+    first = memcached()
+    second = memcached()
+    first.set("host1", {"a": 1})
+
+    # Another writer updates the shard between gets and cas
+    original_gets = FakeClient.gets
+
+    def racing_gets(self, key):
+        value = original_gets(self, key)
+        if racing_gets.first_call:
+            racing_gets.first_call = False
+            second.set("host2", {"a": 2})
+        return value
+
+    racing_gets.first_call = True
+    mocker.patch.object(FakeClient, "gets", racing_gets)
+    mocker.patch.object(CacheModuleKeys, "_shard_key", lambda self, key: self._shard_keys[0])
+    first.set("host3", {"a": 3})
+    assert sorted(memcached().keys()) == ["host1", "host2", "host3"]
+
+
+def test_memcached_expiry_and_missing_records(memcached, mocker):
+    time = mocker.patch("ansible_collections.community.general.plugins.cache.memcached.time.time", return_value=1000.0)
+    cache = memcached(_timeout=100, _sweep_interval=60)
+    cache.set("old", {"a": 1})
+    time.return_value = 1050.0
+    cache.set("new", {"a": 2})
+    cache.set("evicted", {"a": 3})
+    del FakeClient.data["ansible_factsevicted"]
+
+    time.return_value = 1120.0
+    other = memcached(_timeout=100, _sweep_interval=60)
+    assert sorted(other.keys()) == ["evicted", "new"]
+    assert sorted(cache._keys.load()) == ["evicted", "new"]
+    assert not other.contains("evicted")
+    assert other.copy() == {"new": {"a": 2}}
+    assert list(cache._keys.load()) == ["new"]
+
+    # The next sweep only happens after the interval
+    time.return_value = 1160.0
+    assert other.keys() == []
+    assert list(cache._keys.load()) == ["new"]
+
+
+def test_memcached_prefetch_and_flush(memcached):
+    cache = memcached()
+    for i in range(3):
+        cache.set(f"host{i}", {"i": i})
+
+    other = memcached(_prefetch=True)
+    FakeClient.calls.clear()
+    assert [other.get(f"host{i}") for i in range(3)] == [{"i": 0}, {"i": 1}, {"i": 2}]
+    assert FakeClient.calls == ["get_multi", "get_multi"]
+    with pytest.raises(KeyError):
+        other.get("host3")
+
+    other.flush()
+    assert memcached().keys() == []
+    assert FakeClient.data == {}
+
+
+def test_memcached_long_timeout(memcached, mocker):
+    mocker.patch("ansible_collections.community.general.plugins.cache.memcached.time.time", return_value=1000.0)
+    assert memcached(_timeout=3600)._expiration() == 3600
+    assert memcached(_timeout=90 * 86400)._expiration() == 1000 + 90 * 86400
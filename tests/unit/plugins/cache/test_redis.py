@@ -5,12 +5,15 @@
 # Make coding more python3-ish
 from __future__ import annotations
 
+import json
+
 import pytest
 
 pytest.importorskip("redis")
 
 from ansible.plugins.loader import cache_loader
 
+from ansible_collections.community.general.plugins.cache.redis import HAS_MSGPACK
 from ansible_collections.community.general.plugins.cache.redis import CacheModule as RedisCache
 
 
@@ -24,3 +27,171 @@ def test_redis_cachemodule_2():
     # The _uri option is required for the redis plugin
     connection = "[::1]:6379:1"
     assert isinstance(cache_loader.get("community.general.redis", **{"_uri": connection}), RedisCache)
+
+
+class FakeRedis:
+    """In-memory stand-in for StrictRedis counting round-trips."""
+
+    def __init__(self, *args, **kwargs):
+        self.data = {}
+        self.zsets = {}
+        self.round_trips = 0
+
+    def _call(self, name, *args):
+        self.round_trips += 1
+        return getattr(self, f"_{name}")(*args)
+
+    def __getattr__(self, name):
+        if hasattr(type(self), f"_{name}"):
+            return lambda *args: self._call(name, *args)
+        raise AttributeError(name)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def _get(self, key):
+        return self.data.get(key)
+
+    def _mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def _set(self, key, value):
+        self.data[key] = value
+
+    def _setex(self, key, timeout, value):
+        self.data[key] = value
+
+    def _delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def _zadd(self, name, mapping):
+        self.zsets.setdefault(name, {}).update({key.encode(): score for key, score in mapping.items()})
+
+    def _zrem(self, name, *keys):
+        for key in keys:
+            self.zsets.get(name, {}).pop(key.encode(), None)
+
+    def _zscore(self, name, key):
+        return self.zsets.get(name, {}).get(key.encode())
+
+    def _zrange(self, name, start, end):
+        return sorted(self.zsets.get(name, {}), key=self.zsets[name].get)
+
+    def _zrangebyscore(self, name, low, high):
+        return [key for key in self._zrange(name, 0, -1) if self.zsets[name][key] >= low]
+
+    def _zremrangebyscore(self, name, low, high):
+        zset = self.zsets.get(name, {})
+        for key in [key for key, score in zset.items() if low <= score <= high]:
+            del zset[key]
+
+
+class FakePipeline:
+    def __init__(self, db):
+        self.db = db
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        self.db.round_trips += 1
+        return [getattr(self.db, f"_{name}")(*args) for name, args in self.commands]
+
+
+@pytest.fixture
+def redis_cache(mocker):
+    mocker.patch("ansible_collections.community.general.plugins.cache.redis.StrictRedis", FakeRedis)
+
+    def get_cache(**kwargs):
+        return cache_loader.get("community.general.redis", _uri="127.0.0.1:6379:1", **kwargs).__wrapped__
+
+    return get_cache
+
+
+def test_redis_set_is_pipelined(redis_cache):
+    cache = redis_cache()
+    cache.set("host1", {"b": 1, "a": [1, 2]})
+    assert cache._db.round_trips == 1
+    assert cache._db.data["ansible_factshost1"] == b'{"b":1,"a":[1,2]}'
+    assert cache.keys() == ["host1"]
+    assert cache.contains("host1")
+    assert not cache.contains("host2")
+
+
+def test_redis_copy_uses_mget(redis_cache):
+    cache = redis_cache()
+    for i in range(5):
+        cache.set(f"host{i}", {"i": i})
+    del cache._db.data["ansible_factshost3"]
+
+    other = redis_cache()
+    other._db = cache._db
+    cache._db.round_trips = 0
+    assert other.copy() == {f"host{i}": {"i": i} for i in (0, 1, 2, 4)}
+    # keys, one MGET and the removal of the record without data
+    assert cache._db.round_trips == 3
+    assert other.keys() == ["host0", "host1", "host2", "host4"]
+
+
+def test_redis_prefetch(redis_cache):
+    cache = redis_cache()
+    for i in range(3):
+        cache.set(f"host{i}", {"i": i})
+
+    other = redis_cache(_prefetch=True)
+    other._db = cache._db
+    cache._db.round_trips = 0
+    assert [other.get(f"host{i}") for i in range(3)] == [{"i": 0}, {"i": 1}, {"i": 2}]
+    assert cache._db.round_trips == 2
+    with pytest.raises(KeyError):
+        other.get("host3")
+
+
+def test_redis_expiry(redis_cache, mocker):
+    time = mocker.patch("ansible_collections.community.general.plugins.cache.redis.time.time", return_value=1000.0)
+    cache = redis_cache(_timeout=100)
+    cache.set("old", {"a": 1})
+    time.return_value = 1050.0
+    cache.set("new", {"a": 2})
+    time.return_value = 1120.0
+    assert not cache.contains("old")
+    assert cache.keys() == ["new"]
+    assert b"old" not in cache._db.zsets["ansible_cache_keys"]
+
+    # The next removal of expired keys only happens after the interval
+    time.return_value = 1170.0
+    cache._db.round_trips = 0
+    assert cache.keys() == []
+    assert b"new" in cache._db.zsets["ansible_cache_keys"]
+    assert cache._db.round_trips == 1
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"_compression": "zlib"},
+        pytest.param({"_serializer": "msgpack"}, marks=pytest.mark.skipif(not HAS_MSGPACK, reason="needs msgpack")),
+        pytest.param(
+            {"_serializer": "msgpack", "_compression": "zlib"},
+            marks=pytest.mark.skipif(not HAS_MSGPACK, reason="needs msgpack"),
+        ),
+    ],
+)
+def test_redis_encoding(redis_cache, options):
+    cache = redis_cache(**options)
+    value = {"ansible_facts": {"list": [1, "two", None], "nested": {"x": 1.5}}}
+    cache.set("host1", value)
+    assert cache._db.data["ansible_factshost1"] != json.dumps(value).encode()
+
+    other = redis_cache(**options)
+    other._db = cache._db
+    assert other.get("host1") == value
+
+    # Records written with another serializer are missing
+    if options.get("_serializer") == "msgpack":
+        json_cache = redis_cache()
+        json_cache._db = cache._db
+        with pytest.raises(KeyError):
+            json_cache.get("host1")
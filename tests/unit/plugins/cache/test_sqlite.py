@@ -0,0 +1,84 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import sqlite3
+
+from ansible.plugins.loader import cache_loader
+
+from ansible_collections.community.general.plugins.cache import sqlite as sqlite_cache
+from ansible_collections.community.general.plugins.cache.sqlite import CacheModule as SqliteCache
+
+
+def get_cache(**kwargs):
+    return cache_loader.get("community.general.sqlite", **kwargs).__wrapped__
+
+
+def count_rows(path):
+    with sqlite3.connect(path) as db:
+        return db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def test_sqlite_cachemodule(tmp_path):
+    cache = cache_loader.get("community.general.sqlite", _uri=str(tmp_path))
+    assert isinstance(cache.__wrapped__, SqliteCache)
+    cache.set("host1", {"ansible_facts": {"os": "linux"}})
+    assert cache.get("host1") == {"ansible_facts": {"os": "linux"}}
+    assert cache.keys() == ["host1"]
+    assert cache.contains("host1")
+    assert (tmp_path / "ansible_cache.sqlite").exists()
+
+    # Another instance reads the committed records
+    other = cache_loader.get("community.general.sqlite", _uri=str(tmp_path))
+    assert other.get("host1") == {"ansible_facts": {"os": "linux"}}
+
+
+def test_batched_writes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = get_cache(_uri=path, _batch_size=3)
+    cache.set("host1", {"a": 1})
+    cache.set("host2", {"a": 2})
+    assert cache.contains("host2")
+    assert count_rows(path) == 0
+    cache.set("host3", {"a": 3})
+    assert count_rows(path) == 3
+
+    cache.set("host4", {"a": 4})
+    assert sorted(cache.keys()) == ["host1", "host2", "host3", "host4"]
+    assert count_rows(path) == 4
+
+
+def test_expiry(tmp_path, mocker):
+    path = str(tmp_path / "cache.sqlite")
+    cache = get_cache(_uri=path, _timeout=100, _batch_size=1)
+    mocker.patch.object(sqlite_cache.time, "time", return_value=1000.0)
+    cache.set("old", {"a": 1})
+    mocker.patch.object(sqlite_cache.time, "time", return_value=1050.0)
+    cache.set("new", {"a": 2})
+    mocker.patch.object(sqlite_cache.time, "time", return_value=1120.0)
+
+    fresh = get_cache(_uri=path, _timeout=100)
+    assert not fresh.contains("old")
+    assert fresh.contains("new")
+    assert fresh.keys() == ["new"]
+    assert count_rows(path) == 1
+
+
+def test_prefix_delete_flush(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = get_cache(_uri=path, _prefix="first_", _batch_size=1)
+    second = get_cache(_uri=path, _prefix="second_", _batch_size=1)
+    first.set("host1", {"a": 1})
+    first.set("host2", {"a": 2})
+    second.set("host1", {"b": 1})
+
+    assert sorted(first.keys()) == ["host1", "host2"]
+    assert second.copy() == {"host1": {"b": 1}}
+
+    first.delete("host1")
+    assert first.keys() == ["host2"]
+    first.flush()
+    assert first.keys() == []
+    assert second.keys() == ["host1"]
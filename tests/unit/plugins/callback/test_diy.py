@@ -0,0 +1,103 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from ansible.plugins.loader import callback_loader
+
+from ansible_collections.community.general.plugins.callback.diy import ALL_SECTIONS, referenced_sections
+
+
+@pytest.mark.parametrize(
+    "template, expected",
+    [
+        (None, set()),
+        ("plain text", set()),
+        ("{{ 'text' | upper }}", set()),
+        ("{{ ansible_callback_diy.task.name }} on {{ ansible_callback_diy['host'].name }}", {"task", "host"}),
+        (
+            "{% for line in ansible_callback_diy.result.output %}{{ loop.index }}: {{ line }}{% endfor %}",
+            {"result"},
+        ),
+        ("{{ 'yellow' if ansible_callback_diy.result.is_changed else 'green' }}", {"result"}),
+        ("{% for key in ansible_callback_diy %}{{ key }}{% endfor %}", ALL_SECTIONS),
+        ("{{ ansible_callback_diy[section] }}", ALL_SECTIONS),
+        ("{{ lookup('template', 'message.j2') }}", ALL_SECTIONS),
+        ("{{ ansible_callback_diy.task.name", ALL_SECTIONS),
+        # Other variables can hold templates or references using the namespace
+        ("{{ inventory_hostname }}", ALL_SECTIONS),
+        ("{{ my_msg }}", ALL_SECTIONS),
+        ("{{ ansible_callback_diy.task.name }} on {{ inventory_hostname }}", ALL_SECTIONS),
+        ('{{ vars["ansible_callback_diy"].task.name }}', ALL_SECTIONS),
+        ("{{ hostvars[inventory_hostname].ansible_callback_diy }}", ALL_SECTIONS),
+    ],
+)
+def test_referenced_sections(template, expected):
+    assert referenced_sections(template) == expected
+
+
+def get_callback(**options):
+    callback = callback_loader.get("community.general.diy")
+    callback.set_options(direct=options)
+    return callback
+
+
+def get_events():
+    playbook = MagicMock(entries=[], file_name="site.yml", basedir="/tmp")
+    play = MagicMock()
+    play.name = "play"
+    play.get_variable_manager.return_value.get_vars.side_effect = lambda **kwargs: {
+        "inventory_hostname": kwargs["host"].name
+    }
+    host = MagicMock(address="192.0.2.1", implicit=False)
+    host.name = "host1"
+    task = MagicMock(loop=None)
+    task.name = "task"
+    result = MagicMock(_host=host, _result={"changed": True})
+    return playbook, play, host, task, result
+
+
+def test_get_vars_only_gathers_referenced_sections():
+    callback = get_callback(
+        runner_on_ok_msg="{{ ansible_callback_diy.task.name }} on {{ ansible_callback_diy.host.name }}"
+    )
+    playbook, play, host, task, result = get_events()
+
+    variables = callback._get_vars(playbook=playbook, play=play, task=task, result=result)
+    assert sorted(variables[callback.DIY_NS]) == ["task", "top_level_var_names"]
+    assert variables[callback.DIY_NS]["task"]["name"] == "task"
+    assert variables["inventory_hostname"] == "host1"
+    assert variables["changed"] is True
+    assert play.get_variable_manager.return_value.get_vars.call_count == 1
+
+
+def test_get_vars_with_variable_override():
+    callback = get_callback()
+    playbook, play, host, task, result = get_events()
+    play.get_variable_manager.return_value.get_vars.side_effect = lambda **kwargs: {
+        "ansible_callback_diy_runner_on_ok_msg": "{{ ansible_callback_diy.result.is_changed }}"
+    }
+
+    variables = callback._get_vars(playbook=playbook, play=play, task=task, result=result)
+    assert sorted(variables[callback.DIY_NS]) == ["result", "top_level_var_names"]
+
+
+def test_get_vars_all_sections():
+    callback = get_callback(runner_on_ok_msg="{{ ansible_callback_diy | to_nice_json }}")
+    playbook, play, host, task, result = get_events()
+
+    variables = callback._get_vars(playbook=playbook, play=play, host=host, task=task, result=result)
+    assert sorted(variables[callback.DIY_NS]) == ["host", "play", "playbook", "result", "task", "top_level_var_names"]
+    assert variables[callback.DIY_NS]["playbook"]["file_name"] == "site.yml"
+    assert variables[callback.DIY_NS]["play"]["name"] == "play"
+
+    # The play and playbook attributes are read once, except the ones that change while the play runs
+    play.name = "renamed"
+    play.removed_hosts = ["host2"]
+    variables = callback._get_vars(playbook=playbook, play=play, host=host, task=task, result=result)
+    assert variables[callback.DIY_NS]["play"]["name"] == "play"
+    assert variables[callback.DIY_NS]["play"]["removed_hosts"] == ["host2"]
@@ -0,0 +1,92 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import builtins
+import gzip
+import json
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from ansible.plugins.loader import callback_loader
+
+from ansible_collections.community.general.plugins.callback.log_plays import LogFilePool
+
+
+def get_callback(tmp_path, **options):
+    callback = callback_loader.get("community.general.log_plays")
+    callback.set_options(direct=dict(options, log_folder=str(tmp_path)))
+    callback.playbook = "site.yml"
+    return callback
+
+
+def get_result(host, data):
+    result = MagicMock(_result=data)
+    result._host.get_name.return_value = host
+    result._task.name = "task"
+    result._task.action = "debug"
+    return result
+
+
+@pytest.fixture
+def count_open(mocker):
+    return mocker.spy(builtins, "open")
+
+
+@pytest.mark.parametrize("max_open_files, expected_opens", [(0, 60), (2, 60), (3, 3)])
+def test_text_format(tmp_path, count_open, max_open_files, expected_opens):
+    callback = get_callback(tmp_path, max_open_files=max_open_files)
+    for i in range(20):
+        for host in ("host1", "host2", "host3"):
+            callback.v2_runner_on_ok(get_result(host, {"msg": i, "invocation": {"module_args": {}}}))
+    callback.v2_playbook_on_stats(MagicMock())
+
+    assert count_open.call_count == expected_opens
+    with open(os.path.join(str(tmp_path), "host2"), "rb") as f:
+        lines = f.read().decode().split("\n\n")
+    assert len(lines) == 21
+    assert " - site.yml - task - debug - OK - " in lines[0]
+    assert lines[19].endswith('=> {"msg": 19} ')
+
+
+def test_flush_interval(tmp_path):
+    pool = LogFilePool(max_open=1, flush_interval=3600)
+    path = os.path.join(str(tmp_path), "log")
+    pool.write(path, b"first\n")
+    pool.write(path, b"second\n")
+    assert os.path.getsize(path) == 0
+    pool.flush(sync=True)
+    assert os.path.getsize(path) == 13
+    pool.close()
+
+
+def test_jsonl_format_with_rotation(tmp_path):
+    callback = get_callback(tmp_path, log_format="jsonl", max_open_files=1, rotate_size=1000)
+    for i in range(30):
+        callback.v2_runner_on_ok(get_result(f"host{i % 3}", {"msg": "x" * 50, "invocation": {"module_args": {}}}))
+    callback.v2_runner_on_failed(get_result("host1", {"_ansible_verbose_override": True}))
+    callback.v2_playbook_on_stats(MagicMock())
+
+    files = sorted(os.listdir(str(tmp_path)))
+    rotated = [f for f in files if f.endswith(".gz")]
+    assert "ansible.jsonl" in files
+    assert rotated
+    assert len(files) == len(rotated) + 1
+
+    records = []
+    for name in rotated:
+        with gzip.open(os.path.join(str(tmp_path), name), "rt") as f:
+            records.extend(json.loads(line) for line in f)
+    with open(os.path.join(str(tmp_path), "ansible.jsonl")) as f:
+        records.extend(json.loads(line) for line in f)
+
+    assert len(records) == 31
+    assert records[0]["host"] == "host0"
+    assert records[0]["playbook"] == "site.yml"
+    assert records[0]["invocation"] == {"module_args": {}}
+    assert records[0]["result"] == {"msg": "x" * 50}
+    assert records[-1]["category"] == "FAILED"
+    assert records[-1]["result"] == "omitted"
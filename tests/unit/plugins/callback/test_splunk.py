@@ -4,16 +4,23 @@
 
 from __future__ import annotations
 
+import gzip
 import json
+import threading
+import time
 import unittest
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from unittest.mock import Mock, patch
 
 import pytest
 from ansible.executor.task_result import TaskResult
 from ansible.release import __version__ as ansible_release
 
-from ansible_collections.community.general.plugins.callback.splunk import SplunkHTTPCollectorSource
+from ansible_collections.community.general.plugins.callback.splunk import (
+    SplunkHTTPCollectorSender,
+    SplunkHTTPCollectorSource,
+)
 
 if tuple(int(x) for x in ansible_release.split(".")[:2]) >= (2, 21):
     # https://github.com/ansible/ansible/issues/86761
@@ -80,3 +87,75 @@ class TestSplunkClient(unittest.TestCase):
         self.assertEqual(sent_data["event"]["timestamp"], "2020-12-01 00:00:00 +0000")
         self.assertEqual(sent_data["event"]["host"], "my-host")
         self.assertEqual(sent_data["event"]["ip_address"], "1.2.3.4")
+
+
+class _CollectorHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.server.requests.append(body.decode("utf-8").split("\n"))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+@pytest.fixture
+def collector():
+    server = HTTPServer(("127.0.0.1", 0), _CollectorHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/services/collector/event"
+    server.shutdown()
+    server.server_close()
+
+
+def _sender(url, **kwargs):
+    options = dict(queue_size=10000, flush_events=100, flush_bytes=1048576, flush_interval=5, compress=True, retries=0)
+    options.update(kwargs)
+    return SplunkHTTPCollectorSender(url, "token", False, **options)
+
+
+def test_sender_batches(collector):
+    server, url = collector
+    sender = _sender(url)
+    sender.start()
+    for i in range(1000):
+        sender.put(json.dumps({"event": {"n": i}}))
+    sender.close()
+
+    assert sender.sent == 1000
+    assert sender.dropped == 0
+    assert len(server.requests) == 10
+    events = [json.loads(line)["event"]["n"] for request in server.requests for line in request]
+    assert events == list(range(1000))
+
+
+def test_sender_flush_interval(collector):
+    server, url = collector
+    sender = _sender(url, flush_interval=0.05, compress=False)
+    sender.start()
+    sender.put(json.dumps({"event": {}}))
+    deadline = time.monotonic() + 5
+    while sender.sent == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sender.sent == 1
+    sender.close()
+    assert len(server.requests) == 1
+
+
+def test_sender_drops_and_retries():
+    sender = _sender("http://127.0.0.1:1/", queue_size=2, retries=1)
+    with patch("ansible_collections.community.general.plugins.callback.splunk.time.sleep"):
+        for dummy in range(3):
+            sender.put("{}")
+        assert sender.dropped == 1
+        sender.start()
+        sender.close()
+    assert sender.sent == 0
+    assert sender.retried == 2
+    assert sender.dropped == 3
@@ -0,0 +1,133 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+import stat
+from io import StringIO
+
+import pytest
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader
+
+from ansible_collections.community.general.plugins.connection import chroot
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "root"
+    (root / "bin").mkdir(parents=True)
+    (root / "bin" / "sh").write_text("")
+    (root / "bin" / "sh").chmod(0o755)
+    (root / "tmp").mkdir()
+    (tmp_path / "outside").mkdir()
+    return root
+
+
+def make_conn(root, transfer_method="copy"):
+    play_context = PlayContext()
+    play_context.remote_addr = str(root)
+    conn = connection_loader.get("community.general.chroot", play_context, StringIO())
+    conn.set_options(direct={"disable_root_check": True, "chroot_exe": "/bin/true", "transfer_method": transfer_method})
+    return conn
+
+
+@pytest.fixture
+def no_dd(mocker):
+    return mocker.patch.object(chroot.Connection, "_buffered_exec_command", side_effect=AssertionError("dd was used"))
+
+
+def test_put_and_fetch_file(root, tmp_path, no_dd):
+    src = tmp_path / "module.py"
+    src.write_bytes(b"x" * 200000)
+    conn = make_conn(root)
+    conn.put_file(str(src), "/tmp/module.py")
+    assert (root / "tmp" / "module.py").read_bytes() == src.read_bytes()
+
+    # Existing files keep their mode
+    (root / "tmp" / "module.py").chmod(0o700)
+    src.write_bytes(b"short")
+    conn.put_file(str(src), "tmp/module.py")
+    assert (root / "tmp" / "module.py").read_bytes() == b"short"
+    assert stat.S_IMODE((root / "tmp" / "module.py").stat().st_mode) == 0o700
+
+    conn.fetch_file("/tmp/module.py", str(tmp_path / "fetched"))
+    assert (tmp_path / "fetched").read_bytes() == b"short"
+
+
+@pytest.mark.parametrize(
+    "link",
+    [
+        # absolute links are relative to the chroot
+        "/outside",
+        # '..' stops at the chroot
+        "../../../outside",
+        "../tmp/../../outside/",
+    ],
+)
+def test_put_file_symlinks_stay_in_root(root, tmp_path, no_dd, link):
+    (root / "outside").mkdir()
+    os.symlink(link, root / "tmp" / "link")
+    src = tmp_path / "module.py"
+    src.write_text("data")
+    conn = make_conn(root)
+    conn.put_file(str(src), "/tmp/link/module.py")
+    assert (root / "outside" / "module.py").read_text() == "data"
+    assert not (tmp_path / "outside" / "module.py").exists()
+
+
+def test_put_file_follows_final_symlink(root, tmp_path, no_dd):
+    os.symlink("/etc/hostname", root / "tmp" / "hostname")
+    (root / "etc").mkdir()
+    src = tmp_path / "hostname"
+    src.write_text("chroot")
+    make_conn(root).put_file(str(src), "/tmp/hostname")
+    assert (root / "etc" / "hostname").read_text() == "chroot"
+
+
+def test_fetch_file_symlink_stays_in_root(root, tmp_path, no_dd):
+    (tmp_path / "outside" / "secret").write_text("host")
+    (root / "outside").mkdir()
+    (root / "outside" / "secret").write_text("chroot")
+    os.symlink("../../outside/secret", root / "tmp" / "secret")
+    make_conn(root).fetch_file("/tmp/secret", str(tmp_path / "fetched"))
+    assert (tmp_path / "fetched").read_text() == "chroot"
+
+
+def test_copy_falls_back_to_dd(root, tmp_path, mocker):
+    os.symlink("loop", root / "tmp" / "loop")
+    process = mocker.MagicMock(returncode=0)
+    process.communicate.return_value = (b"", b"")
+    dd = mocker.patch.object(chroot.Connection, "_buffered_exec_command", return_value=process)
+    src = tmp_path / "module.py"
+    src.write_text("data")
+    make_conn(root).put_file(str(src), "/tmp/loop")
+    assert dd.call_args[0][0].startswith("dd of=/tmp/loop ")
+
+
+def test_dd_transfer_method(root, tmp_path, mocker):
+    process = mocker.MagicMock(returncode=0)
+    process.communicate.return_value = (b"", b"")
+    dd = mocker.patch.object(chroot.Connection, "_buffered_exec_command", return_value=process)
+    src = tmp_path / "module.py"
+    src.write_text("data")
+    make_conn(root, transfer_method="dd").put_file(str(src), "/tmp/module.py")
+    assert dd.called
+    assert not (root / "tmp" / "module.py").exists()
+
+
+def test_copy_fd_fallbacks(tmp_path, mocker):
+    src = tmp_path / "src"
+    src.write_bytes(os.urandom(3 * chroot.BUFSIZE + 5))
+    copy_file_range = mocker.patch.object(
+        chroot.os, "copy_file_range", side_effect=[10, OSError(chroot.errno.EXDEV, "")]
+    )
+    mocker.patch.object(chroot.os, "sendfile", side_effect=OSError(chroot.errno.EINVAL, ""))
+    with open(src, "rb") as in_file, open(tmp_path / "dst", "wb") as out_file:
+        out_file.write(src.read_bytes()[:10])
+        out_file.flush()
+        chroot._copy_fd(in_file.fileno(), out_file.fileno())
+    assert copy_file_range.call_count == 2
+    assert (tmp_path / "dst").read_bytes() == src.read_bytes()
@@ -8,10 +8,12 @@ import typing as t
 from io import StringIO
 
 import pytest
-from ansible.errors import AnsibleError
+from ansible.errors import AnsibleConnectionFailure, AnsibleError
 from ansible.playbook.play_context import PlayContext
 from ansible.plugins.loader import connection_loader
 
+from ansible_collections.community.general.plugins.module_utils._lxd import LXDClientException
+
 BUILD_CMD_TEST_CASES: list[dict[str, t.Any]] = [
     dict(
         id="sh simple",
@@ -357,3 +359,82 @@ def test_fetch_file_transfer_success(mocker):
     mocker.patch("ansible_collections.community.general.plugins.connection.incus.Popen", return_value=process)
 
     conn.fetch_file("/tmp/src", "/tmp/dest")
+
+
+def test_remote_uid_gid_is_cached(mocker, tmp_path):
+    """The uid and gid of a non-root user are only looked up once per connection."""
+    conn = _make_conn(mocker)
+    conn.set_option("remote_user", "ansible")
+
+    src = tmp_path / "payload"
+    src.write_text("data")
+
+    exec_command = mocker.patch.object(conn, "exec_command", return_value=(0, b"1000\n1001\n", b""))
+    process = mocker.MagicMock()
+    process.communicate.return_value = (b"", b"")
+    process.returncode = 0
+    popen = mocker.patch("ansible_collections.community.general.plugins.connection.incus.Popen", return_value=process)
+
+    conn.put_file(str(src), "/tmp/dest1")
+    conn.put_file(str(src), "/tmp/dest2")
+
+    exec_command.assert_called_once_with("/bin/id -u && /bin/id -g")
+    assert popen.call_args[0][0][5:9] == [b"--uid", b"1000", b"--gid", b"1001"]
+
+
+def test_api_mode(mocker, tmp_path):
+    """With api_url, commands and transfers use the REST API instead of the CLI."""
+    conn = _make_conn(mocker)
+    conn.set_option("api_url", "unix:/var/lib/incus/unix.socket")
+    conn.set_option("remote_user", "ansible")
+    popen = mocker.patch("ansible_collections.community.general.plugins.connection.incus.Popen")
+    client = mocker.patch("ansible_collections.community.general.plugins.connection.incus.LXDClient")
+    instance_class = mocker.patch("ansible_collections.community.general.plugins.connection.incus.LXDInstance")
+    instance = instance_class.return_value
+    instance.exec.side_effect = [(0, b"1000\n1001\n", b""), (3, b"out", b"err")]
+
+    src = tmp_path / "payload"
+    src.write_text("data")
+    src.chmod(0o640)
+    conn.put_file(str(src), "/tmp/dest")
+    assert conn.exec_command("echo 123", in_data=b"input") == (3, b"out", b"err")
+    conn.fetch_file("/tmp/dest", str(tmp_path / "fetched"))
+
+    client.assert_called_once_with("unix:/var/lib/incus/unix.socket")
+    instance_class.assert_called_once_with(client.return_value, "server1", "default", header_prefix="X-Incus")
+    push_args = instance.push.call_args
+    assert push_args[0][1] == "/tmp/dest"
+    assert push_args[1] == {"uid": 1000, "gid": 1001, "mode": 0o640}
+    assert instance.exec.call_args[0] == (["/bin/su", "ansible", "-c", "/bin/sh", "-c", "echo 123"], b"input")
+    assert instance.pull.call_args[0][0] == "/tmp/dest"
+    popen.assert_not_called()
+
+    conn.close()
+    instance.client.close.assert_called_once_with()
+
+
+def test_api_mode_errors(mocker):
+    """API errors are reported like the CLI errors."""
+    conn = _make_conn(mocker)
+    conn.set_option("api_url", "unix:/var/lib/incus/unix.socket")
+    mocker.patch("ansible_collections.community.general.plugins.connection.incus.LXDClient")
+    instance_class = mocker.patch("ansible_collections.community.general.plugins.connection.incus.LXDInstance")
+    instance_class.return_value.exec.side_effect = LXDClientException("Instance is not running")
+
+    with pytest.raises(AnsibleConnectionFailure, match="instance not running: server1"):
+        conn.exec_command("echo 123")
+
+
+def test_api_mode_windows(mocker):
+    """Windows instances cannot use the REST API."""
+    mocker.patch("ansible.module_utils.common.process.get_bin_path").return_value = "/test/bin/incus"
+    play_context = PlayContext()
+    play_context.shell = "powershell"
+    conn = connection_loader.get("community.general.incus", play_context, StringIO())
+    conn.set_option("remote_addr", "server1")
+    conn.set_option("api_url", "unix:/var/lib/incus/unix.socket")
+    instance_class = mocker.patch("ansible_collections.community.general.plugins.connection.incus.LXDInstance")
+
+    with pytest.raises(AnsibleError, match="Windows instances are not supported with api_url"):
+        conn.exec_command("echo 123", in_data=b"input")
+    instance_class.assert_not_called()
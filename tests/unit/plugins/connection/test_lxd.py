@@ -0,0 +1,81 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+from ansible.errors import AnsibleConnectionFailure, AnsibleError
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader
+
+from ansible_collections.community.general.plugins.module_utils._lxd import LXDClientException
+
+
+def _make_conn(mocker):
+    mocker.patch(
+        "ansible_collections.community.general.plugins.connection.lxd.get_bin_path", return_value="/test/bin/lxc"
+    )
+    conn = connection_loader.get("community.general.lxd", PlayContext(), StringIO())
+    conn.set_option("remote_addr", "c1.example.com")
+    conn.set_option("remote_user", "ansible")
+    return conn
+
+
+def test_remote_uid_gid_is_cached(mocker, tmp_path):
+    conn = _make_conn(mocker)
+    src = tmp_path / "payload"
+    src.write_text("data")
+    exec_command = mocker.patch.object(conn, "exec_command", return_value=(0, "1000\n1001\n", ""))
+    process = mocker.MagicMock(returncode=0)
+    process.communicate.return_value = (b"", b"")
+    popen = mocker.patch("ansible_collections.community.general.plugins.connection.lxd.Popen", return_value=process)
+
+    conn.put_file(str(src), "/tmp/dest1")
+    conn.put_file(str(src), "/tmp/dest2")
+
+    exec_command.assert_called_once_with("/bin/id -u && /bin/id -g")
+    assert popen.call_args[0][0][3:7] == [b"--uid", b"1000", b"--gid", b"1001"]
+
+
+def test_api_mode(mocker, tmp_path):
+    conn = _make_conn(mocker)
+    conn.set_option("api_url", "unix:/var/snap/lxd/common/lxd/unix.socket")
+    conn.set_option("remote_user", "root")
+    popen = mocker.patch("ansible_collections.community.general.plugins.connection.lxd.Popen")
+    client = mocker.patch("ansible_collections.community.general.plugins.connection.lxd.LXDClient")
+    instance_class = mocker.patch("ansible_collections.community.general.plugins.connection.lxd.LXDInstance")
+    instance = instance_class.return_value
+    instance.exec.return_value = (0, b"out", b"")
+
+    src = tmp_path / "payload"
+    src.write_text("data")
+    conn.put_file(str(src), "/tmp/dest")
+    assert conn.exec_command("echo 123") == (0, "out", "")
+
+    instance_class.assert_called_once_with(client.return_value, "c1", None)
+    assert instance.push.call_args[1]["uid"] is None
+    assert instance.exec.call_args[0] == (["/bin/sh", "-c", "echo 123"], None)
+    popen.assert_not_called()
+
+    instance.exec.side_effect = LXDClientException("Instance not found")
+    with pytest.raises(AnsibleConnectionFailure, match="instance not found: c1"):
+        conn.exec_command("echo 123")
+
+
+def test_lxc_only_required_without_api(mocker):
+    mocker.patch(
+        "ansible_collections.community.general.plugins.connection.lxd.get_bin_path", side_effect=ValueError("not found")
+    )
+    conn = connection_loader.get("community.general.lxd", PlayContext(), StringIO())
+    conn.set_option("remote_addr", "c1")
+    with pytest.raises(AnsibleError, match="lxc command not found in PATH"):
+        conn.exec_command("echo 123")
+
+    conn.set_option("api_url", "unix:/var/snap/lxd/common/lxd/unix.socket")
+    mocker.patch("ansible_collections.community.general.plugins.connection.lxd.LXDClient")
+    instance_class = mocker.patch("ansible_collections.community.general.plugins.connection.lxd.LXDInstance")
+    instance_class.return_value.exec.return_value = (0, b"out", b"")
+    assert conn.exec_command("echo 123") == (0, "out", "")
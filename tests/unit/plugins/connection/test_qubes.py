@@ -0,0 +1,81 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+import shutil
+from io import StringIO
+
+import pytest
+from ansible.errors import AnsibleConnectionFailure
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader
+
+pytestmark = pytest.mark.skipif(shutil.which("bash") is None, reason="needs bash")
+
+
+@pytest.fixture
+def qvm_run(tmp_path, monkeypatch):
+    """A qvm-run replacement running the service shell locally, logging its invocations."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "qvm-run.log"
+    script = bin_dir / "qvm-run"
+    script.write_text(f'#!/bin/sh\necho "$@" >> {log}\nexec bash\n')
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return log
+
+
+def make_conn(persistent_shell=False):
+    play_context = PlayContext()
+    play_context.remote_addr = "work"
+    conn = connection_loader.get("community.general.qubes", play_context, StringIO())
+    conn.set_options(direct={"persistent_shell": persistent_shell})
+    return conn
+
+
+def test_exec_command(qvm_run):
+    conn = make_conn()
+    assert conn.exec_command("echo out; echo err >&2; exit 3") == (3, b"out\n", b"err\n")
+    assert conn.exec_command("cat", in_data=b"data") == (0, b"data", b"")
+    assert len(qvm_run.read_text().splitlines()) == 2
+
+
+def test_persistent_shell(qvm_run):
+    conn = make_conn(persistent_shell=True)
+    try:
+        assert conn.exec_command("echo out; echo err >&2; exit 3") == (3, b"out\n", b"err\n")
+        assert conn.exec_command("printf 'no newline'") == (0, b"no newline", b"")
+        payload = os.urandom(100000)
+        rc, stdout, stderr = conn.exec_command("cat", in_data=payload)
+        assert (rc, stdout, stderr) == (0, payload, b"")
+        assert conn.exec_command("cat") == (0, b"", b"")
+        assert qvm_run.read_text().splitlines() == ["--pass-io --service work qubes.VMShell"]
+    finally:
+        conn.close()
+
+
+def test_persistent_shell_ends(qvm_run):
+    conn = make_conn(persistent_shell=True)
+    try:
+        with pytest.raises(AnsibleConnectionFailure, match="ended unexpectedly"):
+            conn.exec_command("kill -9 $PPID")
+        assert conn.exec_command("echo again") == (0, b"again\n", b"")
+        assert len(qvm_run.read_text().splitlines()) == 2
+    finally:
+        conn.close()
+
+
+def test_put_file_streams(qvm_run, tmp_path, mocker):
+    src = tmp_path / "src"
+    src.write_bytes(os.urandom(3 * 1024 * 1024))
+    conn = make_conn()
+    qubes = mocker.spy(conn, "_qubes")
+    conn.put_file(str(src), str(tmp_path / "dst"))
+    assert (tmp_path / "dst").read_bytes() == src.read_bytes()
+    # The file is not read in memory but passed as a file object
+    assert qubes.call_args.kwargs["in_file"].name == str(src)
+    assert qubes.call_args.args[1:] == ()
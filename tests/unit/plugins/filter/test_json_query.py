@@ -0,0 +1,40 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import pytest
+from ansible.errors import AnsibleFilterError
+
+from ansible_collections.community.general.plugins.filter import json_query as json_query_module
+from ansible_collections.community.general.plugins.filter.json_query import json_query
+
+jmespath = pytest.importorskip("jmespath")
+
+DATA = {"hosts": [{"name": f"host{i}", "port": 8000 + i % 3} for i in range(10000)]}
+
+
+def test_json_query():
+    assert json_query(DATA, "hosts[?port==`8001`].name | [0]") == "host1"
+    assert len(json_query(DATA, "hosts[*].name")) == 10000
+
+
+def test_json_query_compiles_expression_once(mocker):
+    json_query_module._compile.cache_clear()
+    compile_mock = mocker.patch.object(jmespath, "compile", wraps=jmespath.compile)
+    for dummy in range(100):
+        assert json_query(DATA, "length(hosts)") == 10000
+    assert compile_mock.call_count == 1
+
+
+def test_json_query_types_map_is_not_extended_per_call():
+    before = dict(jmespath.functions.REVERSE_TYPES_MAP)
+    json_query(DATA, "hosts[0].name")
+    assert before == jmespath.functions.REVERSE_TYPES_MAP
+    assert "_AnsibleTaggedStr" in before["string"]
+
+
+def test_json_query_error():
+    with pytest.raises(AnsibleFilterError, match="JMESPathError"):
+        json_query(DATA, "hosts[")
@@ -0,0 +1,120 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import pytest
+
+gitlab = pytest.importorskip("gitlab")
+
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.template import Templar
+from ansible_collections.community.internal_test_tools.tests.unit.utils.trust import make_trusted
+
+from ansible_collections.community.general.plugins.inventory import gitlab_runners
+from ansible_collections.community.general.plugins.inventory.gitlab_runners import InventoryModule
+
+RUNNERS = [
+    {"id": 1, "description": "runner-1", "ip_address": "10.0.0.1", "status": "online"},
+    {"id": 2, "description": "runner-2", "ip_address": "10.0.0.2", "status": "offline"},
+    {"id": 3, "description": "runner-3", "ip_address": "10.0.0.3", "status": "online"},
+]
+
+
+class FakeRunner:
+    def __init__(self, attrs):
+        self._attrs = attrs
+
+    def asdict(self):
+        return dict(self._attrs)
+
+
+class FakeRunnerManager:
+    def __init__(self):
+        self.details = []
+
+    def all(self, scope=None):
+        return [FakeRunner(runner) for runner in RUNNERS]
+
+    def get(self, runner_id):
+        self.details.append(runner_id)
+        runner = next(runner for runner in RUNNERS if runner["id"] == runner_id)
+        return FakeRunner(dict(runner, tag_list=[f"tag{runner_id}"]))
+
+
+class FakeGitlab:
+    def __init__(self, *args, **kwargs):
+        self.runners = FakeRunnerManager()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def gl(mocker):
+    client = FakeGitlab()
+    mocker.patch.object(gitlab_runners.gitlab, "Gitlab", return_value=client)
+    return client
+
+
+@pytest.fixture
+def inventory():
+    plugin = InventoryModule()
+    plugin.inventory = InventoryData()
+    plugin.templar = Templar(loader=DataLoader())
+    plugin._options = {
+        "server_url": "https://gitlab.com",
+        "api_token": "token",
+        "filter": None,
+        "verbose_output": True,
+        "max_concurrent_requests": 1,
+        "compose": {},
+        "groups": {},
+        "keyed_groups": [],
+        "strict": False,
+        "leading_separator": True,
+        "use_extra_vars": False,
+    }
+    return plugin
+
+
+@pytest.mark.parametrize("max_concurrent_requests", [1, 4])
+def test_fetch_runners_details(inventory, gl, max_concurrent_requests):
+    inventory._options["max_concurrent_requests"] = max_concurrent_requests
+    runners = inventory._fetch_runners()
+    assert [runner["id"] for runner in runners] == [1, 2, 3]
+    assert [runner["tag_list"] for runner in runners] == [["tag1"], ["tag2"], ["tag3"]]
+    assert sorted(gl.runners.details) == [1, 2, 3]
+
+
+def test_fetch_runners_without_details(inventory, gl):
+    inventory._options["verbose_output"] = False
+    inventory._options["groups"] = {"online": "status == 'online'"}
+    runners = inventory._fetch_runners()
+    assert runners == RUNNERS
+    assert gl.runners.details == []
+
+
+def test_fetch_runners_details_used_by_templates(inventory, gl):
+    inventory._options["verbose_output"] = False
+    inventory._options["keyed_groups"] = [{"key": "tag_list", "prefix": "tag"}]
+    runners = inventory._fetch_runners()
+    assert runners[0]["tag_list"] == ["tag1"]
+    assert sorted(gl.runners.details) == [1, 2, 3]
+
+
+def test_populate(inventory):
+    inventory._options["groups"] = {"online": make_trusted("status == 'online'")}
+    inventory._populate(RUNNERS)
+    assert sorted(inventory.inventory.groups["gitlab_runners"].hosts, key=str) == [
+        inventory.inventory.get_host(str(i)) for i in (1, 2, 3)
+    ]
+    assert sorted(host.name for host in inventory.inventory.groups["online"].hosts) == ["1", "3"]
+    host = inventory.inventory.get_host("2")
+    assert host.vars["ansible_host"] == "10.0.0.2"
+    assert host.vars["gitlab_runner_attributes"]["description"] == "runner-2"
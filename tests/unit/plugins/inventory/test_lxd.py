@@ -120,3 +120,65 @@ def test_build_inventory_groups_with_no_groupselection(inventory):
         if generated_data[key] != value:
             eq = False
     assert eq
+
+
+class FakeLXDClient:
+    """Minimal stand-in for LXDClient answering the requests of the inventory plugin."""
+
+    def __init__(self, count):
+        self.requests = []
+        self.instances = {
+            f"instance{i}": {
+                "name": f"instance{i}",
+                "type": "container",
+                "project": "default",
+                "config": {"image.os": "ubuntu", "image.release": "noble", "volatile.last_state.power": "RUNNING"},
+                "profiles": ["default"],
+                "expanded_devices": {},
+                "location": "none",
+                "status": "Running",
+            }
+            for i in range(count)
+        }
+
+    def _state(self, name):
+        return {"status": self.instances[name]["status"], "network": {}}
+
+    def do(self, method, url, **kwargs):
+        self.requests.append((method, url))
+        path, dummy, query = url.partition("?")
+        parts = path.split("/")
+        if path == "/1.0/instances":
+            if "recursion=2" in query:
+                metadata = [dict(instance, state=self._state(name)) for name, instance in self.instances.items()]
+            else:
+                metadata = [f"/1.0/instances/{name}" for name in self.instances]
+            return {"type": "sync", "metadata": metadata}
+        if path == "/1.0/networks":
+            return {"type": "sync", "metadata": []}
+        if len(parts) == 5 and parts[4] == "state":
+            return {"type": "sync", "metadata": self._state(parts[3])}
+        return {"type": "sync", "metadata": dict(self.instances[parts[3]])}
+
+    def do_many(self, urls, ok_error_codes=None, return_exceptions=False):
+        return [self.do("GET", url) for url in urls]
+
+
+@pytest.mark.parametrize("bulk_fetch", [True, False])
+def test_populate_from_api(mocker, inventory, bulk_fetch):
+    """Run the plugin against a fake LXD API with many instances."""
+    client = FakeLXDClient(2000)
+    mocker.patch.object(InventoryModule, "_connect_to_socket", return_value=client)
+    inventory.data = {}
+    inventory.project = "default"
+    inventory.groupby = None
+    inventory.bulk_fetch = bulk_fetch
+    inventory._populate()
+
+    assert len(inventory.inventory.hosts) == 2000
+    assert inventory.inventory.get_host("instance1999").get_vars()["ansible_lxd_release"] == "noble"
+    assert inventory.inventory.get_host("instance1999").get_vars()["ansible_lxd_state"] == "running"
+    if bulk_fetch:
+        assert len(client.requests) == 2
+    else:
+        assert len(client.requests) == 2 + 2 * 2000
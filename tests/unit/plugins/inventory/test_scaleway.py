@@ -0,0 +1,90 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import io
+import json
+import threading
+
+import pytest
+from ansible.inventory.data import InventoryData
+
+from ansible_collections.community.general.plugins.inventory import scaleway
+from ansible_collections.community.general.plugins.inventory.scaleway import InventoryModule
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data, link=None):
+        super().__init__(json.dumps(data).encode())
+        self.headers = {"Link": link}
+
+
+def server(server_id, zone):
+    return {
+        "id": server_id,
+        "hostname": f"host-{server_id}",
+        "arch": "x86_64",
+        "commercial_type": "DEV1-S",
+        "organization": "org",
+        "state": "running",
+        "tags": ["web"],
+        "public_ip": {"address": f"192.0.2.{server_id}"},
+        "private_ip": None,
+        "ipv6": None,
+        "location": {"zone_id": zone},
+    }
+
+
+class FakeApi:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.urls = []
+
+    def open_url(self, url, headers=None):
+        with self.lock:
+            self.urls.append(url)
+        if "fr-par-1" in url:
+            if "page=2" in url:
+                return FakeResponse({"servers": [server(2, "par1")]})
+            return FakeResponse({"servers": [server(1, "par1")]}, link='</servers?per_page=100&page=2>; rel="next"')
+        return FakeResponse({"servers": [server(3, "ams1")]})
+
+
+@pytest.fixture
+def api(mocker):
+    api = FakeApi()
+    mocker.patch.object(scaleway, "open_url", side_effect=api.open_url)
+    return api
+
+
+@pytest.fixture
+def inventory():
+    plugin = InventoryModule()
+    plugin.inventory = InventoryData()
+    plugin._options = {"per_page": 100, "variables": None}
+    return plugin
+
+
+def test_build_server_url():
+    assert scaleway._build_server_url("https://api") == "https://api/servers"
+    assert scaleway._build_server_url("https://api", per_page=100) == "https://api/servers?per_page=100"
+
+
+def test_fetch_zones(inventory, api):
+    servers = inventory._fetch_zones(["ams1", "par1"], "token")
+    assert [s["id"] for s in servers["par1"]] == [1, 2]
+    assert [s["id"] for s in servers["ams1"]] == [3]
+    assert sorted(api.urls) == [
+        "https://api.scaleway.com/instance/v1/zones/fr-par-1/servers?per_page=100",
+        "https://api.scaleway.com/instance/v1/zones/fr-par-1/servers?per_page=100&page=2",
+        "https://api.scaleway.com/instance/v1/zones/nl-ams-1/servers?per_page=100",
+    ]
+
+
+def test_do_zone_inventory_with_servers(inventory, api):
+    inventory.do_zone_inventory("par1", "token", None, ["hostname"], servers=[server(1, "par1")])
+    assert api.urls == []
+    assert sorted(host.name for host in inventory.inventory.groups["web"].hosts) == ["host-1"]
+    assert inventory.inventory.get_host("host-1").vars["public_ipv4"] == "192.0.2.1"
@@ -0,0 +1,57 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.loader import lookup_loader
+
+from ansible_collections.community.general.plugins.lookup import filetree
+
+
+@pytest.fixture
+def tree(tmp_path):
+    # Two overlapping trees, plus a deep tree with many files
+    for root in ("first", "second"):
+        (tmp_path / root / "common").mkdir(parents=True)
+        (tmp_path / root / "common" / "file.txt").write_text(root)
+        (tmp_path / root / f"only_{root}.txt").write_text(root)
+    path = tmp_path / "deep"
+    for depth in range(10):
+        path = path / f"level{depth}"
+        path.mkdir(parents=True)
+        for i in range(50):
+            (path / f"file{i}.txt").write_text("")
+    return tmp_path
+
+
+@pytest.fixture
+def lookup():
+    return lookup_loader.get("community.general.filetree", loader=DataLoader())
+
+
+def test_filetree_deduplicates_paths(tree, lookup):
+    result = lookup.run([str(tree / "first"), str(tree / "second")], {})
+    paths = sorted(entry["path"] for entry in result)
+    assert paths == ["common", "common/file.txt", "only_first.txt", "only_second.txt"]
+    by_path = {entry["path"]: entry for entry in result}
+    assert by_path["common/file.txt"]["root"] == str(tree / "first")
+    assert by_path["only_second.txt"]["root"] == str(tree / "second")
+
+
+def test_filetree_resolves_owner_once(tree, lookup, mocker):
+    filetree.owner_name.cache_clear()
+    filetree.group_name.cache_clear()
+    getpwuid = mocker.patch.object(filetree.pwd, "getpwuid", wraps=filetree.pwd.getpwuid)
+    getgrgid = mocker.patch.object(filetree.grp, "getgrgid", wraps=filetree.grp.getgrgid)
+
+    result = lookup.run([str(tree / "deep")], {})
+
+    assert len(result) == 10 * 51
+    assert getpwuid.call_count == 1
+    assert getgrgid.call_count == 1
+    assert result[0]["uid"] == os.getuid()
@@ -6,7 +6,11 @@ from __future__ import annotations
 
 import unittest
 
-from ansible_collections.community.general.plugins.module_utils._keycloak import is_struct_included
+from ansible_collections.community.general.plugins.module_utils._keycloak import (
+    is_struct_included,
+    plan_rolemapping,
+    resolve_roles,
+)
 
 
 class KeycloakIsStructIncludedTestCase(unittest.TestCase):
@@ -70,3 +74,28 @@ class KeycloakIsStructIncludedTestCase(unittest.TestCase):
     def test_not_equals_dict7_dict8_compare_dict7_with_list_bigger_than_dict8_but_reverse_equals(self):
         self.assertFalse(is_struct_included(self.dict7, self.dict8))
         self.assertTrue(is_struct_included(self.dict8, self.dict7))
+
+
+class KeycloakRolemappingPlanTestCase(unittest.TestCase):
+    available = [{"id": "id1", "name": "role1"}, {"id": "id2", "name": "role2"}]
+    assigned = [{"id": "id3", "name": "role3"}]
+
+    def test_resolve_roles(self):
+        roles = [{"id": None, "name": "role1"}, {"id": "id3", "name": None}, {"id": None, "name": "unknown"}]
+        missing = resolve_roles(roles, self.available, None, self.assigned)
+        self.assertEqual(roles[0], {"id": "id1", "name": "role1"})
+        self.assertEqual(roles[1], {"id": "id3", "name": "role3"})
+        self.assertEqual(missing, [{"id": None, "name": "unknown"}])
+
+    def test_plan_present(self):
+        roles = [{"id": "id1", "name": "role1"}, {"id": "id1", "name": "role1"}, {"id": "id3", "name": "role3"}]
+        self.assertEqual(
+            plan_rolemapping(roles, "present", self.available, self.assigned), [{"id": "id1", "name": "role1"}]
+        )
+
+    def test_plan_absent(self):
+        roles = [{"id": "id1", "name": "role1"}, {"id": "id3", "name": "role3"}]
+        self.assertEqual(
+            plan_rolemapping(roles, "absent", self.available, self.assigned), [{"id": "id3", "name": "role3"}]
+        )
+        self.assertEqual(plan_rolemapping(roles, "absent", self.available, None), [])
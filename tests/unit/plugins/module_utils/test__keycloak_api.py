@@ -0,0 +1,109 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils._keycloak import KeycloakAPI
+
+USERS = [{"id": f"u{i}", "username": f"user{i:04d}", "email": f"user{i:04d}@example.com"} for i in range(250)]
+GROUPS = [{"id": "g1", "name": "admins", "path": "/admins"}, {"id": "g2", "name": "users", "path": "/users"}]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.requests.append((url.path, query))
+        status, payload = 200, None
+        if url.path == "/admin/realms/test/users":
+            users = [user for user in USERS if query.get("search", "") in user["username"]]
+            first = int(query.get("first", 0))
+            payload = users[first : first + int(query.get("max", 100))]
+        elif url.path == "/admin/realms/test/groups":
+            payload = [group for group in GROUPS if group["name"] == query.get("search", group["name"])]
+        elif url.path.startswith("/admin/realms/test/group-by-path/"):
+            path = "/" + unquote(url.path[len("/admin/realms/test/group-by-path/") :])
+            payload = next((group for group in GROUPS if group["path"] == path), None)
+            if payload is None:
+                status = 404
+        elif url.path.startswith("/admin/realms/test/groups/"):
+            payload = next(group for group in GROUPS if group["id"] == url.path.rsplit("/", 1)[1])
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FakeModule:
+    def __init__(self, url):
+        self.params = {
+            "auth_keycloak_url": url,
+            "validate_certs": True,
+            "connection_timeout": 10,
+            "http_agent": "Ansible",
+        }
+
+    def fail_json(self, **kwargs):
+        raise AssertionError(kwargs["msg"])
+
+
+@pytest.fixture
+def keycloak():
+    server = HTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    module = FakeModule(f"http://127.0.0.1:{server.server_port}")
+    yield server, KeycloakAPI(module, {"Authorization": "Bearer token", "Content-Type": "application/json"})
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_realm_users_pages(keycloak):
+    server, kc = keycloak
+    users = kc.get_realm_users(realm="test")
+    assert [user["id"] for user in users] == [user["id"] for user in USERS]
+    assert [(query["first"], query["max"]) for path, query in server.requests] == [
+        ("0", "100"),
+        ("100", "100"),
+        ("200", "100"),
+    ]
+
+
+def test_get_realm_users_search(keycloak):
+    server, kc = keycloak
+    users = kc.get_realm_users(realm="test", search="user01", brief_representation=True)
+    assert len(users) == 100
+    assert server.requests[0][1]["search"] == "user01"
+    assert server.requests[0][1]["briefRepresentation"] == "true"
+
+
+def test_iter_realm_users_is_lazy(keycloak):
+    server, kc = keycloak
+    users = kc.iter_realm_users(realm="test", page_size=50)
+    assert next(users)["id"] == "u0"
+    assert len(server.requests) == 1
+
+
+def test_group_lookups(keycloak):
+    server, kc = keycloak
+    assert kc.find_group_by_path("users", realm="test")["id"] == "g2"
+    assert kc.find_group_by_path("/missing", realm="test") is None
+    assert kc.get_group_by_name("admins", realm="test")["id"] == "g1"
+    assert kc.search_groups("missing", realm="test") == []
+    assert server.requests[-1][1] == {"search": "missing", "exact": "true", "briefRepresentation": "true"}
+    # No request lists all groups
+    assert all("first" not in query for path, query in server.requests)
@@ -4,14 +4,19 @@
 
 from __future__ import annotations
 
+import json
+import os
 from io import StringIO
 from itertools import count
 from urllib.error import HTTPError
+from urllib.parse import parse_qsl
 
 import pytest
 
 from ansible_collections.community.general.plugins.module_utils._keycloak import (
     KeycloakError,
+    _cached_token,
+    _token_cache_path,
     get_token,
 )
 
@@ -167,3 +172,88 @@ def test_json_without_token_returned(mock_json_without_token_returned):
         "API did not include access_token field in response from "
         "http://keycloak.url/auth/realms/master/protocol/openid-connect/token"
     )
+
+
+class TokenEndpoint:
+    def __init__(self, expires_in=300, refresh_expires_in=1800):
+        self.payloads = []
+        self.expires_in = expires_in
+        self.refresh_expires_in = refresh_expires_in
+
+    def __call__(self, url, data=None, **kwargs):
+        payload = dict(parse_qsl(data))
+        self.payloads.append(payload)
+        if payload.get("refresh_token") == "revoked":
+            raise HTTPError(url=url, code=400, msg="Bad Request", hdrs="", fp=StringIO(""))
+        number = len(self.payloads)
+        return StringIO(
+            json.dumps(
+                {
+                    "access_token": f"token{number}",
+                    "expires_in": self.expires_in,
+                    "refresh_token": f"refresh{number}",
+                    "refresh_expires_in": self.refresh_expires_in,
+                }
+            )
+        )
+
+
+@pytest.fixture()
+def token_endpoint(mocker):
+    endpoint = TokenEndpoint()
+    mocker.patch(
+        "ansible_collections.community.general.plugins.module_utils._keycloak.open_url",
+        side_effect=endpoint,
+    )
+    return endpoint
+
+
+def test_token_cache_reuses_token(token_endpoint, tmp_path):
+    module_params = dict(module_params_creds, token_cache_dir=str(tmp_path / "cache"))
+    for dummy in range(3):
+        assert get_token(module_params)["Authorization"] == "Bearer token1"
+    assert [payload["grant_type"] for payload in token_endpoint.payloads] == ["password"]
+
+    # Other users do not share the cached token
+    assert get_token(dict(module_params, auth_username="other"))["Authorization"] == "Bearer token2"
+
+
+def test_token_cache_keyed_on_credentials(token_endpoint, tmp_path):
+    module_params = dict(module_params_creds, token_cache_dir=str(tmp_path))
+    assert get_token(module_params)["Authorization"] == "Bearer token1"
+
+    # A changed password does not reuse the token obtained with the previous one
+    changed = dict(module_params, auth_password="rotated")
+    assert _token_cache_path(changed) != _token_cache_path(module_params)
+    assert get_token(changed)["Authorization"] == "Bearer token2"
+    assert token_endpoint.payloads[1]["grant_type"] == "password"
+    assert token_endpoint.payloads[1]["password"] == "rotated"
+    assert get_token(module_params)["Authorization"] == "Bearer token1"
+
+    # The file names do not depend on the credentials alone
+    other_dir = dict(module_params, token_cache_dir=str(tmp_path / "other"))
+    (tmp_path / "other").mkdir()
+    assert os.path.basename(_token_cache_path(other_dir)) != os.path.basename(_token_cache_path(module_params))
+
+
+def test_token_cache_refreshes_expired_token(token_endpoint, tmp_path):
+    token_endpoint.expires_in = 10
+    module_params = dict(module_params_creds, token_cache_dir=str(tmp_path))
+    assert get_token(module_params)["Authorization"] == "Bearer token1"
+    assert get_token(module_params)["Authorization"] == "Bearer token2"
+    assert token_endpoint.payloads[1] == {"grant_type": "refresh_token", "refresh_token": "refresh1"}
+
+
+def test_token_cache_authenticates_when_refresh_fails(token_endpoint, tmp_path):
+    module_params = dict(module_params_creds, token_cache_dir=str(tmp_path))
+    with open(_token_cache_path(module_params), "w") as f:
+        json.dump({"access_token": "old", "expires_at": 0, "refresh_token": "revoked", "refresh_expires_at": None}, f)
+    assert get_token(module_params)["Authorization"] == "Bearer token2"
+    assert [payload["grant_type"] for payload in token_endpoint.payloads] == ["refresh_token", "password"]
+
+
+def test_token_cache_rejected_token(token_endpoint, tmp_path):
+    module_params = dict(module_params_creds, token_cache_dir=str(tmp_path))
+    assert _cached_token(module_params) == "token1"
+    assert _cached_token(module_params, rejected_token="token1") == "token2"
+    assert token_endpoint.payloads[1]["grant_type"] == "refresh_token"
@@ -0,0 +1,200 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils._lxd import (
+    LXDClient,
+    LXDClientException,
+    LXDInstance,
+)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self):
+        return "stub"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, data, status=200, content_type="application/octet-stream"):
+        if not isinstance(data, bytes):
+            data = json.dumps(data).encode()
+            content_type = "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.requests.append(("POST", self.path, query))
+        if url.path == "/1.0/instances/c1/files":
+            self.server.files[query["path"]] = (body, {k: v for k, v in self.headers.items() if k.startswith("X-LXD")})
+            self._send({"type": "sync", "status": "Success", "metadata": {}})
+        elif url.path == "/1.0/instances/c1/exec":
+            command = json.loads(body)["command"]
+            self.server.commands.append(command)
+            if command[:3] == ["/bin/sh", "-c", 'exec 0<"$0" && rm -f "$0" && exec "$@"']:
+                stdout = self.server.files.pop(command[3])[0]
+            else:
+                stdout = " ".join(command).encode()
+            self.server.logs = {"exec.stdout": stdout, "exec.stderr": b"warning"}
+            self._send({"type": "async", "operation": "/1.0/operations/op1"})
+        else:
+            self._send({"type": "error", "error": "Instance not found", "error_code": 404}, status=404)
+
+    def do_DELETE(self):
+        self.server.requests.append(("DELETE", self.path, None))
+        self.server.logs.pop(urlsplit(self.path).path.rsplit("/", 1)[1])
+        self._send({"type": "sync", "status": "Success", "metadata": {}})
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.connections.add(id(self.connection))
+        time.sleep(self.server.delay)
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/1.0/operations/op1/wait":
+            output = {"1": "/1.0/instances/c1/logs/exec.stdout", "2": "/1.0/instances/c1/logs/exec.stderr"}
+            self._send({"type": "sync", "metadata": {"status": "Success", "metadata": {"return": 0, "output": output}}})
+            return
+        if url.path.startswith("/1.0/instances/c1/logs/"):
+            self._send(self.server.logs[url.path.rsplit("/", 1)[1]])
+            return
+        if url.path == "/1.0/instances/c1/files":
+            if query["path"] in self.server.files:
+                self._send(self.server.files[query["path"]][0])
+            else:
+                self._send({"type": "error", "error": "not found", "error_code": 404}, status=404)
+            return
+        if self.path.startswith("/1.0/missing"):
+            payload = {"type": "error", "error": "not found", "error_code": 404}
+        else:
+            payload = {"type": "sync", "status": "Success", "metadata": {"path": self.path}}
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _StubServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def lxd_server(tmp_path):
+    path = os.path.join(str(tmp_path), "unix.socket")
+    server = _StubServer(path, _StubHandler)
+    server.connections = set()
+    server.delay = 0.0
+    server.requests = []
+    server.files = {}
+    server.commands = []
+    server.logs = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"unix:{path}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_do_reuses_keep_alive_connection(lxd_server):
+    server, url = lxd_server
+    client = LXDClient(url)
+    for dummy in range(5):
+        assert client.do("GET", "/1.0/instances")["metadata"] == {"path": "/1.0/instances"}
+    client.close()
+    assert len(server.connections) == 1
+
+
+def test_do_many_keeps_order(lxd_server):
+    server, url = lxd_server
+    client = LXDClient(url, pool_size=4)
+    urls = [f"/1.0/instances/c{i}" for i in range(50)]
+    result = client.do_many(urls)
+    client.close()
+    assert [r["metadata"]["path"] for r in result] == urls
+    assert 1 <= len(server.connections) <= 4
+
+
+def test_do_many_is_concurrent(lxd_server):
+    server, url = lxd_server
+    server.delay = 0.05
+    client = LXDClient(url, pool_size=8)
+    start = time.time()
+    client.do_many([f"/1.0/instances/c{i}" for i in range(16)])
+    elapsed = time.time() - start
+    client.close()
+    # 16 requests sequentially would take at least 0.8 seconds
+    assert elapsed < 0.6
+
+
+def test_do_many_errors(lxd_server):
+    server, url = lxd_server
+    client = LXDClient(url, pool_size=2)
+    result = client.do_many(["/1.0/instances/c1", "/1.0/missing"], return_exceptions=True)
+    assert result[0]["metadata"]["path"] == "/1.0/instances/c1"
+    assert isinstance(result[1], LXDClientException)
+    assert result[1].msg == "not found"
+    with pytest.raises(LXDClientException):
+        client.do_many(["/1.0/instances/c1", "/1.0/missing"])
+    client.close()
+
+
+def test_instance_exec(lxd_server):
+    server, url = lxd_server
+    instance = LXDInstance(LXDClient(url), "c1", project="test")
+    assert instance.exec(["/bin/sh", "-c", "true"]) == (0, b"/bin/sh -c true", b"warning")
+    assert instance.exec(["/bin/sh", "-c", "cat"], stdin=b"input") == (0, b"input", b"warning")
+    assert server.commands[1][4:] == ["/bin/sh", "-c", "cat"]
+    # The stdin file is only readable by root, the logs are removed
+    assert server.requests[3][2] == {"path": server.commands[1][3], "project": "test"}
+    assert server.files == {}
+    assert server.logs == {}
+    assert all(query["project"] == "test" for method, path, query in server.requests if query is not None)
+    instance.client.close()
+    assert len(server.connections) == 1
+
+
+def test_instance_files(lxd_server):
+    server, url = lxd_server
+    instance = LXDInstance(LXDClient(url), "c1")
+    instance.push(BytesIO(b"x" * 100000), "/tmp/module.py", uid=1000, gid=1000, mode=0o644)
+    data, headers = server.files["/tmp/module.py"]
+    assert data == b"x" * 100000
+    assert headers == {
+        "X-LXD-type": "file",
+        "X-LXD-write": "overwrite",
+        "X-LXD-uid": "1000",
+        "X-LXD-gid": "1000",
+        "X-LXD-mode": "0644",
+    }
+
+    out_file = BytesIO()
+    instance.pull("/tmp/module.py", out_file)
+    assert out_file.getvalue() == b"x" * 100000
+    with pytest.raises(LXDClientException, match="not found"):
+        instance.pull("/tmp/missing", BytesIO())
+    with pytest.raises(LXDClientException, match="Instance not found"):
+        LXDInstance(instance.client, "c2").push(b"", "/tmp/file")
+    instance.client.close()
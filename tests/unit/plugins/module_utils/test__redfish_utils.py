@@ -0,0 +1,164 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import io
+import json
+from email.message import Message
+from urllib.error import HTTPError
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils import _redfish_utils
+from ansible_collections.community.general.plugins.module_utils._redfish_utils import RedfishUtils
+
+ROOT_URI = "https://bmc"
+STORAGE = "/redfish/v1/Systems/1/Storage/1"
+DRIVES = [f"{STORAGE}/Drives/{i}" for i in range(24)]
+VOLUMES = f"{STORAGE}/Volumes"
+
+
+class FakeModule:
+    params = {"validate_certs": False, "ca_path": None, "ciphers": None}
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data, headers):
+        super().__init__(json.dumps(data).encode())
+        self._headers = Message()
+        for key, value in headers.items():
+            self._headers[key] = value
+
+    def info(self):
+        return self._headers
+
+
+class FakeService:
+    def __init__(self, expand=None):
+        self.requests = []
+        self.resources = {
+            "/redfish/v1/": {"ProtocolFeaturesSupported": {"ExpandQuery": expand or {}}},
+            STORAGE: {
+                "@odata.id": STORAGE,
+                "Id": "1",
+                "Drives": [{"@odata.id": uri} for uri in DRIVES],
+                "Volumes": {"@odata.id": VOLUMES},
+            },
+            VOLUMES: {"Members": [{"@odata.id": f"{VOLUMES}/{i}"} for i in range(4)]},
+        }
+        for uri in DRIVES:
+            self.resources[uri] = {"@odata.id": uri, "Id": uri.rsplit("/", 1)[-1], "CapacityBytes": 1}
+        for i in range(4):
+            self.resources[f"{VOLUMES}/{i}"] = {"@odata.id": f"{VOLUMES}/{i}", "Id": str(i)}
+        self.etags = {STORAGE: '"storage-1"'}
+
+    def open_url(self, uri, method="GET", headers=None, **kwargs):
+        path, dummy, query = uri[len(ROOT_URI) :].partition("?")
+        self.requests.append((method, path, query, dict(headers or {})))
+        if method != "GET":
+            return FakeResponse({}, {})
+        etag = self.etags.get(path)
+        if etag and (headers or {}).get("If-None-Match") == etag:
+            raise HTTPError(uri, 304, "Not Modified", Message(), io.BytesIO(b""))
+        data = self.resources[path]
+        if query.startswith("$expand") and "Members" in data:
+            data = dict(data, Members=[self.resources[member["@odata.id"]] for member in data["Members"]])
+        return FakeResponse(data, {"ETag": etag} if etag else {})
+
+
+@pytest.fixture
+def service(mocker):
+    service = FakeService()
+    mocker.patch.object(_redfish_utils, "open_url", side_effect=service.open_url)
+    return service
+
+
+def get_utils(**kwargs):
+    return RedfishUtils({"user": "user", "pswd": "pswd"}, ROOT_URI, 10, FakeModule(), **kwargs)
+
+
+def test_get_request_not_cached_by_default(service):
+    utils = get_utils()
+    utils.get_request(ROOT_URI + STORAGE)
+    utils.get_request(ROOT_URI + STORAGE)
+    assert len(service.requests) == 2
+
+
+def test_get_request_cached(service):
+    utils = get_utils(resource_cache=True)
+    first = utils.get_request(ROOT_URI + STORAGE)
+    first["data"]["Id"] = "modified"
+    second = utils.get_request(ROOT_URI + STORAGE)
+    assert second["ret"] is True
+    assert second["data"]["Id"] == "1"
+    assert len(service.requests) == 1
+
+
+def test_get_request_revalidated_after_modification(service):
+    utils = get_utils(resource_cache=True)
+    utils.get_request(ROOT_URI + STORAGE)
+    utils.get_request(ROOT_URI + DRIVES[0])
+    utils.post_request(ROOT_URI + "/redfish/v1/Systems/1/Actions/ComputerSystem.Reset", {})
+
+    # Resource with ETag: conditional request answered with 304
+    response = utils.get_request(ROOT_URI + STORAGE)
+    assert response["ret"] is True
+    assert response["data"]["Id"] == "1"
+    assert service.requests[-1][3]["If-None-Match"] == '"storage-1"'
+
+    # Resource without ETag: fetched again
+    utils.get_request(ROOT_URI + DRIVES[0])
+    assert service.requests[-1][1] == DRIVES[0]
+    assert "If-None-Match" not in service.requests[-1][3]
+
+    count = len(service.requests)
+    utils.get_request(ROOT_URI + STORAGE)
+    utils.get_request(ROOT_URI + DRIVES[0])
+    assert len(service.requests) == count
+
+
+@pytest.mark.parametrize("max_concurrent_requests", [1, 8])
+def test_get_resources(service, max_concurrent_requests):
+    utils = get_utils(max_concurrent_requests=max_concurrent_requests)
+    response = utils.get_resources(DRIVES)
+    assert response["ret"] is True
+    assert [drive["@odata.id"] for drive in response["entries"]] == DRIVES
+
+
+def test_get_collection_members_without_expand(service):
+    utils = get_utils(expand_collections=True)
+    response = utils.get_collection_members(VOLUMES)
+    assert [volume["Id"] for volume in response["entries"]] == ["0", "1", "2", "3"]
+    assert [request[2] for request in service.requests if request[1] == VOLUMES] == [""]
+
+
+def test_get_collection_members_with_expand(service):
+    service.resources["/redfish/v1/"]["ProtocolFeaturesSupported"]["ExpandQuery"] = {"NoLinks": True, "Levels": True}
+    utils = get_utils(expand_collections=True)
+    response = utils.get_collection_members(VOLUMES)
+    assert [volume["Id"] for volume in response["entries"]] == ["0", "1", "2", "3"]
+    assert [request[1:3] for request in service.requests] == [
+        ("/redfish/v1/", ""),
+        (VOLUMES, "$expand=.($levels=1)"),
+    ]
+
+
+def test_get_volume_and_disk_inventory(service):
+    utils = get_utils(resource_cache=True, max_concurrent_requests=4)
+    service.resources["/redfish/v1/Systems/1"] = {"Storage": {"@odata.id": "/redfish/v1/Systems/1/Storage"}}
+    service.resources["/redfish/v1/Systems/1/Storage"] = {"Members": [{"@odata.id": STORAGE}]}
+
+    disks = utils.get_disk_inventory("/redfish/v1/Systems/1")
+    assert disks["ret"] is True
+    assert len(disks["entries"][0]["Drives"]) == 24
+
+    volumes = utils.get_volume_inventory("/redfish/v1/Systems/1")
+    assert volumes["ret"] is True
+    assert [volume["Id"] for volume in volumes["entries"][0]["Volumes"]] == ["0", "1", "2", "3"]
+
+    # System, storage collection and storage member are only fetched once
+    paths = [request[1] for request in service.requests]
+    assert paths.count(STORAGE) == 1
+    assert len(paths) == len(set(paths))
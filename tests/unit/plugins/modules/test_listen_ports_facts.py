@@ -0,0 +1,102 @@
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from ansible_collections.community.general.plugins.modules import listen_ports_facts
+
+HEADER = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+TCP = (
+    HEADER
+    + "   0: 0100007F:0277 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1 0 100 0 0 10 0\n"
+    + "   1: 00000000:0016 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1002 1 0 100 0 0 10 0\n"
+    + "   2: 0F02000A:0016 0202000A:D431 01 00000000:00000000 02:00000000 00000000     0        0 1003 4 0 20 4 30 10 -1\n"
+)
+TCP6 = (
+    HEADER
+    + "   0: 00000000000000000000000000000000:0016 00000000000000000000000000000000:0000 0A"
+    + " 00000000:00000000 00:00000000 00000000     0        0 1004 1 0 100 0 0 10 0\n"
+)
+UDP = HEADER + "  10: 00000000:0044 00000000:0000 07 00000000:00000000 00:00000000 00000000     0        0 1005 2 0 0\n"
+
+
+@pytest.fixture
+def proc(tmp_path):
+    net = tmp_path / "net"
+    net.mkdir()
+    (net / "tcp").write_text(TCP)
+    (net / "tcp6").write_text(TCP6)
+    (net / "udp").write_text(UDP)
+    # no udp6: IPv6 UDP table missing
+    for pid, name, inodes in [("100", "sshd", [1002, 1004, 1003]), ("200", "cupsd", [1001]), ("300", "idle", [])]:
+        (tmp_path / pid).mkdir()
+        (tmp_path / pid / "comm").write_text(f"{name}\n")
+        fd = tmp_path / pid / "fd"
+        fd.mkdir()
+        os.symlink("/dev/null", str(fd / "0"))
+        for i, inode in enumerate(inodes, 3):
+            os.symlink(f"socket:[{inode}]", str(fd / str(i)))
+    (tmp_path / "self").mkdir()
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "hex_address, expected",
+    [
+        ("0100007F:0277", ("127.0.0.1", 631)),
+        ("00000000:0016", ("0.0.0.0", 22)),
+        ("00000000000000000000000001000000:0035", ("::1", 53)),
+        ("0000000000000000FFFF00000100007F:1F90", ("::ffff:127.0.0.1", 8080)),
+    ],
+)
+def test_proc_decode_address(hex_address, expected):
+    assert listen_ports_facts.proc_decode_address(hex_address) == expected
+
+
+def test_proc_net_parse(proc):
+    result = listen_ports_facts.proc_net_parse(proc_path=proc)
+    assert sorted((r["protocol"], r["address"], r["port"], r["pid"], r["name"]) for r in result) == [
+        ("tcp", "0.0.0.0", 22, 100, "sshd"),
+        ("tcp", "127.0.0.1", 631, 200, "cupsd"),
+        ("tcp", "::", 22, 100, "sshd"),
+        ("udp", "0.0.0.0", 68, 0, ""),
+    ]
+    assert {r["state"] for r in result} == {"LISTEN", "UNCONN"}
+
+
+def test_proc_net_parse_include_non_listening(proc):
+    result = listen_ports_facts.proc_net_parse(include_non_listening=True, proc_path=proc)
+    established = [r for r in result if r["state"] == "ESTABLISHED"]
+    assert established == [
+        {
+            "protocol": "tcp",
+            "state": "ESTABLISHED",
+            "address": "10.0.2.15",
+            "foreign_address": "10.0.2.2:54321",
+            "port": 22,
+            "name": "sshd",
+            "pid": 100,
+        }
+    ]
+    assert {r["foreign_address"] for r in result if r is not established[0]} == {"0.0.0.0:*", ":::*"}
+
+
+def test_proc_pid_info(tmp_path):
+    (tmp_path / "stat").write_text("cpu  1 2 3 4\nbtime 1000000000\nprocesses 10\n")
+    (tmp_path / "42").mkdir()
+    fields = ["S"] + ["0"] * 18 + [str(os.sysconf("SC_CLK_TCK") * 60)] + ["0"] * 10
+    (tmp_path / "42" / "stat").write_text(f"42 (my (odd) name) {' '.join(fields)}\n")
+    (tmp_path / "42" / "status").write_text("Name:\tx\nUid:\t1000\t0\t0\t0\nGid:\t0\t0\t0\t0\n")
+
+    stime = listen_ports_facts.proc_pid_stime(42, proc_path=str(tmp_path))
+    assert stime == listen_ports_facts.time.strftime(
+        "%a %b %e %H:%M:%S %Y", listen_ports_facts.time.localtime(1000000060)
+    )
+    assert listen_ports_facts.proc_pid_user(42, proc_path=str(tmp_path)) == "root"
+    assert listen_ports_facts.proc_pid_stime(43, proc_path=str(tmp_path)) is None
+    assert listen_ports_facts.proc_pid_user(43, proc_path=str(tmp_path)) is None
@@ -5605,3 +5605,76 @@ def test_vrf_connection_unchanged(mocked_vrf_connection_unchanged, capfd):
     results = json.loads(out)
     assert not results.get("failed")
     assert not results["changed"]
+
+
+TESTCASE_CONNECTION_SNAPSHOT = [
+    {
+        "conn_name": "vpn:office\\1",
+        "state": "up",
+        "_ansible_check_mode": False,
+    }
+]
+
+
+@pytest.mark.parametrize("patch_ansible_module", TESTCASE_CONNECTION_SNAPSHOT, indirect=["patch_ansible_module"])
+def test_list_connections_snapshot(mocker):
+    mocker.patch(
+        "ansible_collections.community.general.plugins.modules.nmcli.get_best_parsable_locale", return_value="C"
+    )
+    mocker.patch("ansible.module_utils.basic.AnsibleModule.get_bin_path", return_value="/usr/bin/nmcli")
+    execute_command = mocker.patch.object(nmcli.Nmcli, "execute_command")
+    execute_command.return_value = (
+        0,
+        "eth0:0b0e5ab7-4d5d-4a5f-9a8e-3f9d24fbc3c1:802-3-ethernet:activated\n"
+        "vpn\\:office\\\\1:6f1e3e0c-6d7a-4a07-9c39-2bb0f2b6a3d1:vpn:\n",
+        "",
+    )
+    nmcli_module = nmcli.Nmcli(nmcli.create_module())
+
+    assert nmcli_module.list_connections() == [
+        dict(name="eth0", uuid="0b0e5ab7-4d5d-4a5f-9a8e-3f9d24fbc3c1", type="802-3-ethernet", state="activated"),
+        dict(name="vpn:office\\1", uuid="6f1e3e0c-6d7a-4a07-9c39-2bb0f2b6a3d1", type="vpn", state=None),
+    ]
+    assert nmcli_module.connection_exists()
+    assert not nmcli_module.is_connection_active()
+    nmcli_module.conn_name = "eth0"
+    assert nmcli_module.is_connection_active()
+    nmcli_module.conn_name = "eth1"
+    assert not nmcli_module.connection_exists()
+
+    assert execute_command.call_count == 1
+    assert execute_command.call_args[0][0] == [
+        "/usr/bin/nmcli",
+        "--terse",
+        "--fields",
+        "NAME,UUID,TYPE,STATE",
+        "con",
+        "show",
+    ]
+
+
+@pytest.mark.parametrize(
+    "patch_ansible_module",
+    [dict(TESTCASE_WIRELESS[0], properties_cache=True)],
+    indirect=["patch_ansible_module"],
+)
+def test_properties_cache(mocker, tmp_path):
+    mocker_set(mocker, execute_return=(0, TESTCASE_DEFAULT_WIRELESS_SHOW_OUTPUT, ""))
+    nmcli_bin = tmp_path / "nmcli"
+    nmcli_bin.write_text("")
+    mocker.patch("ansible.module_utils.basic.AnsibleModule.get_bin_path", return_value=str(nmcli_bin))
+    execute_command = nmcli.Nmcli.execute_command
+    cache_path = tmp_path / "nmcli_properties.json"
+    mocker.patch.object(nmcli.Nmcli, "_properties_cache_path", return_value=str(cache_path))
+
+    for dummy in range(2):
+        properties = nmcli.Nmcli(nmcli.create_module()).get_supported_properties("802-11-wireless")
+        assert "hidden" in properties
+        assert "mode" in properties
+    assert execute_command.call_count == 1
+    assert cache_path.exists()
+
+    # The cache is refreshed when nmcli changes
+    nmcli_bin.write_text("upgraded")
+    nmcli.Nmcli(nmcli.create_module()).get_supported_properties("802-11-wireless")
+    assert execute_command.call_count == 2
@@ -5,16 +5,20 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, call
 
 import pytest
 
 from ansible_collections.community.general.plugins.modules.one_vm import (
     _user_template_values_equal,
     check_update_attributes_values,
+    get_all_vms_by_attributes,
+    get_vm_pool_index,
     parse_updateconf,
     update_vm_user_template,
     update_vms_user_template,
+    wait_for_done,
+    wait_for_running,
 )
 
 PARSE_UPDATECONF_VALID = [
@@ -229,3 +233,198 @@ def test_update_vms_user_template_any_changed():
     assert changed is True
     assert client.vm.update.call_count == 1
     assert client.vm.update.call_args[0] == (2, 'SUBROLE="head"', 1)
+
+
+def _client_with_pool(*vms):
+    client = MagicMock()
+    pool = [
+        MagicMock(ID=vm_id, NAME=name, USER_TEMPLATE=user_template) for vm_id, (name, user_template) in enumerate(vms)
+    ]
+    client.vmpool.infoextended.return_value = MagicMock(VM=pool)
+    return client, pool
+
+
+def test_get_all_vms_by_attributes_uses_one_call():
+    client, pool = _client_with_pool(
+        ("web01", {"ROLE": "web", "LABELS": "prod,eu"}),
+        ("web02", {"ROLE": "web", "LABELS": "dev"}),
+        ("web", {"ROLE": "db", "LABELS": "prod"}),
+        ("webx3", {"ROLE": "web", "LABELS": "prod"}),
+        ("db01", None),
+    )
+
+    assert get_all_vms_by_attributes(client, {"NAME": "web##"}, None) == pool[:2]
+    assert get_all_vms_by_attributes(client, {"NAME": "web"}, None) == [pool[2]]
+    assert get_all_vms_by_attributes(client, {"ROLE": "web"}, ["prod"]) == [pool[0], pool[3]]
+    # Attributes without a value only need to exist
+    assert get_all_vms_by_attributes(client, {"ROLE": None}, None) == pool[:4]
+    assert get_all_vms_by_attributes(client, {"NAME": "web#", "ROLE": "web"}, ["prod", "eu"]) == [pool[0]]
+    assert get_all_vms_by_attributes(client, None, ["missing"]) == []
+
+    assert client.vmpool.infoextended.call_count == 6
+    client.vmpool.info.assert_not_called()
+    client.vm.info.assert_not_called()
+
+
+def test_get_all_vms_by_attributes_reuses_pool_index():
+    client, pool = _client_with_pool(("web01", {"LABELS": "prod"}), ("web02", {}))
+    pool_index = get_vm_pool_index(client)
+
+    assert get_all_vms_by_attributes(client, {"NAME": "web##"}, ["prod"], pool_index) == [pool[0]]
+    assert get_all_vms_by_attributes(client, {"NAME": "web##"}, None, pool_index) == pool
+    assert client.vmpool.infoextended.call_count == 1
+
+
+RUNNING = (3, 3)
+PENDING = (1, 0)
+FAILED = (11, 0)
+DONE = (6, 0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = FakeClock()
+    mocker.patch("ansible_collections.community.general.plugins.modules.one_vm.time", clock)
+    return clock
+
+
+def _client_with_states(clock, *polls):
+    """Return a client whose VM pool has the given (STATE, LCM_STATE) per VM ID after each sleep."""
+
+    def pool_info(filter_flag, start_id, end_id, state_filter):
+        poll = polls[min(len(clock.sleeps), len(polls) - 1)]
+        return MagicMock(
+            VM=[
+                MagicMock(ID=vm_id, STATE=state, LCM_STATE=lcm_state)
+                for vm_id, (state, lcm_state) in poll.items()
+                if start_id <= vm_id <= end_id and (state_filter == -2 or state != DONE[0])
+            ]
+        )
+
+    client = MagicMock()
+    client.vmpool.info.side_effect = pool_info
+    return client
+
+
+def test_wait_for_vms_state_polls_pool_for_all_vms(clock):
+    module = _module()
+    client = _client_with_states(
+        clock,
+        {3: PENDING, 5: PENDING, 7: PENDING, 9: RUNNING},
+        {3: RUNNING, 5: PENDING, 7: PENDING},
+        {5: PENDING, 7: RUNNING},
+        {5: PENDING},
+        {5: PENDING},
+        {5: RUNNING},
+    )
+    vms = [MagicMock(ID=vm_id) for vm_id in (3, 5, 7)]
+
+    result = wait_for_running(module, client, vms, 300)
+
+    assert [vm.ID for vm in result] == [3, 5, 7]
+    assert all((vm.STATE, vm.LCM_STATE) == RUNNING for vm in result)
+    # The pool is read once per interval for the VMs still pending
+    assert client.vmpool.info.call_args_list == [
+        call(-2, 3, 7, -1),
+        call(-2, 3, 7, -1),
+        call(-2, 5, 7, -1),
+        call(-2, 5, 5, -1),
+        call(-2, 5, 5, -1),
+        call(-2, 5, 5, -1),
+    ]
+    assert clock.sleeps == [1, 2, 4, 5, 5]
+    module.fail_json.assert_not_called()
+    client.vm.info.assert_not_called()
+
+
+def test_wait_for_vms_state_no_vms(clock):
+    client = MagicMock()
+    assert wait_for_running(_module(), client, [], 300) == []
+    client.vmpool.info.assert_not_called()
+
+
+def test_wait_for_vms_state_failed_vm(clock):
+    module = _module()
+    module.fail_json.side_effect = SystemExit
+    client = _client_with_states(clock, {1: RUNNING, 2: FAILED})
+
+    with pytest.raises(SystemExit):
+        wait_for_running(module, client, [MagicMock(ID=1), MagicMock(ID=2)], 300)
+
+    assert "CLONING_FAILURE" in module.fail_json.call_args.kwargs["msg"]
+
+
+def test_wait_for_vms_state_timeout(clock):
+    module = _module()
+    module.fail_json.side_effect = SystemExit
+    client = _client_with_states(clock, {1: PENDING})
+
+    with pytest.raises(SystemExit):
+        wait_for_running(module, client, [MagicMock(ID=1)], 20)
+
+    assert module.fail_json.call_args.kwargs["msg"] == "Wait timeout has expired!"
+    # The last sleep is shortened to the end of the timeout
+    assert clock.sleeps == [1, 2, 4, 5, 5, 3]
+
+
+def test_wait_for_vms_state_sparse_ids(clock):
+    module = _module()
+    client = _client_with_states(
+        clock,
+        {12: PENDING, 13: PENDING, 20: PENDING, 48000: PENDING},
+        {12: RUNNING, 13: RUNNING, 20: RUNNING, 48000: RUNNING},
+    )
+    vms = [MagicMock(ID=vm_id) for vm_id in (48000, 12, 20, 13)]
+
+    result = wait_for_running(module, client, vms, 300)
+
+    assert [vm.ID for vm in result] == [48000, 12, 20, 13]
+    # Distant IDs are read with separate queries instead of one query over the whole range
+    assert client.vmpool.info.call_args_list == [call(-2, 12, 20, -1), call(-2, 48000, 48000, -1)] * 2
+    module.fail_json.assert_not_called()
+
+
+def test_wait_for_vms_state_done(clock):
+    module = _module()
+    client = _client_with_states(clock, {1: RUNNING, 2: DONE}, {1: DONE, 2: DONE})
+
+    result = wait_for_done(module, client, [MagicMock(ID=1), MagicMock(ID=2)], 300)
+
+    assert [(vm.ID, vm.STATE) for vm in result] == [(1, 6), (2, 6)]
+    assert client.vmpool.info.call_args_list == [call(-2, 1, 2, -2), call(-2, 1, 1, -2)]
+    module.fail_json.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "wait_for, polls",
+    [
+        # Deleted, or not visible to the user
+        (wait_for_running, [{1: RUNNING}]),
+        (wait_for_done, [{1: DONE}]),
+        # Terminated while waiting for another state
+        (wait_for_running, [{1: RUNNING, 2: DONE}]),
+    ],
+)
+def test_wait_for_vms_state_missing_vm(clock, wait_for, polls):
+    module = _module()
+    module.fail_json.side_effect = SystemExit
+    client = _client_with_states(clock, *polls)
+
+    with pytest.raises(SystemExit):
+        wait_for(module, client, [MagicMock(ID=1), MagicMock(ID=2)], 300)
+
+    assert "There is no VM with id=2" in module.fail_json.call_args.kwargs["msg"]
+    assert clock.sleeps == []
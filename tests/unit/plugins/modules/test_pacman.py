@@ -4,6 +4,8 @@
 
 from __future__ import annotations
 
+import io
+import tarfile
 import typing as t
 from unittest import mock
 
@@ -117,6 +119,84 @@ empty_inventory: dict[str, dict[str, t.Any]] = {
 }
 
 
+def make_database(tmp_path):
+    """Creates a synthetic pacman configuration and database directory"""
+    dbpath = tmp_path / "db"
+    local_pkgs = [
+        ("gawk", "5.1.1-1", ["base-devel"], None),
+        ("pacman", "6.0.1-2", ["base-devel"], None),
+        ("pacman-mirrorlist", "20211114-1", [], "1"),
+        ("sqlite", "3.36.0-1", [], None),
+    ]
+    for name, version, groups, reason in local_pkgs:
+        entry = dbpath / "local" / f"{name}-{version}"
+        entry.mkdir(parents=True)
+        desc = f"%NAME%\n{name}\n\n%VERSION%\n{version}\n\n"
+        if groups:
+            desc += "%GROUPS%\n" + "\n".join(groups) + "\n\n"
+        if reason:
+            desc += f"%REASON%\n{reason}\n\n"
+        (entry / "desc").write_text(desc)
+        (entry / "files").write_text("%FILES%\nusr/\n\n")
+    (dbpath / "local" / "ALPM_DB_VERSION").write_text("9\n")
+
+    sync_pkgs = {
+        "core": [
+            ("bash", "5.1.016-1", [], ["sh"]),
+            ("gawk", "5.1.1-1", ["base-devel"], []),
+            ("sqlite", "3.37.0-1", [], []),
+        ],
+        "extra": [
+            ("sudo", "1.9.8.p2-3", ["base-devel", "some-group"], []),
+            ("zsh", "5.8-1", [], ["sh=5.8"]),
+        ],
+    }
+    (dbpath / "sync").mkdir()
+    for repo, pkgs in sync_pkgs.items():
+        with tarfile.open(str(dbpath / "sync" / f"{repo}.db"), "w:gz") as tar:
+            for name, version, groups, provides in pkgs:
+                desc = f"%NAME%\n{name}\n\n%VERSION%\n{version}\n\n"
+                if groups:
+                    desc += "%GROUPS%\n" + "\n".join(groups) + "\n\n"
+                if provides:
+                    desc += "%PROVIDES%\n" + "\n".join(provides) + "\n\n"
+                data = desc.encode()
+                info = tarfile.TarInfo(f"{name}-{version}/desc")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+
+    config = tmp_path / "pacman.conf"
+    config.write_text(
+        f"[options]\nDBPath = {dbpath}  # comment\nHoldPkg = pacman\n\n"
+        "[core]\nInclude = /etc/pacman.d/mirrorlist\n\n"
+        "[extra]\nInclude = /etc/pacman.d/mirrorlist\n\n"
+        "[unsynced]\nServer = https://example.com\n"
+    )
+    return str(config), str(dbpath)
+
+
+class TestPacmanDatabase:
+    def test_parse_desc(self):
+        desc = "%NAME%\nfoo\n\n%GROUPS%\na\nb\n\n%REASON%\n1\n\n"
+        assert pacman.parse_desc(desc) == {"NAME": ["foo"], "GROUPS": ["a", "b"], "REASON": ["1"]}
+
+    def test_read_config(self, tmp_path):
+        config, dbpath = make_database(tmp_path)
+        assert pacman.read_config(config) == (dbpath, ["core", "extra", "unsynced"])
+
+    def test_read_databases(self, tmp_path):
+        config, dbpath = make_database(tmp_path)
+        local = pacman.read_local_database(dbpath)
+        assert [(p["name"], p["reason"]) for p in local] == [
+            ("gawk", "explicit"),
+            ("pacman", "explicit"),
+            ("pacman-mirrorlist", "dependency"),
+            ("sqlite", "explicit"),
+        ]
+        extra = pacman.read_sync_database(dbpath, "extra")
+        assert extra[1] == {"name": "zsh", "version": "5.8-1", "groups": [], "provides": ["sh"]}
+
+
 class TestPacman:
     @pytest.fixture(autouse=True)
     def run_command(self, mocker):
@@ -1232,3 +1312,59 @@ class TestPacman:
         else:
             assert out["stdout"] == "stdout"
             assert out["stderr"] == "stderr"
+
+    @pytest.mark.parametrize(
+        "module_args, expected_upgradable, expected_calls",
+        [
+            ({"name": ["sudo"]}, {}, []),
+            (
+                {"name": ["sudo"], "state": "latest"},
+                {"sqlite": VersionTuple(current="3.36.0-1", latest="3.37.0-1")},
+                [mock.call(mock.ANY, ["pacman", "--config", mock.ANY, "--query", "--upgrades"], check_rc=False)],
+            ),
+        ],
+    )
+    def test_build_inventory_from_database(self, tmp_path, module_args, expected_upgradable, expected_calls):
+        config, dbpath = make_database(tmp_path)
+        self.mock_run_command.return_value = (0, "sqlite 3.36.0-1 -> 3.37.0-1\n", "")
+        with set_module_args(dict(module_args, config=config, inventory_source="database")):
+            P = pacman.Pacman(pacman.setup_module())
+            P.inventory = P._build_inventory()
+
+            assert P.inventory == {
+                "installed_pkgs": {
+                    "gawk": "5.1.1-1",
+                    "pacman": "6.0.1-2",
+                    "pacman-mirrorlist": "20211114-1",
+                    "sqlite": "3.36.0-1",
+                },
+                "installed_groups": {"base-devel": {"gawk", "pacman"}},
+                "available_pkgs": {
+                    "bash": "5.1.016-1",
+                    "gawk": "5.1.1-1",
+                    "sqlite": "3.37.0-1",
+                    "sudo": "1.9.8.p2-3",
+                    "zsh": "5.8-1",
+                },
+                "available_groups": {"base-devel": {"gawk", "sudo"}, "some-group": {"sudo"}},
+                "upgradable_pkgs": expected_upgradable,
+                "pkg_reasons": {
+                    "gawk": "explicit",
+                    "pacman": "explicit",
+                    "pacman-mirrorlist": "dependency",
+                    "sqlite": "explicit",
+                },
+            }
+            assert self.mock_run_command.mock_calls == expected_calls
+
+            # <repo>/<pkgname> and provided names are resolved without calling pacman
+            self.mock_run_command.reset_mock()
+            P.m.params["name"] = ["extra/sudo", "core/bash", "sh", "base-devel"]
+            assert sorted(P.package_list()) == [
+                Package("bash", "core/bash"),
+                Package("bash", "sh"),
+                Package("gawk", "gawk"),
+                Package("sudo", "extra/sudo"),
+                Package("sudo", "sudo"),
+            ]
+            assert self.mock_run_command.call_count == 0